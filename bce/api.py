@@ -106,8 +106,8 @@ def is_chemical_equation_balanced(expression, options):
     options.set_protected_math_symbol_header("-")
 
     try:
-        #  Parse the chemical equation.
-        ce = _ce_parser.parse(expression, _ce_token.tokenize(expression, options), options)
+        #  Parse the chemical equation (only the atoms are needed).
+        ce = _ce_parser.parse(expression, _ce_token.tokenize(expression, options), options, build_ast=False)
 
         #  Restore the protected math symbol header.
         options.set_protected_math_symbol_header(prot_header)
@@ -169,3 +169,68 @@ def substitute_chemical_equation(expression, subst_map, decompilers, options):
             raise ValueError("Unsupported decompiler ID.")
 
     return ret
+
+
+def enumerate_balanced_chemical_equations(expression, decompilers, options):
+    """Enumerate the minimal balancing results (with non-negative integer coefficients) of a
+    chemical equation that has multiple answers.
+
+    Every balancing result with non-negative coefficients is a non-negative combination of the
+    enumerated results. The results are decompiled lazily.
+
+    :type expression: str
+    :type decompilers: list[int]
+    :type options: _opt.Option
+    :param expression: The chemical equation expression.
+    :param decompilers: The list that contains the decompiler IDs.
+    :param options: The BCE options.
+    :return: A generator that yields a list contains the decompiled result for each balancing
+             result.
+    """
+
+    #  Check characters.
+    if not _input_chk.check_input_expression_characters(expression):
+        raise InvalidCharacterException("Invalid character.")
+
+    try:
+        #  Parse the chemical equation.
+        ce = _ce_parser.parse(expression, _ce_token.tokenize(expression, options), options)
+
+        #  Enumerate.
+        balanced_ce_list = _bce_main.enumerate_balanced_chemical_equations(ce, options)
+    except _pe.Error as err1:
+        raise ParserErrorWrapper(err1.to_string())
+    except _le.LogicError as err2:
+        raise LogicErrorWrapper(err2.to_string())
+
+    return _decompile_each(balanced_ce_list, decompilers, options)
+
+
+def _decompile_each(ce_list, decompilers, options):
+    """Decompile chemical equations one by one.
+
+    :type decompilers: list[int]
+    :type options: _opt.Option
+    :param ce_list: An iterable of the chemical equations.
+    :param decompilers: The list that contains the decompiler IDs.
+    :param options: The BCE options.
+    :return: A generator that yields a list contains the decompiled result for each chemical
+             equation.
+    """
+
+    for ce in ce_list:
+        #  Initialize the result container.
+        ret = []
+
+        #  Decompile.
+        for dec_id in decompilers:
+            if dec_id == DECOMPILER_TEXT:
+                ret.append(_decompiler_ce_to_bce.decompile_ce(ce))
+            elif dec_id == DECOMPILER_MATHML:
+                ret.append(_decompiler_ce_to_mathml.decompile_ce(ce, options).to_string())
+            elif dec_id == DECOMPILER_COLLECT_SYMBOLS:
+                ret.append(_decompiler_ce_csm.collect_symbols(ce))
+            else:
+                raise ValueError("Unsupported decompiler ID.")
+
+        yield ret
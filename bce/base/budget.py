@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import time as _time
+
+#  The clock of the time limit. A monotonic clock doesn't jump when the system time is changed
+#  (it is not available before Python 3.3).
+_clock = getattr(_time, "monotonic", _time.time)
+
+
+class BudgetExceededError(Exception):
+    """Error raised when the work budget is exceeded."""
+
+    pass
+
+
+class Budget:
+    """Class for limiting the work (time and operations) of a long computation.
+
+    The computation calls consume() (or check()) periodically, so it can be cancelled
+    cooperatively once the limit is hit.
+    """
+
+    def __init__(self, time_limit=None, operation_limit=None):
+        """Initialize the budget (the timer starts immediately).
+
+        :type time_limit: float | None
+        :type operation_limit: int | None
+        :param time_limit: The time limit in seconds (None if unlimited).
+        :param operation_limit: The maximum count of operations (None if unlimited).
+        """
+
+        self.__deadline = _clock() + time_limit if time_limit is not None else None
+        self.__op_limit = operation_limit
+        self.__op_count = 0
+
+    def get_operation_count(self):
+        """Get the count of consumed operations.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__op_count
+
+    def check(self):
+        """Check whether the budget is exceeded.
+
+        :raise BudgetExceededError: Raise this error if the budget is exceeded.
+        """
+
+        if self.__op_limit is not None and self.__op_count > self.__op_limit:
+            raise BudgetExceededError("The operation limit is exceeded.")
+
+        if self.__deadline is not None and _clock() > self.__deadline:
+            raise BudgetExceededError("The time limit is exceeded.")
+
+    def consume(self, count=1):
+        """Consume some operations and check whether the budget is exceeded.
+
+        :type count: int
+        :param count: The count of operations.
+        :raise BudgetExceededError: Raise this error if the budget is exceeded.
+        """
+
+        self.__op_count += count
+        self.check()
+
+
+def create_budget(time_limit, operation_limit):
+    """Create a budget.
+
+    :type time_limit: float | None
+    :type operation_limit: int | None
+    :param time_limit: The time limit in seconds (None if unlimited).
+    :param operation_limit: The maximum count of operations (None if unlimited).
+    :rtype : Budget | None
+    :return: The budget, or None if there is no limit.
+    """
+
+    if time_limit is None and operation_limit is None:
+        return None
+
+    return Budget(time_limit, operation_limit)
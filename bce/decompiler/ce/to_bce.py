@@ -39,17 +39,12 @@ def decompile_ce(ce):
         #  Get the AST root node.
         ast_root = item.get_molecule_ast()
 
-        #  Backup the prefix number.
-        origin_coefficient = ast_root.get_prefix_number()
-
-        #  Set the prefix to the balanced coefficient.
-        ast_root.set_prefix_number(item.get_coefficient() * origin_coefficient)
+        #  Get the prefix number with the balanced coefficient (the AST may be shared, so it
+        #  must not be modified).
+        pfx = item.get_coefficient() * ast_root.get_prefix_number()
 
         #  Decompile the molecule.
-        r += _ml_decompiler.decompile_ast(ast_root)
-
-        #  Restore the prefix number.
-        ast_root.set_prefix_number(origin_coefficient)
+        r += _ml_decompiler.decompile_ast(ast_root, pfx)
 
     #  Insert '='.
     r += "="
@@ -73,17 +68,12 @@ def decompile_ce(ce):
         #  Get the AST root node.
         ast_root = item.get_molecule_ast()
 
-        #  Backup the prefix number.
-        origin_coefficient = ast_root.get_prefix_number()
-
-        #  Set the prefix to the balanced coefficient.
-        ast_root.set_prefix_number(item.get_coefficient() * origin_coefficient)
+        #  Get the prefix number with the balanced coefficient (the AST may be shared, so it
+        #  must not be modified).
+        pfx = item.get_coefficient() * ast_root.get_prefix_number()
 
         #  Decompile the molecule.
-        r += _ml_decompiler.decompile_ast(ast_root)
-
-        #  Restore the prefix number.
-        ast_root.set_prefix_number(origin_coefficient)
+        r += _ml_decompiler.decompile_ast(ast_root, pfx)
 
         #  Switch off the mark.
         r_is_first = False
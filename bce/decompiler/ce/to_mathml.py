@@ -42,17 +42,12 @@ def decompile_ce(ce, options):
         #  Get the AST root node.
         ast_root = item.get_molecule_ast()
 
-        #  Backup the prefix number.
-        origin_coefficient = ast_root.get_prefix_number()
-
-        #  Set the prefix to the balanced coefficient.
-        ast_root.set_prefix_number(item.get_coefficient() * origin_coefficient)
+        #  Get the prefix number with the balanced coefficient (the AST may be shared, so it
+        #  must not be modified).
+        pfx = item.get_coefficient() * ast_root.get_prefix_number()
 
         #  Decompile the molecule.
-        r.append_object(_ml_decompiler.decompile_ast(ast_root, options))
-
-        #  Restore the prefix number.
-        ast_root.set_prefix_number(origin_coefficient)
+        r.append_object(_ml_decompiler.decompile_ast(ast_root, options, pfx))
 
     #  Insert '='.
     r.append_object(_mathml.OperatorComponent(_mathml.OPERATOR_EQUAL))
@@ -76,17 +71,12 @@ def decompile_ce(ce, options):
         #  Get the AST root node.
         ast_root = item.get_molecule_ast()
 
-        #  Backup the prefix number.
-        origin_coefficient = ast_root.get_prefix_number()
-
-        #  Set the prefix to the balanced coefficient.
-        ast_root.set_prefix_number(item.get_coefficient() * origin_coefficient)
+        #  Get the prefix number with the balanced coefficient (the AST may be shared, so it
+        #  must not be modified).
+        pfx = item.get_coefficient() * ast_root.get_prefix_number()
 
         #  Decompile the molecule.
-        r.append_object(_ml_decompiler.decompile_ast(ast_root, options))
-
-        #  Restore the prefix number.
-        ast_root.set_prefix_number(origin_coefficient)
+        r.append_object(_ml_decompiler.decompile_ast(ast_root, options, pfx))
 
         #  Switch off the mark.
         r_is_first = False
@@ -67,11 +67,30 @@ def _decompile_suffix(node):
     return ret
 
 
-def decompile_ast(root_node):
+def _get_prefix_number(node, root_node, root_prefix):
+    """Get the prefix number of a hydrate group or molecule node.
+
+    :type node: _ml_ast_base.ASTNodeHydrateGroup | _ml_ast_base.ASTNodeMolecule
+    :type root_node: _ml_ast_base.ASTNodeHydrateGroup | _ml_ast_base.ASTNodeMolecule
+    :param node: The node.
+    :param root_node: The root node of the AST.
+    :param root_prefix: The prefix number of the root node (None if not replaced).
+    :return: The prefix number.
+    """
+
+    if node is root_node and root_prefix is not None:
+        return root_prefix
+
+    return node.get_prefix_number()
+
+
+def decompile_ast(root_node, root_prefix=None):
     """Decompile an AST to BCE expression.
 
     :type root_node: _ml_ast_base.ASTNodeHydrateGroup | _ml_ast_base.ASTNodeMolecule
     :param root_node: The root node of the AST.
+    :param root_prefix: The prefix number used instead of the prefix number of the root node
+                        (None if not replaced). The AST is never modified.
     :rtype : str
     :return: The decompiled expression.
     """
@@ -87,7 +106,7 @@ def decompile_ast(root_node):
             assert isinstance(work_node, _ml_ast_base.ASTNodeHydrateGroup)
 
             #  Decompile the prefix number part.
-            pfx = work_node.get_prefix_number().simplify()
+            pfx = _get_prefix_number(work_node, root_node, root_prefix).simplify()
             if pfx != _math_cst.ONE:
                 model = _decompile_operand(pfx) + "(%s)"
             else:
@@ -104,7 +123,7 @@ def decompile_ast(root_node):
             assert isinstance(work_node, _ml_ast_base.ASTNodeMolecule)
 
             #  Decompile the prefix number part.
-            pfx = work_node.get_prefix_number().simplify()
+            pfx = _get_prefix_number(work_node, root_node, root_prefix).simplify()
             build = _decompile_operand(pfx)
 
             #  Decompile children nodes.
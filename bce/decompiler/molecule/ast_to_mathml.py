@@ -96,13 +96,32 @@ def _decompile_suffix(main_dom, node, options):
         return _mathml.SubComponent(main_dom, sfx_dom)
 
 
-def decompile_ast(root_node, options):
+def _get_prefix_number(node, root_node, root_prefix):
+    """Get the prefix number of a hydrate group or molecule node.
+
+    :type node: _ml_ast_base.ASTNodeHydrateGroup | _ml_ast_base.ASTNodeMolecule
+    :type root_node: _ml_ast_base.ASTNodeHydrateGroup | _ml_ast_base.ASTNodeMolecule
+    :param node: The node.
+    :param root_node: The root node of the AST.
+    :param root_prefix: The prefix number of the root node (None if not replaced).
+    :return: The prefix number.
+    """
+
+    if node is root_node and root_prefix is not None:
+        return root_prefix
+
+    return node.get_prefix_number()
+
+
+def decompile_ast(root_node, options, root_prefix=None):
     """Decompile an AST to BCE expression.
 
     :type root_node: _ml_ast_base.ASTNodeHydrateGroup | _ml_ast_base.ASTNodeMolecule
     :type options: _opt.Option
     :param root_node: The root node of the AST.
     :param options: The BCE options.
+    :param root_prefix: The prefix number used instead of the prefix number of the root node
+                        (None if not replaced). The AST is never modified.
     :return: The decompiled expression.
     """
 
@@ -120,7 +139,7 @@ def decompile_ast(root_node, options):
             build = _mathml.RowComponent()
 
             #  Decompile the prefix number part.
-            pfx = work_node.get_prefix_number().simplify()
+            pfx = _get_prefix_number(work_node, root_node, root_prefix).simplify()
             if pfx != _math_cst.ONE:
                 build.append_object(_decompile_operand(pfx, True, options))
                 build.append_object(_mathml.OperatorComponent(_mathml.OPERATOR_LEFT_PARENTHESIS))
@@ -147,7 +166,7 @@ def decompile_ast(root_node, options):
             build = _mathml.RowComponent()
 
             #  Decompile the prefix number part.
-            pfx = work_node.get_prefix_number().simplify()
+            pfx = _get_prefix_number(work_node, root_node, root_prefix).simplify()
             if pfx != _math_cst.ONE:
                 build.append_object(_decompile_operand(pfx, True, options))
 
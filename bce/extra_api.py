@@ -11,8 +11,7 @@ import bce.decompiler.mexp.to_mathml as _decompiler_mexp_to_mathml
 import bce.parser.common.error as _pe
 import bce.parser.mexp.evaluate as _mexp_ev
 import bce.parser.molecule.token as _ml_token
-import bce.parser.molecule.ast.generator as _ml_ast_gen
-import bce.parser.molecule.ast.parser as _ml_ast_parser
+import bce.parser.molecule.counting as _ml_counting
 import bce.api as _api
 import bce.option as _opt
 
@@ -68,11 +67,8 @@ def parse_molecule(expression, options):
         #  Tokenize.
         token_list = _ml_token.tokenize(expression, options)
 
-        #  Generate the AST.
-        ast = _ml_ast_gen.generate_ast(expression, token_list, options)
-
-        #  Parse.
-        parsed = _ml_ast_parser.parse_ast(expression, ast, options)
+        #  Count the atoms (the AST is generated only if the molecule can't be counted directly).
+        parsed, _ = _ml_counting.count_atoms(expression, token_list, options)
 
         #  Restore the protected math symbol header.
         options.set_protected_math_symbol_header(prot_header)
@@ -96,5 +96,7 @@ MESSAGES = {
     MSG_LE_BCE_SIDE_ELIMINATED_LEFT: "该化学方程式的反应物分子均被消去。",
     MSG_LE_BCE_SIDE_ELIMINATED_RIGHT: "该化学方程式的生成物分子均被消去。",
     MSG_LE_BCE_CONFLICTED_EQUATIONS: "该化学方程式中包含冲突，它无法被配平。",
+    MSG_LE_BCE_SYMBOLIC_ENUMERATION: "无法枚举包含符号的化学方程式的配平结果。",
+    MSG_LE_BCE_BUDGET_EXCEEDED: "化学方程式过于复杂，无法在时间/运算次数限制内完成配平。",
     MSG_SH_CONSOLE_INVALID_CHARACTER: "表达式中存在非法字符。",
 }
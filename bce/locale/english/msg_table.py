@@ -98,5 +98,7 @@ MESSAGES = {
     MSG_LE_BCE_SIDE_ELIMINATED_LEFT: "All molecules on the left side of the chemical equation was eliminated.",
     MSG_LE_BCE_SIDE_ELIMINATED_RIGHT: "All molecules on the right side of the chemical equation was eliminated.",
     MSG_LE_BCE_CONFLICTED_EQUATIONS: "This chemical equation is conflicted, and it can't be balanced.",
+    MSG_LE_BCE_SYMBOLIC_ENUMERATION: "Can't enumerate the balancing results of chemical equations that contain symbols.",
+    MSG_LE_BCE_BUDGET_EXCEEDED: "The chemical equation is too complex to be balanced within the time / operation limit.",
     MSG_SH_CONSOLE_INVALID_CHARACTER: "The expression contains at least one invalid character.",
 }
@@ -95,4 +95,6 @@ MSG_LE_BCE_SIDE_ELIMINATED_ALL = "error.logic.other.side_eliminated.all"
 MSG_LE_BCE_SIDE_ELIMINATED_LEFT = "error.logic.other.side_eliminated.left"
 MSG_LE_BCE_SIDE_ELIMINATED_RIGHT = "error.logic.other.side_eliminated.right"
 MSG_LE_BCE_CONFLICTED_EQUATIONS = "error.logic.other.conflicted_equations"
+MSG_LE_BCE_SYMBOLIC_ENUMERATION = "error.logic.other.symbolic_enumeration"
+MSG_LE_BCE_BUDGET_EXCEEDED = "error.logic.other.budget_exceeded"
 MSG_SH_CONSOLE_INVALID_CHARACTER = "error.shell.console.invalid_character"
@@ -8,3 +8,5 @@
 LE_BCE_SIDE_ELIMINATED = "LE.BCE.SEL"
 LE_BCE_AUTO_ARRANGE_WITH_MULTIPLE_ANSWER = "LE.BCE.ARMW"
 LE_BCE_CONFLICT_EQUATIONS = "LE.BCE.CFX"
+LE_BCE_SYMBOLIC_ENUMERATION = "LE.BCE.SYM"
+LE_BCE_BUDGET_EXCEEDED = "LE.BCE.BUD"
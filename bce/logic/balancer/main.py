@@ -5,6 +5,7 @@
 #  found in the license.txt file.
 #
 
+import bce.base.budget as _base_budget
 import bce.locale.msg_id as _msg_id
 import bce.logic.balancer.error as _bce_error
 import bce.logic.balancer.modeling as _bce_model
@@ -12,6 +13,7 @@ import bce.logic.balancer.merge as _bce_merge
 import bce.logic.balancer.direction as _bce_dct
 import bce.logic.common.error as _le
 import bce.math.equation as _math_equ
+import bce.math.matrix as _math_mtx
 import bce.parser.ce.base as _ce_base
 import bce.option as _opt
 import copy as _copy
@@ -26,25 +28,217 @@ def balance_chemical_equation(ce, options):
     :param options: The BCE options.
     """
 
+    #  Build a matrix.
+    equations = _bce_model.build_matrix(ce)
+
+    #  Balance.
+    _balance_with_matrix(ce, equations, _bce_model.get_matrix_row_labels(ce), None, options)
+
+
+def enumerate_balanced_chemical_equations(ce, options):
+    """Enumerate the minimal balancing results of a chemical equation whose coefficients are
+    non-negative integers.
+
+    The results correspond to the extreme rays of the cone of non-negative solutions, so every
+    balancing result with non-negative coefficients is a non-negative combination of them. The
+    chemical equation is not modified.
+
+    :type ce: _ce_base.ChemicalEquation
+    :type options: _opt.Option
+    :param ce: The chemical equation (represented by ChemicalEquation class).
+    :param options: The BCE options.
+    :return: A generator that yields the balanced chemical equations (each one is a copy).
+    :raise _le.LogicError: Raise this error if the chemical equation contains symbols.
+    """
+
+    #  Build a matrix.
+    solutions = _bce_model.enumerate_minimal_solutions(_bce_model.build_matrix(ce))
+    if solutions is None:
+        raise _le.LogicError(_bce_error.LE_BCE_SYMBOLIC_ENUMERATION,
+                             _msg_id.MSG_LE_BCE_SYMBOLIC_ENUMERATION,
+                             options)
+
+    return _generate_balanced_copies(ce, solutions)
+
+
+def _generate_balanced_copies(ce, solutions):
+    """Generate balanced copies of a chemical equation.
+
+    :type ce: _ce_base.ChemicalEquation
+    :param ce: The chemical equation (represented by ChemicalEquation class).
+    :param solutions: An iterable of the integer coefficients.
+    :return: A generator that yields the balanced chemical equations.
+    """
+
+    for coefficients in solutions:
+        balanced = _copy.deepcopy(ce)
+        _bce_merge.merge_integer_solution_into_ce(balanced, coefficients)
+        yield balanced
+
+
+def balance_chemical_equations(ce_list, options):
+    """Balance many chemical equations at once.
+
+    The numeric linear equations of all chemical equations are solved together (see
+    bce.math.batch package), so it is much faster than balancing them one by one.
+
+    :type ce_list: list[_ce_base.ChemicalEquation]
+    :type options: _opt.Option
+    :param ce_list: The chemical equations (represented by ChemicalEquation class).
+    :param options: The BCE options.
+    :rtype : list[_le.LogicError | None]
+    :return: The error raised when balancing each chemical equation (None if balanced).
+    """
+
+    #  Build matrices.
+    matrices = [_bce_model.build_matrix(ce) for ce in ce_list]
+    row_labels_list = [_bce_model.get_matrix_row_labels(ce) for ce in ce_list]
+
+    #  Solve.
+    solved_list = _bce_model.solve_matrices_batch(matrices, row_labels_list, options)
+
+    #  Balance.
+    errors = []
+    for ce_id in range(0, len(ce_list)):
+        try:
+            _balance_with_matrix(ce_list[ce_id], matrices[ce_id], row_labels_list[ce_id], solved_list[ce_id], options)
+            errors.append(None)
+        except _le.LogicError as err:
+            errors.append(err)
+
+    return errors
+
+
+def balance_chemical_equation_with_solution(ce, presolved, options):
+    """Balance a chemical equation with the exact solutions of its linear equations.
+
+    :type ce: _ce_base.ChemicalEquation
+    :type presolved: (list[dict], list[int])
+    :type options: _opt.Option
+    :param ce: The chemical equation (represented by ChemicalEquation class).
+    :param presolved: A tuple (The linear form of each unknown, The columns of free unknowns)
+                      that solves the linear equations built by build_matrix().
+    :param options: The BCE options.
+    """
+
+    _balance_with_matrix(ce, None, None, presolved, options)
+
+
+def _balance_with_matrix(ce, equations, row_labels, presolved, options):
+    """Balance a chemical equation with its matrix.
+
+    :type ce: _ce_base.ChemicalEquation
+    :type equations: _math_mtx.Matrix | None
+    :type row_labels: list[str] | None
+    :type presolved: (list[dict], list[int]) | None
+    :type options: _opt.Option
+    :param ce: The chemical equation (represented by ChemicalEquation class).
+    :param equations: The matrix built by build_matrix() (can be None if |presolved| is given).
+    :param row_labels: The atom / electronic symbol of each row.
+    :param presolved: The exact solutions solved before (None if not solved).
+    :param options: The BCE options.
+    :raise _le.LogicError: Raise this error if the time / operation limit is exceeded.
+    """
+
     #  Get whether the chemical equation is in auto-correction form.
     is_auto_correction_form = (ce.get_right_item_count() == 0)
 
-    #  Build a matrix and backup.
-    equations = _bce_model.build_matrix(ce)
-    equations_backup = _copy.deepcopy(equations)
+    #  Create the work budget.
+    budget = _base_budget.create_budget(options.get_solver_time_limit(), options.get_solver_operation_limit())
 
-    #  Solve the equation and check the answer.
-    solved = _math_equ.solve_equation(equations, options.get_protected_math_symbol_header())
-    if not _math_equ.check_solved_answer(equations_backup, solved):
-        raise _le.LogicError(_bce_error.LE_BCE_CONFLICT_EQUATIONS,
-                             _msg_id.MSG_LE_BCE_CONFLICTED_EQUATIONS,
+    try:
+        _solve_and_merge(ce, equations, row_labels, presolved, budget, options)
+    except _base_budget.BudgetExceededError:
+        raise _le.LogicError(_bce_error.LE_BCE_BUDGET_EXCEEDED,
+                             _msg_id.MSG_LE_BCE_BUDGET_EXCEEDED,
                              options)
 
-    #  Post solving.
-    solved = _bce_model.matrix_post_solving(solved, options)
+    _check_balanced_ce(ce, is_auto_correction_form, options)
+
+
+def _solve_and_merge(ce, equations, row_labels, presolved, budget, options):
+    """Solve the linear equations of a chemical equation and merge the solutions into it.
 
-    #  Merge.
-    _bce_merge.merge_solving_result_into_ce(ce, solved)
+    :type ce: _ce_base.ChemicalEquation
+    :type equations: _math_mtx.Matrix | None
+    :type row_labels: list[str] | None
+    :type presolved: (list[dict], list[int]) | None
+    :type budget: _base_budget.Budget | None
+    :type options: _opt.Option
+    :param ce: The chemical equation (represented by ChemicalEquation class).
+    :param equations: The matrix built by build_matrix() (can be None if |presolved| is given).
+    :param row_labels: The atom / electronic symbol of each row.
+    :param presolved: The exact solutions solved before (None if not solved).
+    :param budget: The work budget (None if unlimited).
+    :param options: The BCE options.
+    :raise _le.LogicError: Raise this error if the linear equations can't be solved.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    cache_key = None
+    if presolved is None:
+        #  Reject obviously unsolvable equations before solving.
+        if _math_equ.test_rank(equations, budget) == _math_equ.RANK_TEST_ZERO_ONLY:
+            raise _le.LogicError(_bce_error.LE_BCE_SIDE_ELIMINATED,
+                                 _msg_id.MSG_LE_BCE_SIDE_ELIMINATED_ALL,
+                                 options)
+
+        #  Try the solution cache (only once for each chemical equation).
+        cache_key, presolved = _bce_model.lookup_solution_cache(equations, row_labels, options)
+
+        #  Solve to linear forms for the direct integer nullspace solving (the solutions are
+        #  reused below if there are multiple solutions).
+        if presolved is None and options.is_integer_nullspace_enabled():
+            presolved = _bce_model.solve_linear_forms(equations, options, cache_key, budget)
+            cache_key = None
+
+    #  Try to get the minimal integer solution directly.
+    int_solution = None
+    if presolved is not None and options.is_integer_nullspace_enabled():
+        int_solution = _bce_model.solve_integer_nullspace(presolved)
+
+    if int_solution is not None:
+        #  Merge.
+        _bce_merge.merge_integer_solution_into_ce(ce, int_solution)
+    else:
+        #  Solve the equation (the matrix is not modified).
+        solved = _bce_model.solve_matrix(equations, options, presolved, cache_key, budget)
+
+        #  Check the answer (exact solutions given without the matrix can't be checked, e.g. the
+        #  solutions given to balance_chemical_equation_with_solution()).
+        if equations is None:
+            is_answer_valid = True
+        elif options.is_strict_answer_checking_enabled():
+            is_answer_valid = _math_equ.check_solved_answer(equations, solved, budget)
+        else:
+            is_answer_valid = _math_equ.check_solved_answer_probabilistic(equations, solved, budget)
+        if not is_answer_valid:
+            raise _le.LogicError(_bce_error.LE_BCE_CONFLICT_EQUATIONS,
+                                 _msg_id.MSG_LE_BCE_CONFLICTED_EQUATIONS,
+                                 options)
+
+        #  Reduce the basis of the solutions.
+        if options.is_lattice_reduced_basis_enabled():
+            solved = _bce_model.reduce_solution_basis(solved, options)
+
+        #  Post solving.
+        solved = _bce_model.matrix_post_solving(solved, options)
+
+        #  Merge.
+        _bce_merge.merge_solving_result_into_ce(ce, solved, budget)
+
+
+def _check_balanced_ce(ce, is_auto_correction_form, options):
+    """Check the balanced chemical equation and guess its direction.
+
+    :type ce: _ce_base.ChemicalEquation
+    :type is_auto_correction_form: bool
+    :type options: _opt.Option
+    :param ce: The chemical equation (represented by ChemicalEquation class).
+    :param is_auto_correction_form: Whether the chemical equation was in auto-correction form.
+    :param options: The BCE options.
+    :raise _le.LogicError: Raise this error if the balanced chemical equation is invalid.
+    """
 
     #  All-eliminated check.
     if len(ce) == 0:
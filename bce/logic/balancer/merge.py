@@ -5,17 +5,22 @@
 #  found in the license.txt file.
 #
 
+import bce.base.budget as _base_budget
 import bce.math.equation as _math_equ
 import bce.parser.ce.base as _ce_base
+import sympy as _sympy
 
 
-def merge_solving_result_into_ce(ce, solve_result):
+def merge_solving_result_into_ce(ce, solve_result, budget=None):
     """Merge the solving result into chemical equation.
 
     :type ce: _ce_base.ChemicalEquation
     :type solve_result: _math_equ.SolvedEquation
+    :type budget: _base_budget.Budget | None
     :param ce: The chemical equation (represented by ChemicalEquation class).
     :param solve_result: The solving result.
+    :param budget: The work budget (None if unlimited).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
     """
 
     #  Get the answer list.
@@ -34,11 +39,38 @@ def merge_solving_result_into_ce(ce, solve_result):
         item.set_coefficient(answer_list[ce.get_left_item_count() + idx])
         ce.set_right_item(idx, item)
 
+    #  Remove items with coefficient 0, move items that have negative coefficient to another side
+    #  and integerize the coefficients.
+    ce.normalize_coefficients(budget)
+
+
+def merge_integer_solution_into_ce(ce, coefficients):
+    """Merge a minimal integer solution into chemical equation.
+
+    Unlike merge_solving_result_into_ce(), the coefficients don't need to be integerized.
+
+    :type ce: _ce_base.ChemicalEquation
+    :type coefficients: list[int]
+    :param ce: The chemical equation (represented by ChemicalEquation class).
+    :param coefficients: The integer coefficients (co-prime).
+    """
+
+    assert len(coefficients) == len(ce)
+
+    #  Process left items.
+    for idx in range(0, ce.get_left_item_count()):
+        item = ce.get_left_item(idx)
+        item.set_coefficient(_sympy.Integer(coefficients[idx]))
+        ce.set_left_item(idx, item)
+
+    #  Process right items.
+    for idx in range(0, ce.get_right_item_count()):
+        item = ce.get_right_item(idx)
+        item.set_coefficient(_sympy.Integer(coefficients[ce.get_left_item_count() + idx]))
+        ce.set_right_item(idx, item)
+
     #  Remove items with coefficient 0.
     ce.remove_items_with_coefficient_zero()
 
     #  Move items that have negative coefficient to another side.
     ce.move_items_with_negative_coefficient_to_another_side()
-
-    #  Integerize the coefficients.
-    ce.coefficients_integerize()
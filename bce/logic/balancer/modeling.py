@@ -5,21 +5,28 @@
 #  found in the license.txt file.
 #
 
+import bce.base.budget as _base_budget
 import bce.parser.ce.base as _ce_base
 import bce.math.matrix as _math_mtx
 import bce.math.equation as _math_equ
+import bce.math.batch as _math_batch
+import bce.math.cone as _math_cone
+import bce.math.engine as _math_engine
+import bce.math.fraction_free as _math_ffe
+import bce.math.lattice as _math_lattice
+import bce.math.solution_cache as _math_cache
 import bce.math.constant as _math_const
 import bce.option as _opt
 import sympy as _sympy
 
 
-def build_matrix(ce):
-    """Construct linear equations from the a chemical equation.
+def _get_atom_row_indexes(ce):
+    """Get the row index of each atom / electronic.
 
     :type ce: _ce_base.ChemicalEquation
     :param ce: The chemical equation (represented by ChemicalEquation).
-    :rtype : _math_mtx.Matrix
-    :return: A matrix contains the linear equations.
+    :rtype : dict
+    :return: A dictionary that contains the row index of each atom / electronic.
     """
 
     #  A dictionary that contains the row index of each atom / electronic.
@@ -53,11 +60,20 @@ def build_matrix(ce):
                 ref_atom_idx[atom_symbol] = ref_atom_counter
                 ref_atom_counter += 1
 
-    #  Build an empty matrix that only contains zero.
-    mtx = _math_mtx.Matrix(len(ref_atom_idx), len(ce) + 1, _math_const.ZERO)
+    return ref_atom_idx
+
+
+def build_columns(ce):
+    """Get the column of each molecule in the matrix built by build_matrix().
 
-    #  Initialize column index counter.
-    col_id = 0
+    :type ce: _ce_base.ChemicalEquation
+    :param ce: The chemical equation (represented by ChemicalEquation).
+    :rtype : list[dict]
+    :return: A dictionary that maps each atom / electronic to its (signed) count for each
+             molecule (left items first).
+    """
+
+    columns = []
 
     #  Process items on the left side.
     for idx in range(0, ce.get_left_item_count()):
@@ -67,15 +83,10 @@ def build_matrix(ce):
         #  Get the atom dictionary of the molecule.
         atom_dict = item.get_atoms_dictionary()
 
-        for atom in atom_dict:
-            #  Write the count of each atom to specific position.
-            if item.is_operator_plus():
-                mtx.write_item_by_position(ref_atom_idx[atom], col_id, atom_dict[atom])
-            else:
-                mtx.write_item_by_position(ref_atom_idx[atom], col_id, -atom_dict[atom])
-
-        #  Increase the column counter.
-        col_id += 1
+        if item.is_operator_plus():
+            columns.append(dict([(atom, atom_dict[atom]) for atom in atom_dict]))
+        else:
+            columns.append(dict([(atom, -atom_dict[atom]) for atom in atom_dict]))
 
     #  Process items on the right side.
     for idx in range(0, ce.get_right_item_count()):
@@ -85,19 +96,311 @@ def build_matrix(ce):
         #  Get the atom dictionary of the molecule.
         atom_dict = item.get_atoms_dictionary()
 
-        for atom in atom_dict:
-            #  Write the count of each atom to specific position.
-            if item.is_operator_plus():
-                mtx.write_item_by_position(ref_atom_idx[atom], col_id, -atom_dict[atom])
-            else:
-                mtx.write_item_by_position(ref_atom_idx[atom], col_id, atom_dict[atom])
+        if item.is_operator_plus():
+            columns.append(dict([(atom, -atom_dict[atom]) for atom in atom_dict]))
+        else:
+            columns.append(dict([(atom, atom_dict[atom]) for atom in atom_dict]))
+
+    return columns
+
+
+def _write_matrix_items(ce, ref_atom_idx, mtx):
+    """Write the atom counts of each molecule to a matrix.
+
+    :type ce: _ce_base.ChemicalEquation
+    :type ref_atom_idx: dict
+    :type mtx: _math_mtx.Matrix
+    :param ce: The chemical equation (represented by ChemicalEquation).
+    :param ref_atom_idx: The row index of each atom / electronic.
+    :param mtx: The matrix.
+    """
+
+    columns = build_columns(ce)
+    for col_id in range(0, len(columns)):
+        column = columns[col_id]
+
+        #  Write the count of each atom to specific position.
+        for atom in column:
+            mtx.write_item_by_position(ref_atom_idx[atom], col_id, column[atom])
+
+
+def build_matrix(ce):
+    """Construct linear equations from the a chemical equation.
+
+    :type ce: _ce_base.ChemicalEquation
+    :param ce: The chemical equation (represented by ChemicalEquation).
+    :rtype : _math_mtx.Matrix
+    :return: A matrix contains the linear equations.
+    """
+
+    #  Get the row index of each atom.
+    ref_atom_idx = _get_atom_row_indexes(ce)
+
+    #  Build an empty matrix that only contains zero.
+    mtx = _math_mtx.Matrix(len(ref_atom_idx), len(ce) + 1, _math_const.ZERO)
 
-        #  Increase the column counter.
-        col_id += 1
+    #  Write atom counts.
+    _write_matrix_items(ce, ref_atom_idx, mtx)
 
     return mtx
 
 
+def get_matrix_row_labels(ce):
+    """Get the atom / electronic of each row of the matrix built by build_matrix().
+
+    :type ce: _ce_base.ChemicalEquation
+    :param ce: The chemical equation (represented by ChemicalEquation).
+    :rtype : list[str]
+    :return: The atom / electronic symbol of each row.
+    """
+
+    ref_atom_idx = _get_atom_row_indexes(ce)
+    labels = [None] * len(ref_atom_idx)
+    for atom_symbol in ref_atom_idx:
+        labels[ref_atom_idx[atom_symbol]] = atom_symbol
+
+    return labels
+
+
+def _get_cache_key(rows, row_labels, options):
+    """Get the solution cache key of the linear equations.
+
+    :type rows: list[list[int]] | None
+    :type row_labels: list[str] | None
+    :type options: _opt.Option | None
+    :param rows: The integer rows (None if the matrix contains symbols).
+    :param row_labels: The atom / electronic symbol of each row.
+    :param options: The BCE options.
+    :rtype : _math_cache.CacheKey | None
+    :return: The key, or None if the solutions can't be cached.
+    """
+
+    if rows is None or row_labels is None or options is None or not options.is_solution_cache_enabled():
+        return None
+
+    return _math_cache.make_key(rows, row_labels)
+
+
+def lookup_solution_cache(mtx, row_labels, options):
+    """Look up the solutions of the linear equations in the solution cache.
+
+    The cache should be looked up only once for each chemical equation, so the hit / miss
+    counters of the cache are exact.
+
+    :type mtx: _math_mtx.Matrix
+    :type row_labels: list[str]
+    :type options: _opt.Option
+    :param mtx: The matrix built by build_matrix().
+    :param row_labels: The atom / electronic symbol of each row (see get_matrix_row_labels()).
+    :param options: The BCE options.
+    :rtype : (_math_cache.CacheKey | None, (list[dict], list[int]) | None)
+    :return: A tuple (The cache key (None if the solutions can't be cached), The cached
+             solutions (None if not cached)).
+    """
+
+    if not options.is_solution_cache_enabled():
+        return None, None
+
+    key = _get_cache_key(_math_ffe.to_integer_rows(mtx), row_labels, options)
+    if key is None:
+        return None, None
+
+    return key, _math_cache.get_default_cache().get(key)
+
+
+def solve_linear_forms(mtx, options, key=None, budget=None):
+    """Solve numeric linear equations to linear forms with the solver engine selected by the
+    options.
+
+    :type mtx: _math_mtx.Matrix
+    :type options: _opt.Option
+    :type key: _math_cache.CacheKey | None
+    :type budget: _base_budget.Budget | None
+    :param mtx: The matrix built by build_matrix() (it wouldn't be modified).
+    :param options: The BCE options.
+    :param key: The solution cache key (see lookup_solution_cache()), the solutions are cached
+                with it (None if the solutions shouldn't be cached).
+    :param budget: The work budget of the solver (None if unlimited).
+    :rtype : (list[dict], list[int]) | None
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns), or None
+             if the matrix contains symbols or the selected solver engine can't solve to linear
+             forms.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    solved = _math_engine.solve_linear_forms(mtx, options.get_solver_engine(), budget)
+
+    #  Cache the solutions.
+    if solved is not None and key is not None:
+        _math_cache.get_default_cache().put(key, solved[0], len(solved[1]))
+
+    return solved
+
+
+def solve_integer_nullspace(presolved):
+    """Get the minimal integer solution of the linear equations from their exact solutions.
+
+    :type presolved: (list[dict], list[int])
+    :param presolved: The exact solutions (e.g. solved by solve_linear_forms()).
+    :rtype : list[int] | None
+    :return: The minimal integer solution, or None if the linear equations are not homogeneous
+             or they don't have exactly one (non-trivial) solution.
+    """
+
+    forms, free_columns = presolved
+    if len(free_columns) != 1:
+        return None
+
+    #  The nullspace is only meaningful when all constant terms are zero.
+    for form in forms:
+        if -1 in form:
+            return None
+
+    return _math_ffe.linear_forms_to_integer_basis(forms, 1)[0]
+
+
+def solve_matrix(mtx, options, presolved=None, key=None, budget=None):
+    """Solve the linear equations with the solver engine selected by the options.
+
+    :type mtx: _math_mtx.Matrix | None
+    :type options: _opt.Option
+    :type presolved: (list[dict], list[int]) | None
+    :type key: _math_cache.CacheKey | None
+    :type budget: _base_budget.Budget | None
+    :param mtx: The matrix built by build_matrix() (it wouldn't be modified).
+    :param options: The BCE options.
+    :param presolved: The exact solutions solved before (e.g. by solve_matrices_batch()), the
+                      matrix is not used if it is given.
+    :param key: The solution cache key (see lookup_solution_cache()), the solutions are cached
+                with it (None if the solutions shouldn't be cached).
+    :param budget: The work budget of the solver (None if unlimited).
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    symbol_header = options.get_protected_math_symbol_header()
+
+    if presolved is not None:
+        return _math_ffe.linear_forms_to_solved_equation(presolved[0], len(presolved[1]), symbol_header)
+
+    #  Solve.
+    solved = _math_engine.solve_equation(mtx, options.get_solver_engine(), symbol_header, budget)
+
+    #  Cache the solutions.
+    if key is not None:
+        forms = _math_cache.solved_equation_to_linear_forms(solved, symbol_header)
+        if forms is not None:
+            _math_cache.get_default_cache().put(key, forms, solved.get_unknown_count())
+
+    return solved
+
+
+def solve_matrices_batch(matrices, row_labels_list, options):
+    """Solve the numeric linear equations of many chemical equations at once.
+
+    The matrices that contain symbols are skipped. If a specific solver engine is selected,
+    all matrices are skipped (so they would be solved by that engine one by one).
+
+    :type matrices: list[_math_mtx.Matrix]
+    :type row_labels_list: list[list[str]]
+    :type options: _opt.Option
+    :param matrices: The matrices built by build_matrix().
+    :param row_labels_list: The atom / electronic symbol of each row of each matrix.
+    :param options: The BCE options.
+    :rtype : list[(list[dict], list[int]) | None]
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns) for each
+             matrix (None if skipped).
+    """
+
+    results = [None] * len(matrices)
+    if options.get_solver_engine() != _math_engine.ENGINE_AUTO:
+        return results
+
+    #  Convert the matrices and try the solution cache.
+    batch_ids = []
+    batch_rows = []
+    batch_keys = []
+    for mtx_id in range(0, len(matrices)):
+        rows = _math_ffe.to_integer_rows(matrices[mtx_id])
+        if rows is None:
+            continue
+
+        key = _get_cache_key(rows, row_labels_list[mtx_id], options)
+        if key is not None:
+            results[mtx_id] = _math_cache.get_default_cache().get(key)
+            if results[mtx_id] is not None:
+                continue
+
+        batch_ids.append(mtx_id)
+        batch_rows.append(rows)
+        batch_keys.append(key)
+
+    #  Solve.
+    unknown_counts = [matrices[mtx_id].get_column_count() - 1 for mtx_id in batch_ids]
+    solved = _math_batch.solve_linear_forms_batch(batch_rows, unknown_counts)
+    for idx in range(0, len(batch_ids)):
+        results[batch_ids[idx]] = solved[idx]
+        if batch_keys[idx] is not None:
+            _math_cache.get_default_cache().put(batch_keys[idx], solved[idx][0], len(solved[idx][1]))
+
+    return results
+
+
+def reduce_solution_basis(solve_result, options):
+    """Express the solutions with an LLL-reduced integer basis.
+
+    :type solve_result: _math_equ.SolvedEquation
+    :type options: _opt.Option
+    :param solve_result: The solutions of the linear equations built by build_matrix().
+    :param options: The BCE options.
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions expressed with the reduced basis (or |solve_result| itself if it has
+             less than two free unknowns or it contains symbols other than the free unknowns).
+    """
+
+    free_count = solve_result.get_unknown_count()
+    if free_count < 2:
+        return solve_result
+
+    #  Get the linear forms.
+    symbol_header = options.get_protected_math_symbol_header()
+    forms = _math_cache.solved_equation_to_linear_forms(solve_result, symbol_header)
+    if forms is None:
+        return solve_result
+
+    #  Reduce the integer basis.
+    basis = _math_lattice.lll_reduce(_math_ffe.linear_forms_to_integer_basis(forms, free_count))
+
+    #  Build the answers.
+    symbols = _math_equ.get_symbol_table(symbol_header).get_symbols(free_count)
+    answers = []
+    for col_id in range(0, len(forms)):
+        terms = [_sympy.Integer(basis[free_id][col_id]) * symbols[free_id] for free_id in range(0, free_count)
+                 if basis[free_id][col_id] != 0]
+        answers.append(_sympy.Add(*terms))
+
+    return _math_equ.SolvedEquation(answers, free_count)
+
+
+def enumerate_minimal_solutions(mtx):
+    """Enumerate the minimal non-negative integer solutions on the extreme rays of the solution
+    cone (every non-negative solution is a non-negative combination of them).
+
+    :type mtx: _math_mtx.Matrix
+    :param mtx: The matrix built by build_matrix().
+    :return: A generator that yields the solutions (list[int]), or None if the matrix contains
+             symbols.
+    """
+
+    #  Convert the matrix.
+    rows = _math_ffe.to_integer_rows(mtx)
+    if rows is None:
+        return None
+
+    return _math_cone.enumerate_extreme_rays(rows, mtx.get_column_count() - 1)
+
+
 def matrix_post_solving(solve_result, options):
     """Post solving process.
 
@@ -113,7 +416,7 @@ def matrix_post_solving(solve_result, options):
         #  Replace '[Xa]' with 1.
 
         #  Get the symbol of [Xa].
-        replace_symbol = _sympy.Symbol(_math_equ.unknown_id_to_symbol(0, options.get_protected_math_symbol_header()))
+        replace_symbol = _math_equ.get_symbol_table(options.get_protected_math_symbol_header()).get_symbol(0)
 
         #  Replace.
         new_answer_list = []
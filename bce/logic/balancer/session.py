@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.logic.balancer.main as _bce_main
+import bce.logic.balancer.modeling as _bce_model
+import bce.math.fraction_free as _math_ffe
+import bce.math.incremental as _math_inc
+import bce.math.solution_cache as _math_cache
+import bce.parser.ce.base as _ce_base
+import bce.option as _opt
+
+
+class BalancingSession:
+    """Class for balancing a chemical equation that is edited repeatedly.
+
+    The session keeps the reduced row echelon form of the linear equations from the last
+    balancing. When the chemical equation is balanced again, only the molecules that were added
+    or removed since then are appended to or deleted from that form.
+    """
+
+    def __init__(self, options):
+        """Initialize an empty session.
+
+        :type options: _opt.Option
+        :param options: The BCE options.
+        """
+
+        self.__opt = options
+        self.__solver = _math_inc.IncrementalSolver()
+        self.__columns = []
+
+    def reset(self):
+        """Forget the linear equations of the last balancing."""
+
+        self.__solver = _math_inc.IncrementalSolver()
+        self.__columns = []
+
+    def get_column_count(self):
+        """Get the count of molecules (columns) kept by the session.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return len(self.__columns)
+
+    def balance(self, ce):
+        """Balance a chemical equation.
+
+        Chemical equations that contain symbols are balanced from scratch (and the session is
+        not changed).
+
+        :type ce: _ce_base.ChemicalEquation
+        :param ce: The chemical equation (represented by ChemicalEquation class).
+        """
+
+        #  Get the column of each molecule (with native rational items).
+        columns = []
+        for column in _bce_model.build_columns(ce):
+            native_column = {}
+            for atom in column:
+                value = _math_ffe.to_native_rational(column[atom])
+                if value is None:
+                    _bce_main.balance_chemical_equation(ce, self.__opt)
+                    return
+                if value != 0:
+                    native_column[atom] = value
+            columns.append(tuple(sorted(native_column.items())))
+
+        #  Delete the columns that were removed.
+        remaining = {}
+        for column in columns:
+            remaining[column] = remaining.get(column, 0) + 1
+        for col_id in range(len(self.__columns) - 1, -1, -1):
+            column = self.__columns[col_id]
+            if remaining.get(column, 0) != 0:
+                remaining[column] -= 1
+            else:
+                del self.__columns[col_id]
+                self.__solver.delete_column(col_id)
+
+        #  Append the columns that were added.
+        for column in columns:
+            if remaining.get(column, 0) != 0:
+                remaining[column] -= 1
+                self.__columns.append(column)
+                self.__solver.append_column(dict(column))
+
+        #  Map each molecule to its column in the session.
+        session_col_ids = {}
+        for col_id in range(0, len(self.__columns)):
+            session_col_ids.setdefault(self.__columns[col_id], []).append(col_id)
+        mapping = [session_col_ids[column].pop(0) for column in columns]
+
+        #  Re-permute the nullspace basis to the order of the molecules and solve.
+        basis = [[vector[col_id] for col_id in mapping] for vector in self.__solver.get_nullspace_basis()]
+        presolved = _math_cache.basis_to_linear_forms(basis, len(columns))
+
+        #  Balance.
+        _bce_main.balance_chemical_equation_with_solution(ce, presolved, self.__opt)
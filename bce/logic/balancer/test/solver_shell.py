@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.api as _api
+import bce.math.engine as _math_engine
+import bce.math.solution_cache as _math_cache
+import bce.option as _opt
+import bce.utils.test_utils as _tu
+
+
+def _set_option(opt, name, value):
+    """Apply an option line.
+
+    :type opt: _opt.Option
+    :type name: str
+    :type value: str
+    :param opt: The BCE options.
+    :param name: The option name ('engine', 'cache' or 'nullspace').
+    :param value: The option value (an engine name, 'on' / 'off', or 'clear' which clears the
+                  solution cache).
+    :raise ValueError: Raise this error if the option line is invalid.
+    """
+
+    if name == "engine":
+        opt.set_solver_engine(value)
+    elif name == "cache" and value in ("on", "off"):
+        if value == "on":
+            opt.enable_solution_cache()
+        else:
+            opt.disable_solution_cache()
+    elif name == "cache" and value == "clear":
+        _math_cache.get_default_cache().clear()
+    elif name == "nullspace" and value in ("on", "off"):
+        if value == "on":
+            opt.enable_integer_nullspace()
+        else:
+            opt.disable_integer_nullspace()
+    else:
+        raise ValueError("Invalid option line.")
+
+
+def _get_solve_counts():
+    """Get the count of solves of each registered solver engine.
+
+    :rtype : dict[str, int]
+    :return: The counts.
+    """
+
+    statistics = _math_engine.get_engine_statistics()
+
+    return dict([(name, statistics.get_solve_count(name)) for name in _math_engine.get_engine_names()])
+
+
+def run_shell():
+    """Run the shell.
+
+    Each line is either a chemical equation (which is balanced and printed out) or an option
+    line like '@engine=sparse', '@cache=off' or '@nullspace=off' (which applies to all
+    following chemical equations). The solver engines used to balance each chemical equation
+    are printed out after the result, followed by the hits / misses of the solution cache if
+    it is enabled.
+
+    :rtype : int
+    :return: The exit code.
+    """
+
+    #  Generate a new option instance.
+    opt = _opt.Option()
+    opt.disable_user_abbreviation_dictionary()
+
+    while True:
+        #  Input a chemical equation or an option line.
+        try:
+            expr = _tu.input_prompt(">> ").replace(" ", "")
+        except EOFError:
+            break
+
+        #  Ignore zero length lines and comment lines.
+        if len(expr) == 0 or expr[0] == "#":
+            continue
+
+        #  Apply the option line.
+        if expr[0] == "@":
+            name, _, value = expr[1:].partition("=")
+            _set_option(opt, name, value)
+            continue
+
+        #  Balance the chemical equation and print it out.
+        counts = _get_solve_counts()
+        cache = _math_cache.get_default_cache()
+        hits = cache.get_hit_count()
+        misses = cache.get_miss_count()
+        try:
+            print(_api.balance_chemical_equation(expr, [_api.DECOMPILER_TEXT], opt)[0])
+        except _api.ParserErrorWrapper as err1:
+            print(str(err1))
+        except _api.LogicErrorWrapper as err2:
+            print(str(err2))
+
+        #  Print the used solver engines.
+        new_counts = _get_solve_counts()
+        used = [name for name in sorted(new_counts) if new_counts[name] != counts[name]]
+        print("Engines: %s" % (", ".join(used) if len(used) != 0 else "none"))
+
+        #  Print the hits / misses of the solution cache.
+        if opt.is_solution_cache_enabled():
+            print("Cache: hits=%d, misses=%d" % (cache.get_hit_count() - hits, cache.get_miss_count() - misses))
+
+    #  Print an empty line.
+    print("")
+
+    return 0
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.math.fraction_free as _math_ffe
+import fractions as _fractions
+
+#  NumPy is optional.
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
+#  The maximum magnitude of items that can be eliminated safely with 64-bit integers (each
+#  Bareiss step computes a * b - c * d, so 2 * SAFE_MAGNITUDE ^ 2 must be less than 2 ^ 63).
+SAFE_MAGNITUDE = 2 ** 31 - 1
+
+
+def is_available():
+    """Get whether the batch solver is available (NumPy is installed).
+
+    :rtype : bool
+    :return: Return True if it is available.
+    """
+
+    return _numpy is not None
+
+
+def _solve_exact(rows, unknown_count):
+    """Solve linear equations with the exact (native integer) fraction-free engine.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    """
+
+    rows = [list(row) for row in rows]
+    pivot_columns = _math_ffe.bareiss_eliminate(rows, unknown_count)
+
+    return _math_ffe.back_substitute(rows, pivot_columns, unknown_count)
+
+
+def _is_magnitude_safe(rows):
+    """Get whether all items of the rows can be stored in the stack safely.
+
+    :type rows: list[list[int]]
+    :param rows: The rows.
+    :rtype : bool
+    :return: Return True if safe.
+    """
+
+    for row in rows:
+        for value in row:
+            if value > SAFE_MAGNITUDE or value < -SAFE_MAGNITUDE:
+                return False
+
+    return True
+
+
+def _eliminate_stack(stack, unknown_count):
+    """Do fraction-free Gauss-Jordan elimination on a stack of matrices at once.
+
+    Each matrix selects its pivots in the same way as bce.math.fraction_free.bareiss_eliminate()
+    (the first non-zero item of the column), and all rows except the pivot row are eliminated,
+    so the pivot columns of each matrix form a diagonal submatrix at last. A matrix is marked as
+    failed (and is not eliminated any more) once its items are too large to do next step safely
+    or a division is not exact.
+
+    :param stack: The stack (a NumPy int64 array with shape (matrix count, row count, column
+                  count)), it would be transformed to reduced row echelon form (fraction-free)
+                  in place.
+    :type unknown_count: int
+    :param unknown_count: The count of unknowns.
+    :return: A tuple (The pivot flags (a boolean array with shape (matrix count, unknown
+             count)), The failure flags (a boolean array with shape (matrix count,))).
+    """
+
+    batch_c, row_c, _ = stack.shape
+    batch_ids = _numpy.arange(0, batch_c)
+    row_ids = _numpy.arange(0, row_c)
+    cur_rows = _numpy.zeros(batch_c, dtype=_numpy.int64)
+    prev_pivots = _numpy.ones(batch_c, dtype=_numpy.int64)
+    pivot_flags = _numpy.zeros((batch_c, unknown_count), dtype=bool)
+    failed = _numpy.zeros(batch_c, dtype=bool)
+
+    for col_id in range(0, unknown_count):
+        #  Check the magnitude before doing next step.
+        failed |= _numpy.abs(stack).max(axis=(1, 2)) > SAFE_MAGNITUDE
+        active = _numpy.logical_and(_numpy.logical_not(failed), cur_rows < row_c)
+
+        #  Find a row whose item in current column is non-zero.
+        candidates = _numpy.logical_and(stack[:, :, col_id] != 0, row_ids[None, :] >= cur_rows[:, None])
+        found = _numpy.logical_and(candidates.any(axis=1), active)
+        if not found.any():
+            continue
+        sel = batch_ids[found]
+        found_rows = candidates[sel].argmax(axis=1)
+        sel_rows = cur_rows[sel]
+
+        #  Exchange the row with the first row of current sub-matrix.
+        tmp = stack[sel, found_rows].copy()
+        stack[sel, found_rows] = stack[sel, sel_rows]
+        stack[sel, sel_rows] = tmp
+
+        #  Eliminate other rows.
+        sub = stack[sel]
+        pivot_rows = sub[_numpy.arange(0, len(sel)), sel_rows]
+        pivots = pivot_rows[:, col_id]
+        numerators = pivots[:, None, None] * sub - sub[:, :, col_id][:, :, None] * pivot_rows[:, None, :]
+        divisors = prev_pivots[sel][:, None, None]
+        others = (row_ids[None, :] != sel_rows[:, None])[:, :, None]
+        stack[sel] = _numpy.where(others, numerators // divisors, sub)
+
+        #  Check whether all divisions are exact.
+        inexact = _numpy.logical_and(others, numerators % divisors != 0).any(axis=(1, 2))
+        failed[sel] |= inexact
+
+        #  Save the pivots.
+        prev_pivots[sel] = pivots
+        pivot_flags[sel, col_id] = True
+        cur_rows[sel] += 1
+
+    return pivot_flags, failed
+
+
+def _reduced_rows_to_linear_forms(rows, pivot_columns, unknown_count):
+    """Read the linear forms of the solutions from a fraction-free reduced row echelon form.
+
+    :type rows: list[list[int]]
+    :type pivot_columns: list[int]
+    :type unknown_count: int
+    :param rows: The rows (each pivot row only contains its pivot and items of free unknowns).
+    :param pivot_columns: The pivot column of each echelon row.
+    :param unknown_count: The count of unknowns.
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    """
+
+    #  Get the columns of free unknowns.
+    pivot_set = set(pivot_columns)
+    free_columns = [col_id for col_id in range(0, unknown_count) if col_id not in pivot_set]
+
+    #  Initialize the linear forms of free unknowns.
+    forms = [None] * unknown_count
+    for free_id in range(0, len(free_columns)):
+        forms[free_columns[free_id]] = {free_id: _fractions.Fraction(1)}
+
+    #  Solve the pivot unknowns.
+    for row_id in range(0, len(pivot_columns)):
+        row = rows[row_id]
+        pivot = row[pivot_columns[row_id]]
+        form = {}
+        if row[-1] != 0:
+            form[-1] = _fractions.Fraction(row[-1], pivot)
+        for free_id in range(0, len(free_columns)):
+            value = row[free_columns[free_id]]
+            if value != 0:
+                form[free_id] = _fractions.Fraction(-value, pivot)
+        forms[pivot_columns[row_id]] = form
+
+    return forms, free_columns
+
+
+def _check_linear_forms(rows, forms, free_count):
+    """Check whether the linear forms of the unknowns solve the linear equations exactly.
+
+    :type rows: list[list[int]]
+    :type forms: list[dict]
+    :type free_count: int
+    :param rows: The rows (the last item of each row is the constant term).
+    :param forms: The linear form of each unknown.
+    :param free_count: The count of free unknowns.
+    :rtype : bool
+    :return: Return True if all equations are satisfied.
+    """
+
+    for row in rows:
+        #  The constant parts must sum to the constant term.
+        total = sum([row[col_id] * forms[col_id].get(-1, 0) for col_id in range(0, len(forms))])
+        if total != row[-1]:
+            return False
+
+        #  The parts of each free unknown must vanish.
+        for free_id in range(0, free_count):
+            total = sum([row[col_id] * forms[col_id].get(free_id, 0) for col_id in range(0, len(forms))])
+            if total != 0:
+                return False
+
+    return True
+
+
+def solve_linear_forms_batch(rows_list, unknown_counts):
+    """Solve many linear equations at once.
+
+    Linear equations with the same shape are stacked and eliminated together with 64-bit
+    integers. Linear equations whose items are (or become) too large are re-routed to the exact
+    engine, so the solutions are always exact and they are the same as the solutions
+    of other engines. The solutions of the stacked linear equations are verified exactly before
+    they are returned. If NumPy is not available, all linear equations are solved by the exact
+    engine.
+
+    :type rows_list: list[list[list[int]]]
+    :type unknown_counts: list[int]
+    :param rows_list: The rows of each linear equations (the last item of each row is the
+                      constant term).
+    :param unknown_counts: The count of unknowns of each linear equations.
+    :rtype : list[(list[dict], list[int])]
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns) for each
+             linear equations.
+    """
+
+    results = [None] * len(rows_list)
+
+    #  Group the linear equations by shape.
+    groups = {}
+    for eq_id in range(0, len(rows_list)):
+        rows = rows_list[eq_id]
+        if len(rows) == 0 or not is_available() or not _is_magnitude_safe(rows):
+            results[eq_id] = _solve_exact(rows, unknown_counts[eq_id])
+        else:
+            groups.setdefault((len(rows), unknown_counts[eq_id] + 1), []).append(eq_id)
+
+    #  Solve each group.
+    for shape in groups:
+        eq_ids = groups[shape]
+        unknown_count = shape[1] - 1
+        stack = _numpy.array([rows_list[eq_id] for eq_id in eq_ids], dtype=_numpy.int64)
+        pivot_flags, failed = _eliminate_stack(stack, unknown_count)
+
+        for stack_id in range(0, len(eq_ids)):
+            eq_id = eq_ids[stack_id]
+            if failed[stack_id]:
+                #  Re-route to the exact path.
+                results[eq_id] = _solve_exact(rows_list[eq_id], unknown_count)
+            else:
+                pivot_columns = _numpy.flatnonzero(pivot_flags[stack_id]).tolist()
+                forms, free_columns = _reduced_rows_to_linear_forms(stack[stack_id].tolist(),
+                                                                    pivot_columns,
+                                                                    unknown_count)
+
+                #  Verify the solutions exactly (re-route to the exact path if they are wrong).
+                if _check_linear_forms(rows_list[eq_id], forms, len(free_columns)):
+                    results[eq_id] = (forms, free_columns)
+                else:
+                    results[eq_id] = _solve_exact(rows_list[eq_id], unknown_count)
+
+    return results
+
+
+def solve_equations(matrices, symbol_header="X"):
+    """Solve many linear equations whose coefficients are all rational numbers at once.
+
+    :type matrices: list[bce.math.matrix.Matrix]
+    :type symbol_header: str
+    :param matrices: The matrices that contain the linear equations (they wouldn't be
+                     modified).
+    :param symbol_header: The symbol header of created symbols.
+    :rtype : list[bce.math.equation.SolvedEquation]
+    :return: The solutions of each linear equations.
+    :raise ValueError: Raise this error if a matrix contains non-rational items.
+    """
+
+    #  Convert the matrices.
+    rows_list = []
+    unknown_counts = []
+    for matrix in matrices:
+        rows = _math_ffe.to_integer_rows(matrix)
+        if rows is None:
+            raise ValueError("The matrix contains non-rational items.")
+        rows_list.append(rows)
+        unknown_counts.append(matrix.get_column_count() - 1)
+
+    #  Solve.
+    return [_math_ffe.linear_forms_to_solved_equation(forms, len(free_columns), symbol_header)
+            for forms, free_columns in solve_linear_forms_batch(rows_list, unknown_counts)]
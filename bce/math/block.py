@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.base.budget as _base_budget
+import bce.math.fraction_free as _math_ffe
+import fractions as _fractions
+import functools as _functools
+
+#  Add this for PyCharm auto-hinting.
+import bce.math.equation as _math_equ
+import bce.math.matrix as _mat
+
+
+class Block:
+    """Class for containing one independent block of linear equations."""
+
+    def __init__(self, row_ids, column_ids):
+        """Initialize the class with the rows and the unknown columns of the block.
+
+        :type row_ids: list[int]
+        :type column_ids: list[int]
+        :param row_ids: The row indexes (ascending).
+        :param column_ids: The unknown column indexes (ascending).
+        """
+
+        self.__rows = row_ids
+        self.__cols = column_ids
+
+    def get_row_ids(self):
+        """Get the row indexes of the block.
+
+        :rtype : list[int]
+        :return: The row indexes.
+        """
+
+        return self.__rows
+
+    def get_column_ids(self):
+        """Get the unknown column indexes of the block.
+
+        :rtype : list[int]
+        :return: The column indexes.
+        """
+
+        return self.__cols
+
+
+def _find_root(parents, node):
+    """Find the root of a node in the disjoint-set forest.
+
+    :type parents: list[int]
+    :type node: int
+    :param parents: The parent of each node.
+    :param node: The node.
+    :rtype : int
+    :return: The root.
+    """
+
+    root = node
+    while parents[root] != root:
+        root = parents[root]
+
+    #  Compress the path.
+    while parents[node] != root:
+        parents[node], node = root, parents[node]
+
+    return root
+
+
+def find_blocks(rows, unknown_count):
+    """Find the connected components of the bipartite atom-species graph.
+
+    A row and an unknown column are connected if the item at their intersection is non-zero.
+    Unknowns that don't appear in any row form blocks without rows, rows that don't contain
+    any unknown form blocks without columns.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :rtype : list[Block]
+    :return: The blocks (blocks with columns are ordered by their first column and are
+             followed by blocks without columns).
+    """
+
+    #  Nodes [0, unknown_count) are columns and nodes [unknown_count, ...) are rows.
+    parents = list(range(0, unknown_count + len(rows)))
+
+    for row_id in range(0, len(rows)):
+        row_node = unknown_count + row_id
+        row = rows[row_id]
+        for col_id in range(0, unknown_count):
+            if row[col_id] != 0:
+                root1 = _find_root(parents, row_node)
+                root2 = _find_root(parents, col_id)
+                if root1 != root2:
+                    parents[root2] = root1
+
+    #  Group the nodes.
+    groups = {}
+    order = []
+    for node in range(0, len(parents)):
+        root = _find_root(parents, node)
+        if root not in groups:
+            groups[root] = ([], [])
+            order.append(root)
+        if node < unknown_count:
+            groups[root][1].append(node)
+        else:
+            groups[root][0].append(node - unknown_count)
+
+    return [Block(groups[root][0], groups[root][1]) for root in order]
+
+
+def solve_block_linear_forms(sub_rows, budget=None):
+    """Solve the linear equations of one block with the fraction-free engine.
+
+    :type sub_rows: list[list[int]]
+    :type budget: _base_budget.Budget | None
+    :param sub_rows: The rows of the block (the last item of each row is the constant term).
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns), the
+             indexes are local to the block.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    unknown_count = len(sub_rows[0]) - 1 if len(sub_rows) != 0 else 0
+    pivot_columns = _math_ffe.bareiss_eliminate(sub_rows, unknown_count, budget)
+
+    return _math_ffe.back_substitute(sub_rows, pivot_columns, unknown_count)
+
+
+def solve_linear_forms(rows, unknown_count, mapper=map, budget=None):
+    """Solve linear equations block by block and merge the solutions.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :param mapper: A map()-like function used to solve the blocks (e.g. the map() method of
+                   a multiprocessing pool to solve the blocks in parallel).
+    :param budget: The work budget (None if unlimited). If the blocks are solved in other
+                   processes, each block consumes its own copy of the budget (so only the
+                   time limit is shared).
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Split the rows.
+    blocks = find_blocks(rows, unknown_count)
+    sub_matrices = []
+    for block in blocks:
+        col_ids = block.get_column_ids()
+        sub_rows = []
+        for row_id in block.get_row_ids():
+            row = rows[row_id]
+            sub_rows.append([row[col_id] for col_id in col_ids] + [row[-1]])
+        sub_matrices.append(sub_rows)
+
+    #  Solve each block (blocks without rows don't need to be solved).
+    block_solver = solve_block_linear_forms
+    if budget is not None:
+        block_solver = _functools.partial(solve_block_linear_forms, budget=budget)
+    results = list(mapper(block_solver, [sub_rows for sub_rows in sub_matrices if len(sub_rows) != 0]))
+
+    #  Get the columns of free unknowns (in global column order).
+    free_columns = []
+    result_id = 0
+    block_results = []
+    for block_id in range(0, len(blocks)):
+        col_ids = blocks[block_id].get_column_ids()
+        if len(sub_matrices[block_id]) == 0:
+            #  Columns without rows are free.
+            block_results.append(([{local_id: _fractions.Fraction(1)} for local_id in range(0, len(col_ids))],
+                                  list(range(0, len(col_ids)))))
+        else:
+            block_results.append(results[result_id])
+            result_id += 1
+
+        for local_col in block_results[-1][1]:
+            free_columns.append(col_ids[local_col])
+    free_columns.sort()
+    free_id_map = {}
+    for free_id in range(0, len(free_columns)):
+        free_id_map[free_columns[free_id]] = free_id
+
+    #  Merge the linear forms.
+    forms = [None] * unknown_count
+    for block_id in range(0, len(blocks)):
+        col_ids = blocks[block_id].get_column_ids()
+        local_forms, local_free_columns = block_results[block_id]
+
+        #  Map the local ID of free unknowns to the global ID.
+        local_to_global = {-1: -1}
+        for local_free_id in range(0, len(local_free_columns)):
+            local_to_global[local_free_id] = free_id_map[col_ids[local_free_columns[local_free_id]]]
+
+        for local_col in range(0, len(col_ids)):
+            form = {}
+            for key, value in local_forms[local_col].items():
+                form[local_to_global[key]] = value
+            forms[col_ids[local_col]] = form
+
+    return forms, free_columns
+
+
+def solve_equation(matrix, symbol_header="X", budget=None, mapper=map):
+    """Solve linear equations whose coefficients are all rational numbers block by block.
+
+    :type matrix: _mat.Matrix
+    :type symbol_header: str
+    :type budget: _base_budget.Budget | None
+    :param matrix: The matrix that contains the linear equations.
+    :param symbol_header: The symbol header of created symbols.
+    :param budget: The work budget (None if unlimited).
+    :param mapper: A map()-like function used to solve the blocks.
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions (presents with SolvedEquation class).
+    :raise ValueError: Raise this error if the matrix contains non-rational items.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Convert the matrix.
+    rows = _math_ffe.to_integer_rows(matrix)
+    if rows is None:
+        raise ValueError("The matrix contains non-rational items.")
+
+    #  Solve.
+    forms, free_columns = solve_linear_forms(rows, matrix.get_column_count() - 1, mapper, budget)
+
+    return _math_ffe.linear_forms_to_solved_equation(forms, len(free_columns), symbol_header)
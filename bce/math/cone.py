@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.math.fraction_free as _math_ffe
+
+
+def _make_primitive(vector):
+    """Divide an integer vector by the GCD of its items.
+
+    :type vector: list[int]
+    :param vector: The vector.
+    :rtype : list[int]
+    :return: The primitive vector.
+    """
+
+    divisor = 0
+    for value in vector:
+        divisor = _math_ffe.gcd(divisor, value)
+    if divisor > 1:
+        return [value // divisor for value in vector]
+
+    return vector
+
+
+def _combine(a, a_factor, b, b_factor):
+    """Get the primitive vector of |a_factor| * |a| + |b_factor| * |b|.
+
+    :type a: list[int]
+    :type a_factor: int
+    :type b: list[int]
+    :type b_factor: int
+    :param a: The first vector.
+    :param a_factor: The factor of the first vector.
+    :param b: The second vector.
+    :param b_factor: The factor of the second vector.
+    :rtype : list[int]
+    :return: The combined vector.
+    """
+
+    return _make_primitive([a_factor * x + b_factor * y for x, y in zip(a, b)])
+
+
+def _get_zero_set(vector, processed):
+    """Get the processed constraints that a vector makes tight.
+
+    :type vector: list[int]
+    :type processed: list[int]
+    :param vector: The vector.
+    :param processed: The processed constraints (coordinates).
+    :rtype : frozenset
+    :return: The tight constraints.
+    """
+
+    return frozenset([coord for coord in processed if vector[coord] == 0])
+
+
+def enumerate_extreme_rays(rows, unknown_count):
+    """Enumerate the extreme rays of the cone {x | A * x = 0, x >= 0} with the double
+    description method.
+
+    Each extreme ray is yielded as its minimal (primitive) non-negative integer vector, so every
+    non-negative solution is a non-negative combination of the yielded vectors. The rays are
+    only known after all constraints have been added, so all of them are computed before the
+    first one is yielded (stopping iterating early doesn't save any computation).
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :param rows: The rows of A (the last item of each row is the constant term, it must be
+                 zero). The rows would be modified.
+    :param unknown_count: The count of unknowns.
+    :rtype : collections.Iterable[list[int]]
+    :return: A generator that yields the extreme rays.
+    :raise ValueError: Raise this error if the linear equations are not homogeneous.
+    """
+
+    #  Get a basis of the nullspace (the lineality space of the initial cone).
+    basis = _math_ffe.integer_nullspace(rows, unknown_count)
+    if basis is None:
+        raise ValueError("The linear equations are not homogeneous.")
+
+    lines = [list(vector) for vector in basis]
+    rays = []
+    processed = []
+
+    #  Add constraints x[coord] >= 0 one by one.
+    for coord in range(0, unknown_count):
+        #  Find a line that is not tight on the constraint.
+        line_id = None
+        for tmp_id in range(0, len(lines)):
+            if lines[tmp_id][coord] != 0:
+                line_id = tmp_id
+                break
+
+        if line_id is not None:
+            #  Split the line, the positive half becomes a ray. Other lines and rays are
+            #  projected to the hyperplane x[coord] = 0.
+            line = lines.pop(line_id)
+            if line[coord] < 0:
+                line = [-value for value in line]
+            pivot = line[coord]
+            lines = [_combine(other, pivot, line, -other[coord]) if other[coord] != 0 else other for other in lines]
+            rays = [_combine(ray, pivot, line, -ray[coord]) if ray[coord] != 0 else ray for ray in rays]
+            rays.append(line)
+        else:
+            #  Partition the rays.
+            positive = [ray for ray in rays if ray[coord] > 0]
+            negative = [ray for ray in rays if ray[coord] < 0]
+            zero = [ray for ray in rays if ray[coord] == 0]
+
+            #  Combine adjacent pairs.
+            zero_sets = [_get_zero_set(ray, processed) for ray in rays]
+            new_rays = []
+            for p_ray in positive:
+                p_zero = _get_zero_set(p_ray, processed)
+                for n_ray in negative:
+                    common = p_zero & _get_zero_set(n_ray, processed)
+
+                    #  The rays are adjacent if no other ray is tight on all their common
+                    #  constraints.
+                    is_adjacent = True
+                    for ray_id in range(0, len(rays)):
+                        other = rays[ray_id]
+                        if other is p_ray or other is n_ray:
+                            continue
+                        if common <= zero_sets[ray_id]:
+                            is_adjacent = False
+                            break
+
+                    if is_adjacent:
+                        new_rays.append(_combine(n_ray, p_ray[coord], p_ray, -n_ray[coord]))
+
+            rays = positive + zero + new_rays
+
+        processed.append(coord)
+
+    #  Yield the rays (all of them have been computed).
+    for ray in rays:
+        yield ray
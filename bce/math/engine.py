@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.base.budget as _base_budget
+import bce.math.block as _math_block
+import bce.math.equation as _math_equ
+import bce.math.fraction_free as _math_ffe
+import bce.math.modular as _math_mod
+import bce.math.rational_function as _math_rf
+import bce.math.reduction as _math_reduction
+import bce.math.sparse as _math_sparse
+import threading as _threading
+
+#  Add this for PyCharm auto-hinting.
+import bce.math.matrix as _mat
+
+#  Engine names.
+ENGINE_AUTO = "auto"
+ENGINE_GENERIC = "generic"
+ENGINE_FRACTION_FREE = "fraction_free"
+ENGINE_BLOCK = "block"
+ENGINE_REDUCTION = "reduction"
+ENGINE_SPARSE = "sparse"
+ENGINE_MODULAR = "modular"
+ENGINE_RATIONAL_FUNCTION = "rational_function"
+
+#  Matrices whose unknown count is not greater than this value are solved by the fraction-free
+#  engine directly (the pre-passes don't pay off).
+AUTO_SMALL_UNKNOWN_COUNT = 3
+
+
+class SolverEngine:
+    """Class for describing a solver engine."""
+
+    def __init__(self, name, solver, supports_symbols, modifies_matrix, supports_budget=False,
+                 forms_solver=None):
+        """Initialize the class.
+
+        :type name: str
+        :type supports_symbols: bool
+        :type modifies_matrix: bool
+        :type supports_budget: bool
+        :param name: The engine name.
+        :param solver: The solver function, it takes the matrix and the symbol header (and the
+                       work budget if |supports_budget| is True) and returns a SolvedEquation.
+        :param supports_symbols: Whether the engine can solve matrices that contain symbols.
+        :param modifies_matrix: Whether the engine modifies the matrix.
+        :param supports_budget: Whether the solver function takes the work budget.
+        :param forms_solver: The function that solves integer rows to linear forms (None if not
+                             supported). It takes the rows (which may be modified), the unknown
+                             count and the work budget (keyword argument |budget|) and returns a
+                             tuple (The linear form of each unknown, The columns of free
+                             unknowns).
+        """
+
+        self.__name = name
+        self.__solver = solver
+        self.__sym = supports_symbols
+        self.__mod = modifies_matrix
+        self.__budget = supports_budget
+        self.__forms_solver = forms_solver
+
+    def get_name(self):
+        """Get the engine name.
+
+        :rtype : str
+        :return: The name.
+        """
+
+        return self.__name
+
+    def is_symbols_supported(self):
+        """Get whether the engine can solve matrices that contain symbols.
+
+        :rtype : bool
+        :return: Return True if supported.
+        """
+
+        return self.__sym
+
+    def is_matrix_modified(self):
+        """Get whether the engine modifies the matrix.
+
+        :rtype : bool
+        :return: Return True if the matrix would be modified.
+        """
+
+        return self.__mod
+
+    def is_linear_forms_supported(self):
+        """Get whether the engine can solve integer rows to linear forms.
+
+        :rtype : bool
+        :return: Return True if supported.
+        """
+
+        return self.__forms_solver is not None
+
+    def solve_linear_forms(self, rows, unknown_count, budget=None):
+        """Solve linear equations whose coefficients are all integers to linear forms.
+
+        :type rows: list[list[int]]
+        :type unknown_count: int
+        :type budget: _base_budget.Budget | None
+        :param rows: The rows (the last item of each row is the constant term). The rows may be
+                     modified.
+        :param unknown_count: The count of unknowns.
+        :param budget: The work budget (None if unlimited).
+        :rtype : (list[dict], list[int])
+        :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+        :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+        """
+
+        return self.__forms_solver(rows, unknown_count, budget=budget)
+
+    def solve(self, matrix, symbol_header="X", budget=None):
+        """Solve linear equations.
+
+        :type matrix: _mat.Matrix
+        :type symbol_header: str
+        :type budget: _base_budget.Budget | None
+        :param matrix: The matrix that contains the linear equations.
+        :param symbol_header: The symbol header of created symbols.
+        :param budget: The work budget (None if unlimited). If the solver function doesn't take
+                       the budget, the budget is only checked before and after solving.
+        :rtype : _math_equ.SolvedEquation
+        :return: The solutions (presents with SolvedEquation class).
+        :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+        """
+
+        if self.__budget:
+            return self.__solver(matrix, symbol_header, budget)
+
+        if budget is None:
+            return self.__solver(matrix, symbol_header)
+
+        budget.check()
+        ret = self.__solver(matrix, symbol_header)
+        budget.check()
+
+        return ret
+
+
+class EngineStatistics:
+    """Class for counting the solves of each solver engine (see solve_equation() and
+    solve_linear_forms())."""
+
+    def __init__(self):
+        """Initialize the class (all counters are zero)."""
+
+        self.__counts = {}
+        self.__lock = _threading.Lock()
+
+    def reset(self):
+        """Reset all counters to zero."""
+
+        with self.__lock:
+            self.__counts.clear()
+
+    def get_solve_count(self, name):
+        """Get the count of solves of an engine.
+
+        :type name: str
+        :param name: The engine name.
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__counts.get(name, 0)
+
+    def add_solve(self, name):
+        """Add a solve of an engine.
+
+        :type name: str
+        :param name: The engine name.
+        """
+
+        with self.__lock:
+            self.__counts[name] = self.__counts.get(name, 0) + 1
+
+
+#  The statistics of the engines.
+_statistics = EngineStatistics()
+
+
+def get_engine_statistics():
+    """Get the shared statistics of the solver engines.
+
+    :rtype : EngineStatistics
+    :return: The statistics.
+    """
+
+    return _statistics
+
+
+#  Registered engines.
+_engines = {}
+
+
+def register_engine(engine):
+    """Register a solver engine (an engine with the same name would be replaced).
+
+    :type engine: SolverEngine
+    :param engine: The engine.
+    :raise ValueError: Raise this error if the engine name is reserved.
+    """
+
+    if engine.get_name() == ENGINE_AUTO:
+        raise ValueError("The engine name is reserved.")
+
+    _engines[engine.get_name()] = engine
+
+
+def get_engine(name):
+    """Get a registered solver engine.
+
+    :type name: str
+    :param name: The engine name.
+    :rtype : SolverEngine
+    :return: The engine.
+    :raise KeyError: Raise this error if the engine is not registered.
+    """
+
+    return _engines[name]
+
+
+def get_engine_names():
+    """Get the names of all registered solver engines.
+
+    :rtype : list[str]
+    :return: The names (sorted).
+    """
+
+    return sorted(_engines.keys())
+
+
+def is_engine_name_valid(name):
+    """Get whether a name refers to a registered solver engine or the auto policy.
+
+    :type name: str
+    :param name: The engine name.
+    :rtype : bool
+    :return: Return True if valid.
+    """
+
+    return name == ENGINE_AUTO or name in _engines
+
+
+def select_engine(matrix):
+    """Select a solver engine from the traits of a matrix (the auto policy).
+
+    :type matrix: _mat.Matrix
+    :param matrix: The matrix that contains the linear equations.
+    :rtype : str
+    :return: The engine name.
+    """
+
+    #  Symbols present.
+    if not _math_ffe.is_integer_matrix(matrix):
+        return ENGINE_RATIONAL_FUNCTION
+
+    #  Small matrices.
+    if matrix.get_column_count() - 1 <= AUTO_SMALL_UNKNOWN_COUNT:
+        return ENGINE_FRACTION_FREE
+
+    #  Large sparse matrices.
+    if _math_sparse.is_sparse_preferred(matrix):
+        return ENGINE_SPARSE
+
+    return ENGINE_REDUCTION
+
+
+def solve_equation(matrix, engine_name=ENGINE_AUTO, symbol_header="X", budget=None):
+    """Solve linear equations with specific solver engine.
+
+    The matrix is never modified. If the engine can't solve matrices that contain symbols but
+    |matrix| contains symbols, the auto policy would be used instead.
+
+    :type matrix: _mat.Matrix
+    :type engine_name: str
+    :type symbol_header: str
+    :type budget: _base_budget.Budget | None
+    :param matrix: The matrix that contains the linear equations.
+    :param engine_name: The engine name (or ENGINE_AUTO).
+    :param symbol_header: The symbol header of created symbols.
+    :param budget: The work budget (None if unlimited).
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions (presents with SolvedEquation class).
+    :raise KeyError: Raise this error if the engine is not registered.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Select the engine.
+    if engine_name == ENGINE_AUTO:
+        engine = get_engine(select_engine(matrix))
+    else:
+        engine = get_engine(engine_name)
+        if not engine.is_symbols_supported() and not _math_ffe.is_integer_matrix(matrix):
+            engine = get_engine(select_engine(matrix))
+
+    #  Solve.
+    if engine.is_matrix_modified():
+        matrix = matrix.copy()
+    _statistics.add_solve(engine.get_name())
+
+    return engine.solve(matrix, symbol_header, budget)
+
+
+def solve_linear_forms(matrix, engine_name=ENGINE_AUTO, budget=None):
+    """Solve linear equations whose coefficients are all rational numbers to linear forms with
+    specific solver engine.
+
+    The matrix is never modified.
+
+    :type matrix: _mat.Matrix
+    :type engine_name: str
+    :type budget: _base_budget.Budget | None
+    :param matrix: The matrix that contains the linear equations.
+    :param engine_name: The engine name (or ENGINE_AUTO).
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[int]) | None
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns), or None
+             if the matrix contains non-rational items or the engine can't solve to linear
+             forms (solve_equation() should be used instead).
+    :raise KeyError: Raise this error if the engine is not registered.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Convert the matrix.
+    rows = _math_ffe.to_integer_rows(matrix)
+    if rows is None:
+        return None
+
+    #  Select the engine.
+    if engine_name == ENGINE_AUTO:
+        engine_name = select_engine(matrix)
+    engine = get_engine(engine_name)
+    if not engine.is_linear_forms_supported():
+        return None
+
+    #  Solve.
+    _statistics.add_solve(engine.get_name())
+
+    return engine.solve_linear_forms(rows, matrix.get_column_count() - 1, budget)
+
+
+def _solve_sparse(matrix, symbol_header="X", budget=None):
+    """Solve linear equations with the sparse engine.
+
+    :type matrix: _mat.Matrix
+    :type symbol_header: str
+    :type budget: _base_budget.Budget | None
+    :param matrix: The matrix that contains the linear equations.
+    :param symbol_header: The symbol header of created symbols.
+    :param budget: The work budget (None if unlimited).
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions (presents with SolvedEquation class).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    return _math_sparse.solve_equation(_math_sparse.from_dense(matrix), symbol_header, budget)
+
+
+def _solve_modular_linear_forms(rows, unknown_count, budget=None):
+    """Solve linear equations to linear forms with the multi-modular engine (the fraction-free
+    engine is used if the solutions can't be reconstructed).
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    solved = _math_mod.solve_linear_forms(rows, unknown_count, budget)
+    if solved is None:
+        return _math_ffe.solve_linear_forms(rows, unknown_count, budget)
+
+    return solved
+
+
+#  Register built-in engines.
+register_engine(SolverEngine(ENGINE_GENERIC, _math_equ.solve_equation, True, True, True))
+register_engine(SolverEngine(ENGINE_FRACTION_FREE, _math_ffe.solve_equation, False, False, True,
+                             _math_ffe.solve_linear_forms))
+register_engine(SolverEngine(ENGINE_BLOCK, _math_block.solve_equation, False, False, True,
+                             _math_block.solve_linear_forms))
+register_engine(SolverEngine(ENGINE_REDUCTION, _math_reduction.solve_equation, False, False, True,
+                             _math_reduction.solve_linear_forms))
+register_engine(SolverEngine(ENGINE_SPARSE, _solve_sparse, False, False, True, _math_sparse.solve_linear_forms))
+register_engine(SolverEngine(ENGINE_MODULAR, _math_mod.solve_equation, False, False, True,
+                             _solve_modular_linear_forms))
+register_engine(SolverEngine(ENGINE_RATIONAL_FUNCTION, _math_rf.solve_equation, True, True, True))
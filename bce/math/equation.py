@@ -5,13 +5,33 @@
 #  found in the license.txt file.
 #
 
+import bce.base.budget as _base_budget
 import bce.base.stack as _base_stack
+import random as _random
 import sympy as _sympy
+import threading as _threading
 
 #  Add this for PyCharm auto-hinting.
 import bce.math.matrix as _mat
 
 
+#  The modulus of the probabilistic answer checking (a Mersenne prime).
+_CHECK_MODULUS = 2 ** 61 - 1
+
+#  The random number generator of the probabilistic answer checking.
+_check_random = _random.Random()
+
+#  Results of the early rank test.
+RANK_TEST_UNKNOWN = 0
+RANK_TEST_ZERO_ONLY = 1
+
+
+class _ModularEvaluationError(Exception):
+    """Error raised when an expression can't be evaluated modulo a prime (Internal use only)."""
+
+    pass
+
+
 class _EqSolverStackItem:
     """Item class of the processing stack (Internal use only)."""
 
@@ -123,16 +143,258 @@ def unknown_id_to_symbol(unknown_id, header="X"):
     return header + r
 
 
-def solve_equation(matrix, symbol_header="X"):
+class UnknownSymbolTable:
+    """Class for interning the symbols of the unknowns that have the same symbol header.
+
+    The symbols are created once and shared by the solvers and the post-solving process, so
+    an unknown can be identified by its ID instead of by building and comparing its symbol.
+    """
+
+    def __init__(self, header):
+        """Initialize the class.
+
+        :type header: str
+        :param header: The symbol header.
+        """
+
+        self.__header = header
+        self.__symbols = []
+        self.__ids = {}
+        self.__lock = _threading.Lock()
+
+    def get_header(self):
+        """Get the symbol header.
+
+        :rtype : str
+        :return: The symbol header.
+        """
+
+        return self.__header
+
+    def get_symbol(self, unknown_id):
+        """Get the symbol of an unknown.
+
+        :type unknown_id: int
+        :param unknown_id: The ID of the unknown.
+        :rtype : _sympy.Symbol
+        :return: The symbol.
+        """
+
+        if unknown_id >= len(self.__symbols):
+            self.__extend(unknown_id + 1)
+
+        return self.__symbols[unknown_id]
+
+    def get_symbols(self, count):
+        """Get the symbols of the first |count| unknowns.
+
+        :type count: int
+        :param count: The count of unknowns.
+        :rtype : list[_sympy.Symbol]
+        :return: The symbols.
+        """
+
+        if count > len(self.__symbols):
+            self.__extend(count)
+
+        return self.__symbols[:count]
+
+    def get_unknown_id(self, symbol):
+        """Get the ID of the unknown that a symbol represents.
+
+        :type symbol: _sympy.Symbol
+        :param symbol: The symbol.
+        :rtype : int | None
+        :return: The ID, or None if the symbol isn't an interned symbol of this table.
+        """
+
+        return self.__ids.get(symbol)
+
+    def __extend(self, count):
+        """Create symbols until there are at least |count| symbols.
+
+        :type count: int
+        :param count: The count of symbols.
+        """
+
+        with self.__lock:
+            for unknown_id in range(len(self.__symbols), count):
+                symbol = _sympy.Symbol(unknown_id_to_symbol(unknown_id, self.__header))
+                self.__ids[symbol] = unknown_id
+                self.__symbols.append(symbol)
+
+
+#  The symbol tables (keyed by the symbol header).
+_symbol_tables = {}
+_symbol_tables_lock = _threading.Lock()
+
+
+def get_symbol_table(header="X"):
+    """Get the shared symbol table of specific symbol header.
+
+    :type header: str
+    :param header: The symbol header.
+    :rtype : UnknownSymbolTable
+    :return: The symbol table.
+    """
+
+    table = _symbol_tables.get(header)
+    if table is None:
+        with _symbol_tables_lock:
+            table = _symbol_tables.setdefault(header, UnknownSymbolTable(header))
+
+    return table
+
+
+class EliminationStatistics:
+    """Class for collecting diagnostic counters of the eliminations of the solver engines.
+
+    The counters show the arithmetic cost of solving, e.g. the maximum bit-length of the
+    numerators and denominators of the intermediate rational items. They are collected by the
+    generic solver (see solve_equation()), the fraction-free elimination (which is also used by
+    the block and reduction engines) and the sparse elimination. The elimination in the rational
+    function field (done by SymPy) and the modular elimination (whose items never grow) are not
+    counted.
+
+    Note that the growth-aware pivot rows (see _get_pivot_score()) are only chosen by the
+    generic solver. The fraction-free items are minors of the origin matrix whatever rows are
+    chosen, the sparse elimination chooses its pivot rows by Markowitz cost (which also prefers
+    small items) and the pivots of SymPy can't be controlled.
+    """
+
+    def __init__(self):
+        """Initialize the class (all counters are zero)."""
+
+        self.__solves = 0
+        self.__pivots = 0
+        self.__max_bits = 0
+        self.__lock = _threading.Lock()
+
+    def reset(self):
+        """Reset all counters to zero."""
+
+        with self.__lock:
+            self.__solves = 0
+            self.__pivots = 0
+            self.__max_bits = 0
+
+    def get_solve_count(self):
+        """Get the count of eliminated matrices (each block of a matrix is counted once).
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__solves
+
+    def get_pivot_count(self):
+        """Get the count of pivots (eliminated columns).
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__pivots
+
+    def get_max_bit_length(self):
+        """Get the maximum bit-length of the numerators and denominators of the intermediate
+        rational items.
+
+        :rtype : int
+        :return: The bit-length.
+        """
+
+        return self.__max_bits
+
+    def add_solve(self, pivot_count, max_bit_length):
+        """Add the counters of an eliminated matrix.
+
+        :type pivot_count: int
+        :type max_bit_length: int
+        :param pivot_count: The count of pivots.
+        :param max_bit_length: The maximum bit-length of the intermediate rational items.
+        """
+
+        with self.__lock:
+            self.__solves += 1
+            self.__pivots += pivot_count
+            self.__max_bits = max(self.__max_bits, max_bit_length)
+
+
+#  The statistics of the eliminations.
+_statistics = EliminationStatistics()
+
+
+def get_elimination_statistics():
+    """Get the shared statistics of the eliminations of the solver engines.
+
+    :rtype : EliminationStatistics
+    :return: The statistics.
+    """
+
+    return _statistics
+
+
+def _get_bit_length(value):
+    """Get the bit-length of a rational item (the larger one of its numerator and denominator).
+
+    :param value: The item.
+    :rtype : int
+    :return: The bit-length (0 if the item is not a rational number).
+    """
+
+    if not value.is_Rational:
+        return 0
+
+    return max(abs(int(value.p)).bit_length(), int(value.q).bit_length())
+
+
+def _get_pivot_score(matrix, row_id, offset_col, col_c):
+    """Get the score of choosing a row as the pivot row (the row with the smallest score is
+    chosen).
+
+    Rows whose pivot item is a rational number with short numerator and denominator and whose
+    items are mostly zero are preferred, so the intermediate items grow slowly. Rows whose pivot
+    item contains symbols are used only if there is no other choice.
+
+    :type matrix: _mat.Matrix
+    :type row_id: int
+    :type offset_col: int
+    :type col_c: int
+    :param matrix: The matrix.
+    :param row_id: The row index.
+    :param offset_col: The column of the pivot.
+    :param col_c: The column count.
+    :rtype : (int, int, int)
+    :return: The score.
+    """
+
+    row_ofx = matrix.get_row_offset(row_id)
+    pivot = matrix.get_item_by_offset(row_ofx + offset_col)
+    if not pivot.is_Rational:
+        return 1, 0, 0
+
+    nz_count = 0
+    for col_id in range(offset_col, col_c):
+        if not matrix.get_item_by_offset(row_ofx + col_id).is_zero:
+            nz_count += 1
+
+    return 0, _get_bit_length(pivot), nz_count
+
+
+def solve_equation(matrix, symbol_header="X", budget=None):
     """Solve linear equations.
 
     :type matrix: _mat.Matrix
     :type symbol_header: str
+    :type budget: _base_budget.Budget | None
     :param matrix: The matrix that contains the linear equations.
     :param symbol_header: The symbol header of created symbols.
+    :param budget: The work budget (None if unlimited).
     :rtype : SolvedEquation
     :return: The solutions (presents with SolvedEquation class).
     :raise RuntimeError: When a bug appears.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
     """
 
     #  Get matrix property.
@@ -143,6 +405,11 @@ def solve_equation(matrix, symbol_header="X"):
     #  Initialize
     ans = [None] * (col_c - 1)
     process_stack = _base_stack.Stack()
+    symbol_table = get_symbol_table(symbol_header)
+
+    #  Initialize the diagnostic counters.
+    pivot_count = 0
+    max_bit_length = 0
 
     #  Push initial matrix onto the stack.
     process_stack.push(_EqSolverStackItem(0, 0, 0))
@@ -169,28 +436,37 @@ def solve_equation(matrix, symbol_header="X"):
                 tmp_offset = matrix.get_item_offset(row_id, offset_col)
                 tmp_value = matrix.get_item_by_offset(tmp_offset)
                 if len(tmp_value.free_symbols) != 0:
+                    if budget is not None:
+                        budget.consume()
                     tmp_value = tmp_value.simplify()
                     matrix.write_item_by_offset(tmp_offset, tmp_value)
 
-            #  Determine the row(in current matrix) whose first item is non-zero and exchange
-            #  the row with the first row. If there's no such row, keep variable |found_nz_row|
-            #  unchanged.
+            #  Determine the row(in current matrix) whose first item is non-zero and has the
+            #  smallest pivot score and exchange the row with the first row. If there's no such
+            #  row, keep variable |found_nz_row| unchanged.
+            pivot_row = None
+            pivot_score = None
             for row_id in range(offset_row, row_c):
                 if not matrix.get_item_by_position(row_id, offset_col).is_zero:
-                    #  Exchange the row with the first row only if it's not the first row.
-                    if row_id != offset_row:
-                        matrix.exchange_row(row_id, offset_row)
+                    score = _get_pivot_score(matrix, row_id, offset_col, col_c)
+                    if pivot_score is None or score < pivot_score:
+                        pivot_row = row_id
+                        pivot_score = score
 
-                    #  Mark that we have found such row.
-                    found_nz_row = True
+            if pivot_row is not None:
+                #  Exchange the row with the first row only if it's not the first row.
+                if pivot_row != offset_row:
+                    matrix.exchange_row(pivot_row, offset_row)
 
-                    break
+                #  Mark that we have found such row.
+                found_nz_row = True
+                pivot_count += 1
 
             #  If all items in the first column are zero, set the value of unknown corresponding to
             #  this column to a new created unknown.
             if not found_nz_row:
                 #  Set the value of unknown corresponding to the first column.
-                ans[offset_col] = _sympy.Symbol(unknown_id_to_symbol(cur_unknown, symbol_header))
+                ans[offset_col] = symbol_table.get_symbol(cur_unknown)
                 cur_unknown += 1
 
                 #  If there are still some unknown, solve them.
@@ -221,7 +497,7 @@ def solve_equation(matrix, symbol_header="X"):
                 #  the first column.
                 for col_id in range(offset_col + 1, col_c - 1):
                     #  Set the value of unknown corresponding to this column.
-                    new_sym = _sympy.Symbol(unknown_id_to_symbol(cur_unknown, symbol_header))
+                    new_sym = symbol_table.get_symbol(cur_unknown)
                     ans[col_id] = new_sym
                     cur_unknown += 1
 
@@ -254,6 +530,7 @@ def solve_equation(matrix, symbol_header="X"):
                 if not tmp_value.is_zero:
                     tmp_value /= first_value
                     matrix.write_item_by_offset(tmp_offset, tmp_value)
+                    max_bit_length = max(max_bit_length, _get_bit_length(tmp_value))
 
                 #  Move to next item.
                 tmp_offset += 1
@@ -271,6 +548,10 @@ def solve_equation(matrix, symbol_header="X"):
                 #  Set the value of the first value to zero.
                 matrix.write_item_by_offset(tmp_offset, _sympy.Integer(0))
 
+                #  Count the operations of the row.
+                if budget is not None:
+                    budget.consume(col_c - offset_col)
+
                 #  Move to next item.
                 tmp_offset += 1
 
@@ -284,6 +565,7 @@ def solve_equation(matrix, symbol_header="X"):
 
                     #  Write the value back.
                     matrix.write_item_by_offset(tmp_offset, tmp_value)
+                    max_bit_length = max(max_bit_length, _get_bit_length(tmp_value))
 
                     #  Move to next item.
                     tmp_offset += 1
@@ -322,18 +604,24 @@ def solve_equation(matrix, symbol_header="X"):
 
         raise RuntimeError("Invalid break point.")
 
+    #  Save the diagnostic counters.
+    _statistics.add_solve(pivot_count, max_bit_length)
+
     return SolvedEquation(ans, cur_unknown)
 
 
-def check_solved_answer(origin_matrix, answer):
+def check_solved_answer(origin_matrix, answer, budget=None):
     """Check whether an answer satisfied all equations of an equations group.
 
     :type origin_matrix: _mat.Matrix
     :type answer: SolvedEquation
+    :type budget: _base_budget.Budget | None
     :param origin_matrix: The matrix of the equations group.
     :param answer: The solved answer.
+    :param budget: The work budget (None if unlimited).
     :rtype : bool
     :return: Return True if satisfied.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
     """
 
     #  Get answer and matrix size.
@@ -353,6 +641,8 @@ def check_solved_answer(origin_matrix, answer):
             s += origin_matrix.get_item_by_offset(ofx) * answer_list[col_id]
             ofx += 1
 
+        if budget is not None:
+            budget.consume()
         s = s.simplify()
 
         #  Check the sum.
@@ -360,3 +650,218 @@ def check_solved_answer(origin_matrix, answer):
             return False
 
     return True
+
+
+def _evaluate_modular(expression, values, modulus):
+    """Evaluate an expression modulo a prime.
+
+    :type values: dict
+    :type modulus: int
+    :param expression: The expression (SymPy object or integer).
+    :param values: The value (modulo |modulus|) of each symbol.
+    :param modulus: The prime modulus.
+    :rtype : int
+    :return: The value of the expression modulo |modulus|.
+    :raise _ModularEvaluationError: Raise this error if the expression can't be evaluated (e.g.
+                                    it contains irrational operations or it divides by zero).
+    """
+
+    if isinstance(expression, int):
+        return expression % modulus
+
+    if expression.is_Integer:
+        return int(expression) % modulus
+
+    if expression.is_Rational:
+        denominator = int(expression.q) % modulus
+        if denominator == 0:
+            raise _ModularEvaluationError()
+        return int(expression.p) * pow(denominator, modulus - 2, modulus) % modulus
+
+    if expression.is_Symbol:
+        if expression not in values:
+            raise _ModularEvaluationError()
+        return values[expression]
+
+    if expression.is_Add:
+        r = 0
+        for arg in expression.args:
+            r = (r + _evaluate_modular(arg, values, modulus)) % modulus
+        return r
+
+    if expression.is_Mul:
+        r = 1
+        for arg in expression.args:
+            r = r * _evaluate_modular(arg, values, modulus) % modulus
+        return r
+
+    if expression.is_Pow:
+        #  Only integer exponents are supported.
+        exponent = expression.exp.xreplace(dict([(k, _sympy.Integer(v)) for k, v in values.items()]))
+        if not exponent.is_Integer:
+            raise _ModularEvaluationError()
+        exponent = int(exponent)
+        base = _evaluate_modular(expression.base, values, modulus)
+        if exponent < 0:
+            if base == 0:
+                raise _ModularEvaluationError()
+            base = pow(base, modulus - 2, modulus)
+            exponent = -exponent
+        return pow(base, exponent, modulus)
+
+    raise _ModularEvaluationError()
+
+
+def check_solved_answer_probabilistic(origin_matrix, answer, budget=None):
+    """Check whether an answer satisfied all equations of an equations group with random
+    evaluation (Schwartz-Zippel).
+
+    All symbols are replaced with random integers and each row is checked modulo a large prime.
+    A row that can't be evaluated in this way is checked symbolically by check_solved_answer().
+    The matrix is only read.
+
+    :type origin_matrix: _mat.Matrix
+    :type answer: SolvedEquation
+    :type budget: _base_budget.Budget | None
+    :param origin_matrix: The matrix of the equations group.
+    :param answer: The solved answer.
+    :param budget: The work budget of the symbolic checking (None if unlimited).
+    :rtype : bool
+    :return: Return True if satisfied (with a negligible probability of false positive).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Get answer and matrix size.
+    answer_list = answer.get_answer_list()
+    col_c = origin_matrix.get_column_count()
+    row_c = origin_matrix.get_row_count()
+    modulus = _CHECK_MODULUS
+
+    #  Assign random values to all symbols.
+    values = {}
+    for expression in answer_list:
+        if not isinstance(expression, int):
+            for symbol in expression.free_symbols:
+                if symbol not in values:
+                    values[symbol] = _check_random.randint(1, modulus - 1)
+
+    #  Evaluate the answers.
+    try:
+        answer_values = [_evaluate_modular(expression, values, modulus) for expression in answer_list]
+    except _ModularEvaluationError:
+        return check_solved_answer(origin_matrix, answer, budget)
+
+    for row_id in range(0, row_c):
+        #  Get the offset of the first of the row.
+        ofx = origin_matrix.get_row_offset(row_id)
+
+        try:
+            #  Initialize sum.
+            s = 0
+
+            #  Get the sum.
+            for col_id in range(0, col_c - 1):
+                item = origin_matrix.get_item_by_offset(ofx + col_id)
+                if not isinstance(item, int):
+                    for symbol in item.free_symbols:
+                        if symbol not in values:
+                            values[symbol] = _check_random.randint(1, modulus - 1)
+                s = (s + _evaluate_modular(item, values, modulus) * answer_values[col_id]) % modulus
+
+            #  Check the sum.
+            if s != _evaluate_modular(origin_matrix.get_item_by_offset(ofx + col_c - 1), values, modulus):
+                return False
+        except _ModularEvaluationError:
+            #  Check the row symbolically.
+            s = _sympy.Integer(0)
+            for col_id in range(0, col_c - 1):
+                s += origin_matrix.get_item_by_offset(ofx + col_id) * answer_list[col_id]
+            if budget is not None:
+                budget.consume()
+            if s.simplify() != origin_matrix.get_item_by_offset(ofx + col_c - 1):
+                return False
+
+    return True
+
+
+def test_rank(matrix, budget=None):
+    """Test the rank of the coefficient matrix and the augmented matrix cheaply before solving.
+
+    All symbols are replaced with random integers and the rank is calculated modulo a large
+    prime. The rank modulo a prime never exceeds the real rank, so the results are exact:
+
+        - RANK_TEST_ZERO_ONLY: The linear equations are homogeneous and the rank of the
+          coefficient matrix equals to the count of unknowns, so all unknowns must be zero.
+        - RANK_TEST_UNKNOWN: Nothing can be proved. The linear equations need to be solved.
+
+    Only homogeneous linear equations (e.g. the matrices built by the balancer) are tested, the
+    result of other linear equations is always RANK_TEST_UNKNOWN.
+
+    The matrix is only read.
+
+    :type matrix: _mat.Matrix
+    :type budget: _base_budget.Budget | None
+    :param matrix: The matrix that contains the linear equations.
+    :param budget: The work budget (None if unlimited).
+    :rtype : int
+    :return: One of RANK_TEST_* constants.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Get matrix property.
+    row_c = matrix.get_row_count()
+    col_c = matrix.get_column_count()
+    unknown_count = col_c - 1
+    modulus = _CHECK_MODULUS
+
+    #  The coefficient matrix can't have full column rank.
+    if row_c < unknown_count:
+        return RANK_TEST_UNKNOWN
+
+    #  Only homogeneous linear equations are tested.
+    for row_id in range(0, row_c):
+        if matrix.get_item_by_position(row_id, unknown_count) != 0:
+            return RANK_TEST_UNKNOWN
+
+    #  Evaluate the items of the coefficient matrix.
+    values = {}
+    rows = []
+    try:
+        for row_id in range(0, row_c):
+            ofx = matrix.get_row_offset(row_id)
+            row = []
+            for col_id in range(0, unknown_count):
+                item = matrix.get_item_by_offset(ofx + col_id)
+                if not isinstance(item, int):
+                    for symbol in item.free_symbols:
+                        if symbol not in values:
+                            values[symbol] = _check_random.randint(1, modulus - 1)
+                row.append(_evaluate_modular(item, values, modulus))
+            rows.append(row)
+    except _ModularEvaluationError:
+        return RANK_TEST_UNKNOWN
+
+    #  Do elimination, stop once a column doesn't have a pivot.
+    for col_id in range(0, unknown_count):
+        #  Find a row whose item in current column is non-zero.
+        found_row = None
+        for row_id in range(col_id, row_c):
+            if rows[row_id][col_id] != 0:
+                found_row = row_id
+                break
+        if found_row is None:
+            return RANK_TEST_UNKNOWN
+        rows[found_row], rows[col_id] = rows[col_id], rows[found_row]
+
+        #  Eliminate the rows below.
+        pivot_row = rows[col_id]
+        inverse = pow(pivot_row[col_id], modulus - 2, modulus)
+        if budget is not None:
+            budget.consume((row_c - col_id - 1) * unknown_count)
+        for row_id in range(col_id + 1, row_c):
+            row = rows[row_id]
+            if row[col_id] != 0:
+                factor = row[col_id] * inverse % modulus
+                rows[row_id] = [(a - factor * b) % modulus for a, b in zip(row, pivot_row)]
+
+    return RANK_TEST_ZERO_ONLY
@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.base.budget as _base_budget
+import bce.math.equation as _math_equ
+import fractions as _fractions
+import sympy as _sympy
+
+#  Add this for PyCharm auto-hinting.
+import bce.math.matrix as _mat
+
+
+def to_native_rational(value):
+    """Convert a matrix item to a native rational number.
+
+    :param value: The item.
+    :rtype : _fractions.Fraction | None
+    :return: The converted value, or None if the item is not a rational number.
+    """
+
+    #  Native integers.
+    if isinstance(value, int):
+        return _fractions.Fraction(value)
+
+    #  SymPy rational numbers (includes integers).
+    if getattr(value, "is_Rational", False):
+        return _fractions.Fraction(int(value.p), int(value.q))
+
+    return None
+
+
+def gcd(a, b):
+    """Get the greatest common divisor of two integers.
+
+    :type a: int
+    :type b: int
+    :param a: The first integer.
+    :param b: The second integer.
+    :rtype : int
+    :return: The GCD value.
+    """
+
+    while b != 0:
+        a, b = b, a % b
+
+    return abs(a)
+
+
+def to_integer_rows(matrix):
+    """Convert a matrix that only contains rational numbers to rows of native integers.
+
+    Each row is scaled by the LCM of the denominators of its items. Scaling a row with a
+    non-zero number doesn't change the solutions of the linear equations.
+
+    :type matrix: _mat.Matrix
+    :param matrix: The matrix.
+    :rtype : list[list[int]] | None
+    :return: The rows, or None if there is at least one item which is not a rational number.
+    """
+
+    #  Get matrix property.
+    row_c = matrix.get_row_count()
+    col_c = matrix.get_column_count()
+
+    #  Initialize.
+    rows = []
+
+    for row_id in range(0, row_c):
+        #  Get the offset of the first item of the row.
+        ofx = matrix.get_row_offset(row_id)
+
+        #  Convert all items of the row and get the LCM of their denominators.
+        row = []
+        denom_lcm = 1
+        for col_id in range(0, col_c):
+            value = to_native_rational(matrix.get_item_by_offset(ofx + col_id))
+            if value is None:
+                return None
+            if value.denominator != 1:
+                denom_lcm = denom_lcm // gcd(denom_lcm, value.denominator) * value.denominator
+            row.append(value)
+
+        #  Scale the row.
+        rows.append([int(value * denom_lcm) for value in row])
+
+    return rows
+
+
+def is_integer_matrix(matrix):
+    """Get whether a matrix can be solved by the fraction-free engine.
+
+    :type matrix: _mat.Matrix
+    :param matrix: The matrix.
+    :rtype : bool
+    :return: Return True if all items of the matrix are rational numbers (no symbol).
+    """
+
+    #  Get matrix property.
+    row_c = matrix.get_row_count()
+    col_c = matrix.get_column_count()
+
+    for row_id in range(0, row_c):
+        ofx = matrix.get_row_offset(row_id)
+        for col_id in range(0, col_c):
+            if to_native_rational(matrix.get_item_by_offset(ofx + col_id)) is None:
+                return False
+
+    return True
+
+
+def bareiss_eliminate(rows, unknown_count, budget=None):
+    """Do fraction-free (Bareiss) elimination on rows of native integers.
+
+    The rows would be transformed to row echelon form in place. The pivot of each row is the
+    first non-zero item of the column, so the pivot columns are exactly the same as the
+    columns that the generic solver uses. Unlike the generic solver, the pivot row is not
+    chosen by the growth of the items, since each intermediate item is a minor of the origin
+    matrix (so its size is bounded by Hadamard's bound whatever rows are chosen). The pivot
+    count and the maximum bit-length of the pivot rows are added to the elimination
+    statistics (see _math_equ.get_elimination_statistics()).
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :param budget: The work budget (None if unlimited).
+    :rtype : list[int]
+    :return: The pivot column of each echelon row.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Initialize.
+    row_c = len(rows)
+    pivot_columns = []
+    prev_pivot = 1
+    cur_row = 0
+    max_bit_length = 0
+
+    for col_id in range(0, unknown_count):
+        #  Stop if all rows have been used.
+        if cur_row == row_c:
+            break
+
+        #  Find a row whose item in current column is non-zero.
+        found_row = None
+        for row_id in range(cur_row, row_c):
+            if rows[row_id][col_id] != 0:
+                found_row = row_id
+                break
+
+        #  The column doesn't have a pivot. The unknown of the column is free.
+        if found_row is None:
+            continue
+
+        #  Exchange the row with the first row of current sub-matrix.
+        if found_row != cur_row:
+            rows[found_row], rows[cur_row] = rows[cur_row], rows[found_row]
+
+        #  Eliminate the rows below. All divisions are exact (Sylvester's identity).
+        pivot_row = rows[cur_row]
+        pivot = pivot_row[col_id]
+        pivot_tail = pivot_row[col_id + 1:]
+        max_bit_length = max(max_bit_length, abs(max(pivot_row, key=abs)).bit_length())
+        if budget is not None:
+            budget.consume((row_c - cur_row - 1) * len(pivot_tail))
+        for row_id in range(cur_row + 1, row_c):
+            row = rows[row_id]
+            first_value = row[col_id]
+            row[col_id + 1:] = [(pivot * a - first_value * b) // prev_pivot
+                                for a, b in zip(row[col_id + 1:], pivot_tail)]
+            row[col_id] = 0
+
+        #  Save the pivot.
+        prev_pivot = pivot
+        pivot_columns.append(col_id)
+        cur_row += 1
+
+    #  Save the diagnostic counters.
+    _math_equ.get_elimination_statistics().add_solve(len(pivot_columns), max_bit_length)
+
+    return pivot_columns
+
+
+def back_substitute(rows, pivot_columns, unknown_count):
+    """Do back substitution on a row echelon form.
+
+    :type rows: list[list[int]]
+    :type pivot_columns: list[int]
+    :type unknown_count: int
+    :param rows: The rows in row echelon form.
+    :param pivot_columns: The pivot column of each echelon row.
+    :param unknown_count: The count of unknowns.
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns). A linear
+             form is a dictionary that maps the ID of a free unknown (or -1 for the constant
+             term) to its coefficient.
+    """
+
+    #  Get the columns of free unknowns.
+    pivot_set = set(pivot_columns)
+    free_columns = [col_id for col_id in range(0, unknown_count) if col_id not in pivot_set]
+
+    #  Initialize the linear forms of free unknowns.
+    forms = [None] * unknown_count
+    for free_id in range(0, len(free_columns)):
+        forms[free_columns[free_id]] = {free_id: _fractions.Fraction(1)}
+
+    #  Solve the pivot unknowns from the last echelon row.
+    for row_id in range(len(pivot_columns) - 1, -1, -1):
+        row = rows[row_id]
+        pivot_col = pivot_columns[row_id]
+
+        #  Initialize with the constant term.
+        form = {}
+        if row[-1] != 0:
+            form[-1] = _fractions.Fraction(row[-1])
+
+        #  Subtract solved unknowns.
+        for col_id in range(pivot_col + 1, unknown_count):
+            coeff = row[col_id]
+            if coeff == 0:
+                continue
+            for key, value in forms[col_id].items():
+                new_value = form.get(key, 0) - coeff * value
+                if new_value == 0:
+                    form.pop(key, None)
+                else:
+                    form[key] = new_value
+
+        #  Divide by the pivot.
+        pivot = row[pivot_col]
+        for key in form:
+            form[key] /= pivot
+
+        forms[pivot_col] = form
+
+    return forms, free_columns
+
+
+def linear_form_to_expression(form, symbols):
+    """Convert a linear form to a SymPy expression.
+
+    :type form: dict
+    :type symbols: list
+    :param form: The linear form.
+    :param symbols: The symbols of free unknowns.
+    :return: The expression.
+    """
+
+    terms = []
+    for key, value in form.items():
+        coeff = _sympy.Rational(value.numerator, value.denominator)
+        if key == -1:
+            terms.append(coeff)
+        else:
+            terms.append(coeff * symbols[key])
+
+    return _sympy.Add(*terms)
+
+
+def solve_equation(matrix, symbol_header="X", budget=None):
+    """Solve linear equations whose coefficients are all rational numbers.
+
+    Unlike the generic solver, this function works on native integers and it doesn't modify
+    |matrix|.
+
+    :type matrix: _mat.Matrix
+    :type symbol_header: str
+    :type budget: _base_budget.Budget | None
+    :param matrix: The matrix that contains the linear equations.
+    :param symbol_header: The symbol header of created symbols.
+    :param budget: The work budget (None if unlimited).
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions (presents with SolvedEquation class).
+    :raise ValueError: Raise this error if the matrix contains non-rational items.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Convert the matrix.
+    rows = to_integer_rows(matrix)
+    if rows is None:
+        raise ValueError("The matrix contains non-rational items.")
+
+    #  Do elimination and back substitution.
+    forms, free_columns = solve_linear_forms(rows, matrix.get_column_count() - 1, budget)
+
+    return linear_forms_to_solved_equation(forms, len(free_columns), symbol_header)
+
+
+def solve_linear_forms(rows, unknown_count, budget=None):
+    """Solve linear equations whose coefficients are all integers with fraction-free elimination.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term). The rows would be
+                 modified.
+    :param unknown_count: The count of unknowns.
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    pivot_columns = bareiss_eliminate(rows, unknown_count, budget)
+
+    return back_substitute(rows, pivot_columns, unknown_count)
+
+
+def linear_forms_to_solved_equation(forms, free_count, symbol_header="X"):
+    """Convert the linear forms of the solutions to a SolvedEquation.
+
+    :type forms: list[dict]
+    :type free_count: int
+    :type symbol_header: str
+    :param forms: The linear form of each unknown.
+    :param free_count: The count of free unknowns.
+    :param symbol_header: The symbol header of created symbols.
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions (presents with SolvedEquation class).
+    """
+
+    #  Get symbols of free unknowns.
+    symbols = _math_equ.get_symbol_table(symbol_header).get_symbols(free_count)
+
+    #  Convert the answers.
+    ans = [linear_form_to_expression(form, symbols) for form in forms]
+
+    return _math_equ.SolvedEquation(ans, free_count)
+
+
+def integer_nullspace(rows, unknown_count, budget=None):
+    """Get a basis of the integer nullspace of homogeneous linear equations.
+
+    Each basis vector corresponds to one free unknown (in column order). The item of the free
+    unknown is positive and all items of the vector are co-prime integers, so the vector is
+    the minimal integer solution when there is only one free unknown.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term). The rows would be
+                 modified.
+    :param unknown_count: The count of unknowns.
+    :param budget: The work budget (None if unlimited).
+    :rtype : list[list[int]] | None
+    :return: The basis vectors, or None if the linear equations are not homogeneous.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  The nullspace is only meaningful when all constant terms are zero.
+    for row in rows:
+        if row[-1] != 0:
+            return None
+
+    #  Do elimination and back substitution.
+    pivot_columns = bareiss_eliminate(rows, unknown_count, budget)
+    forms, free_columns = back_substitute(rows, pivot_columns, unknown_count)
+
+    return linear_forms_to_integer_basis(forms, len(free_columns))
+
+
+def linear_forms_to_integer_basis(forms, free_count):
+    """Convert the linear forms of the solutions of homogeneous linear equations to a basis of
+    the integer nullspace.
+
+    :type forms: list[dict]
+    :type free_count: int
+    :param forms: The linear form of each unknown.
+    :param free_count: The count of free unknowns.
+    :rtype : list[list[int]]
+    :return: The basis vectors.
+    """
+
+    basis = []
+    for free_id in range(0, free_count):
+        #  Get the rational vector.
+        vector = [_fractions.Fraction(form.get(free_id, 0)) for form in forms]
+
+        #  Clear the denominators.
+        denom_lcm = 1
+        for value in vector:
+            if value.denominator != 1:
+                denom_lcm = denom_lcm // gcd(denom_lcm, value.denominator) * value.denominator
+        vector = [int(value * denom_lcm) for value in vector]
+
+        #  Divide by the GCD of all items.
+        numer_gcd = 0
+        for value in vector:
+            numer_gcd = gcd(numer_gcd, value)
+        if numer_gcd > 1:
+            vector = [value // numer_gcd for value in vector]
+
+        basis.append(vector)
+
+    return basis
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import fractions as _fractions
+
+
+class IncrementalSolver:
+    """Class for solving homogeneous linear equations whose columns are appended or deleted one
+    by one.
+
+    The solver keeps the reduced row echelon form R of the matrix A (the columns are in the
+    order they were appended) and the transform E that satisfies R = E * A. Appending a column
+    only transforms the new column by E and eliminates it, deleting a column only re-selects the
+    pivot of one row. So each update costs about one rank update instead of a full elimination.
+    """
+
+    def __init__(self):
+        """Initialize an empty solver (no row, no column)."""
+
+        #  The reduced row echelon form and the transform.
+        self.__r = []
+        self.__e = []
+
+        #  The pivot column of each pivot row (ascending, rows after them are zero rows).
+        self.__pivots = []
+
+        #  The row index of each row label.
+        self.__labels = {}
+
+        #  The column count.
+        self.__cc = 0
+
+    def get_row_count(self):
+        """Get the row count.
+
+        :rtype : int
+        :return: The row count.
+        """
+
+        return len(self.__r)
+
+    def get_column_count(self):
+        """Get the column count.
+
+        :rtype : int
+        :return: The column count.
+        """
+
+        return self.__cc
+
+    def get_rank(self):
+        """Get the rank of the matrix.
+
+        :rtype : int
+        :return: The rank.
+        """
+
+        return len(self.__pivots)
+
+    def __add_row(self, label):
+        """Add a row whose items are all zero.
+
+        :param label: The row label.
+        :rtype : int
+        :return: The row index.
+        """
+
+        row_id = len(self.__r)
+        for e_row in self.__e:
+            e_row.append(_fractions.Fraction(0))
+        e_row = [_fractions.Fraction(0)] * (row_id + 1)
+        e_row[row_id] = _fractions.Fraction(1)
+        self.__e.append(e_row)
+        self.__r.append([_fractions.Fraction(0)] * self.__cc)
+        self.__labels[label] = row_id
+
+        return row_id
+
+    def __eliminate(self, pivot_row_id, col_id):
+        """Normalize a row by its item in specific column and eliminate the column in other rows.
+
+        :type pivot_row_id: int
+        :type col_id: int
+        :param pivot_row_id: The row index.
+        :param col_id: The column index.
+        """
+
+        pivot = self.__r[pivot_row_id][col_id]
+        r_pivot = [value / pivot for value in self.__r[pivot_row_id]]
+        e_pivot = [value / pivot for value in self.__e[pivot_row_id]]
+        self.__r[pivot_row_id] = r_pivot
+        self.__e[pivot_row_id] = e_pivot
+
+        for row_id in range(0, len(self.__r)):
+            if row_id == pivot_row_id:
+                continue
+            factor = self.__r[row_id][col_id]
+            if factor == 0:
+                continue
+            self.__r[row_id] = [a - factor * b for a, b in zip(self.__r[row_id], r_pivot)]
+            self.__e[row_id] = [a - factor * b for a, b in zip(self.__e[row_id], e_pivot)]
+
+    def __exchange_rows(self, row1, row2):
+        """Exchange two rows.
+
+        :type row1: int
+        :type row2: int
+        :param row1: The first row index.
+        :param row2: The second row index.
+        """
+
+        self.__r[row1], self.__r[row2] = self.__r[row2], self.__r[row1]
+        self.__e[row1], self.__e[row2] = self.__e[row2], self.__e[row1]
+
+    def append_column(self, column):
+        """Append a column to the right of the matrix.
+
+        :type column: dict
+        :param column: A dictionary that maps the row label to the (non-zero) rational item.
+                       Rows with new labels would be added.
+        """
+
+        #  Add new rows.
+        for label in column:
+            if label not in self.__labels:
+                self.__add_row(label)
+
+        #  Transform the column (the new column of R is E * column).
+        row_c = len(self.__r)
+        values = [_fractions.Fraction(0)] * row_c
+        for label, value in column.items():
+            values[self.__labels[label]] = _fractions.Fraction(value)
+        transformed = [sum([e_row[idx] * values[idx] for idx in range(0, row_c) if values[idx] != 0],
+                           _fractions.Fraction(0)) for e_row in self.__e]
+        for row_id in range(0, row_c):
+            self.__r[row_id].append(transformed[row_id])
+        col_id = self.__cc
+        self.__cc += 1
+
+        #  Find a zero row that has non-zero item in the new column.
+        rank = len(self.__pivots)
+        for row_id in range(rank, row_c):
+            if transformed[row_id] != 0:
+                self.__exchange_rows(row_id, rank)
+                self.__eliminate(rank, col_id)
+                self.__pivots.append(col_id)
+                break
+
+    def delete_column(self, col_id):
+        """Delete a column.
+
+        :type col_id: int
+        :param col_id: The column index.
+        """
+
+        #  Remove the column from R (E is unchanged).
+        for row in self.__r:
+            del row[col_id]
+        self.__cc -= 1
+
+        #  Shift the pivot columns.
+        pivot_row_id = None
+        for row_id in range(0, len(self.__pivots)):
+            if self.__pivots[row_id] == col_id:
+                pivot_row_id = row_id
+            elif self.__pivots[row_id] > col_id:
+                self.__pivots[row_id] -= 1
+
+        if pivot_row_id is None:
+            return
+
+        #  The row lost its pivot. Its first non-zero item becomes the new pivot.
+        row = self.__r[pivot_row_id]
+        new_pivot = None
+        for tmp_col in range(col_id, self.__cc):
+            if row[tmp_col] != 0:
+                new_pivot = tmp_col
+                break
+
+        if new_pivot is None:
+            #  The row becomes a zero row, move it after the pivot rows.
+            del self.__pivots[pivot_row_id]
+            for row_id in range(pivot_row_id, len(self.__pivots)):
+                self.__exchange_rows(row_id, row_id + 1)
+            return
+
+        self.__pivots[pivot_row_id] = new_pivot
+        self.__eliminate(pivot_row_id, new_pivot)
+
+        #  Keep the pivot columns ascending.
+        row_id = pivot_row_id
+        while row_id + 1 < len(self.__pivots) and self.__pivots[row_id + 1] < self.__pivots[row_id]:
+            self.__exchange_rows(row_id, row_id + 1)
+            self.__pivots[row_id], self.__pivots[row_id + 1] = self.__pivots[row_id + 1], self.__pivots[row_id]
+            row_id += 1
+
+    def get_linear_forms(self):
+        """Get the solutions.
+
+        :rtype : (list[dict], list[int])
+        :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+        """
+
+        #  Get the columns of free unknowns.
+        pivot_set = set(self.__pivots)
+        free_columns = [col_id for col_id in range(0, self.__cc) if col_id not in pivot_set]
+
+        #  Initialize the linear forms of free unknowns.
+        forms = [None] * self.__cc
+        for free_id in range(0, len(free_columns)):
+            forms[free_columns[free_id]] = {free_id: _fractions.Fraction(1)}
+
+        #  Solve the pivot unknowns.
+        for row_id in range(0, len(self.__pivots)):
+            row = self.__r[row_id]
+            form = {}
+            for free_id in range(0, len(free_columns)):
+                value = row[free_columns[free_id]]
+                if value != 0:
+                    form[free_id] = -value
+            forms[self.__pivots[row_id]] = form
+
+        return forms, free_columns
+
+    def get_nullspace_basis(self):
+        """Get a basis of the nullspace (one vector for each free unknown).
+
+        :rtype : list[list[_fractions.Fraction]]
+        :return: The basis vectors.
+        """
+
+        forms, free_columns = self.get_linear_forms()
+
+        return [[form.get(free_id, _fractions.Fraction(0)) for form in forms] for free_id in range(0, len(free_columns))]
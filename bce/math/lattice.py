@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import fractions as _fractions
+
+#  The default Lovasz constant.
+DEFAULT_DELTA = _fractions.Fraction(3, 4)
+
+
+def _dot(a, b):
+    """Get the dot product of two vectors.
+
+    :param a: The first vector.
+    :param b: The second vector.
+    :return: The dot product.
+    """
+
+    return sum([x * y for x, y in zip(a, b)])
+
+
+def _gram_schmidt(basis):
+    """Do Gram-Schmidt orthogonalization (without normalizing) exactly.
+
+    :type basis: list[list[int]]
+    :param basis: The basis vectors.
+    :rtype : (list[list[_fractions.Fraction]], list[list[_fractions.Fraction]], list[_fractions.Fraction])
+    :return: A tuple (The orthogonal vectors, The coefficients mu[i][j], The squared norm of
+             each orthogonal vector).
+    """
+
+    count = len(basis)
+    orthogonal = []
+    mu = [[_fractions.Fraction(0)] * count for _ in range(0, count)]
+    norms = []
+    for i in range(0, count):
+        vector = [_fractions.Fraction(value) for value in basis[i]]
+        for j in range(0, i):
+            mu[i][j] = _dot(basis[i], orthogonal[j]) / norms[j]
+            vector = [a - mu[i][j] * b for a, b in zip(vector, orthogonal[j])]
+        orthogonal.append(vector)
+        norms.append(_dot(vector, vector))
+
+    return orthogonal, mu, norms
+
+
+def lll_reduce(basis, delta=DEFAULT_DELTA):
+    """Reduce a lattice basis with the LLL algorithm (exact rational arithmetic).
+
+    The reduced basis spans the same lattice and its vectors are short and nearly orthogonal.
+    Each reduced vector is oriented so that most of its non-zero items are positive (or its
+    first non-zero item is positive if there is a tie).
+
+    :type basis: list[list[int]]
+    :type delta: _fractions.Fraction
+    :param basis: The basis vectors (linearly independent integer vectors).
+    :param delta: The Lovasz constant (1/4 < delta < 1).
+    :rtype : list[list[int]]
+    :return: The reduced basis vectors.
+    """
+
+    basis = [list(vector) for vector in basis]
+    count = len(basis)
+    if count == 0:
+        return basis
+
+    #  Orthogonalize once, the coefficients and the squared norms are updated incrementally.
+    _, mu, norms = _gram_schmidt(basis)
+    k = 1
+    while k < count:
+        #  Size reduction (the orthogonal vectors don't change).
+        for j in range(k - 1, -1, -1):
+            q = round(mu[k][j])
+            if q != 0:
+                basis[k] = [a - q * b for a, b in zip(basis[k], basis[j])]
+                mu[k][j] -= q
+                for i in range(0, j):
+                    mu[k][i] -= q * mu[j][i]
+
+        #  Lovasz condition.
+        mu_k = mu[k][k - 1]
+        if norms[k] >= (delta - mu_k * mu_k) * norms[k - 1]:
+            k += 1
+            continue
+
+        #  Exchange the vectors and update the coefficients and the squared norms of the
+        #  exchanged orthogonal vectors (others don't change).
+        basis[k], basis[k - 1] = basis[k - 1], basis[k]
+        new_norm = norms[k] + mu_k * mu_k * norms[k - 1]
+        mu[k][k - 1] = mu_k * norms[k - 1] / new_norm
+        norms[k] = norms[k - 1] * norms[k] / new_norm
+        norms[k - 1] = new_norm
+        for j in range(0, k - 1):
+            mu[k][j], mu[k - 1][j] = mu[k - 1][j], mu[k][j]
+        for i in range(k + 1, count):
+            tmp = mu[i][k]
+            mu[i][k] = mu[i][k - 1] - mu_k * tmp
+            mu[i][k - 1] = tmp + mu[k][k - 1] * mu[i][k]
+        k = max(k - 1, 1)
+
+    #  Orient the vectors.
+    for idx in range(0, count):
+        vector = basis[idx]
+        positive_count = len([value for value in vector if value > 0])
+        negative_count = len([value for value in vector if value < 0])
+        if negative_count > positive_count:
+            basis[idx] = [-value for value in vector]
+        elif negative_count == positive_count:
+            for value in vector:
+                if value != 0:
+                    if value < 0:
+                        basis[idx] = [-item for item in vector]
+                    break
+
+    return basis
@@ -33,6 +33,24 @@ class Matrix:
             self.__ptr.append(data_ptr)
             data_ptr += column_count
 
+    def copy(self):
+        """Get a copy of the matrix.
+
+        The items are shared with the copy (they are immutable), only the value pool and the
+        index pointers are duplicated.
+
+        :rtype : Matrix
+        :return: The copy.
+        """
+
+        ret = Matrix(0, 0)
+        ret.__rc = self.__rc
+        ret.__cc = self.__cc
+        ret.__v = list(self.__v)
+        ret.__ptr = list(self.__ptr)
+
+        return ret
+
     def exchange_row(self, row1, row2):
         """Exchange two rows.
 
@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.base.budget as _base_budget
+import bce.math.fraction_free as _math_ffe
+import fractions as _fractions
+
+#  Add this for PyCharm auto-hinting.
+import bce.math.equation as _math_equ
+import bce.math.matrix as _mat
+
+#  The upper bound of the primes (exclusive).
+_PRIME_UPPER_BOUND = 2 ** 31
+
+#  The maximum count of primes that would be tried before giving up.
+_MAX_PRIME_COUNT = 1024
+
+#  Cache of generated primes (in descending order).
+_prime_cache = []
+
+
+def _is_prime(n):
+    """Get whether an integer (less than 3215031751) is a prime.
+
+    :type n: int
+    :param n: The integer.
+    :rtype : bool
+    :return: Return True if it is a prime.
+    """
+
+    if n < 2:
+        return False
+
+    for p in (2, 3, 5, 7):
+        if n % p == 0:
+            return n == p
+
+    #  Deterministic Miller-Rabin test (bases 2, 3, 5, 7 are enough for n < 3215031751).
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in (2, 3, 5, 7):
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(0, s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def get_prime(index):
+    """Get the |index|-th largest prime below 2^31.
+
+    :type index: int
+    :param index: The index.
+    :rtype : int
+    :return: The prime.
+    """
+
+    #  Generate primes until the cache is large enough.
+    while len(_prime_cache) <= index:
+        if len(_prime_cache) == 0:
+            candidate = _PRIME_UPPER_BOUND - 1
+        else:
+            candidate = _prime_cache[-1] - 2
+
+        while not _is_prime(candidate):
+            candidate -= 2
+
+        _prime_cache.append(candidate)
+
+    return _prime_cache[index]
+
+
+def _isqrt(n):
+    """Get the integer square root of a non-negative integer.
+
+    :type n: int
+    :param n: The integer.
+    :rtype : int
+    :return: The largest integer whose square is not greater than |n|.
+    """
+
+    if n < 2:
+        return n
+
+    x = n
+    y = (x + 1) // 2
+    while y < x:
+        x = y
+        y = (x + n // x) // 2
+
+    return x
+
+
+def _rref_mod(rows, unknown_count, prime, budget=None):
+    """Transform the linear equations to reduced row echelon form modulo a prime.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type prime: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :param prime: The prime.
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[list[int]], list[int])
+    :return: A tuple (The reduced rows, The pivot column of each leading row).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Reduce all items.
+    mtx = [[value % prime for value in row] for row in rows]
+    row_c = len(mtx)
+
+    #  Initialize.
+    pivot_columns = []
+    cur_row = 0
+
+    for col_id in range(0, unknown_count):
+        #  Stop if all rows have been used.
+        if cur_row == row_c:
+            break
+
+        #  Find a row whose item in current column is non-zero.
+        found_row = None
+        for row_id in range(cur_row, row_c):
+            if mtx[row_id][col_id] != 0:
+                found_row = row_id
+                break
+
+        if found_row is None:
+            continue
+
+        #  Exchange the row with the first row of current sub-matrix.
+        if found_row != cur_row:
+            mtx[found_row], mtx[cur_row] = mtx[cur_row], mtx[found_row]
+
+        #  Normalize the pivot row.
+        pivot_row = mtx[cur_row]
+        inverse = pow(pivot_row[col_id], prime - 2, prime)
+        pivot_row[col_id:] = [value * inverse % prime for value in pivot_row[col_id:]]
+        pivot_tail = pivot_row[col_id:]
+        if budget is not None:
+            budget.consume((row_c - 1) * len(pivot_tail))
+
+        #  Eliminate all other rows.
+        for row_id in range(0, row_c):
+            if row_id == cur_row:
+                continue
+            row = mtx[row_id]
+            first_value = row[col_id]
+            if first_value == 0:
+                continue
+            row[col_id:] = [(a - first_value * b) % prime for a, b in zip(row[col_id:], pivot_tail)]
+
+        pivot_columns.append(col_id)
+        cur_row += 1
+
+    return mtx, pivot_columns
+
+
+def _rational_reconstruct(value, modulus):
+    """Reconstruct a rational number from its residue.
+
+    :type value: int
+    :type modulus: int
+    :param value: The residue.
+    :param modulus: The modulus.
+    :rtype : _fractions.Fraction | None
+    :return: The rational number whose numerator and denominator are both not greater than
+             sqrt(|modulus| / 2), or None if there is no such number.
+    """
+
+    bound = _isqrt(modulus // 2)
+
+    #  Run the extended Euclidean algorithm until the remainder is small enough.
+    r0, r1 = modulus, value % modulus
+    s0, s1 = 0, 1
+    while r1 > bound:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        s0, s1 = s1, s0 - q * s1
+
+    if s1 == 0 or abs(s1) > bound:
+        return None
+
+    result = _fractions.Fraction(r1, s1)
+    if result.denominator != abs(s1):
+        return None
+
+    return result
+
+
+def _check_linear_forms(rows, forms):
+    """Check whether the linear forms of the solutions satisfy all equations exactly.
+
+    :type rows: list[list[int]]
+    :type forms: list[dict]
+    :param rows: The rows (the last item of each row is the constant term).
+    :param forms: The linear form of each unknown.
+    :rtype : bool
+    :return: Return True if satisfied.
+    """
+
+    for row in rows:
+        #  Get the sum.
+        s = {}
+        for col_id in range(0, len(forms)):
+            coeff = row[col_id]
+            if coeff == 0:
+                continue
+            for key, value in forms[col_id].items():
+                s[key] = s.get(key, 0) + coeff * value
+
+        #  Check the sum.
+        for key, value in s.items():
+            if key == -1:
+                if value != row[-1]:
+                    return False
+            elif value != 0:
+                return False
+
+        if -1 not in s and row[-1] != 0:
+            return False
+
+    return True
+
+
+def solve_linear_forms(rows, unknown_count, budget=None):
+    """Solve linear equations modulo several primes and reconstruct the exact solutions.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[int]) | None
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns), or None
+             if the solutions can't be reconstructed (e.g. the linear equations are conflicting).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Get the bound of the reconstruction modulus. The numerator and the denominator of each
+    #  item of the solution are minors of the matrix, so they are not greater than the product
+    #  of the 1-norms of all rows.
+    det_bound = 1
+    for row in rows:
+        det_bound *= max(1, sum([abs(value) for value in row]))
+    modulus_bound = 2 * det_bound * det_bound
+
+    #  Initialize.
+    modulus = 1
+    residues = None
+    best_pivots = None
+
+    for prime_id in range(0, _MAX_PRIME_COUNT):
+        prime = get_prime(prime_id)
+
+        #  Solve modulo the prime.
+        reduced, pivots = _rref_mod(rows, unknown_count, prime, budget)
+        pivot_set = set(pivots)
+        free_columns = [col_id for col_id in range(0, unknown_count) if col_id not in pivot_set]
+
+        #  Let the exact path handle conflicting equations.
+        for row in reduced[len(pivots):]:
+            if row[-1] != 0:
+                return None
+
+        #  Flatten the solution (for each pivot, the constant term and the coefficients of free
+        #  unknowns).
+        flattened = []
+        for row in reduced[:len(pivots)]:
+            flattened.append(row[-1])
+            for col_id in free_columns:
+                flattened.append(-row[col_id] % prime)
+
+        #  Primes that drop the rank or move the pivots are unlucky, the rational pivots are the
+        #  lexicographically smallest ones with the largest rank.
+        if best_pivots is None or len(pivots) > len(best_pivots) or \
+                (len(pivots) == len(best_pivots) and pivots < best_pivots):
+            modulus = prime
+            residues = flattened
+            best_pivots = pivots
+        elif pivots == best_pivots:
+            #  Combine with Chinese remainder theorem.
+            factor = modulus * pow(modulus % prime, prime - 2, prime)
+            new_modulus = modulus * prime
+            residues = [(old + factor * (new - old)) % new_modulus for old, new in zip(residues, flattened)]
+            modulus = new_modulus
+        else:
+            continue
+
+        #  Reconstruct the rational solutions.
+        free_columns = [col_id for col_id in range(0, unknown_count) if col_id not in set(best_pivots)]
+        forms = [None] * unknown_count
+        for free_id in range(0, len(free_columns)):
+            forms[free_columns[free_id]] = {free_id: _fractions.Fraction(1)}
+
+        stride = len(free_columns) + 1
+        reconstructed = True
+        for pivot_id in range(0, len(best_pivots)):
+            form = {}
+            for key in range(-1, len(free_columns)):
+                value = _rational_reconstruct(residues[pivot_id * stride + key + 1], modulus)
+                if value is None:
+                    reconstructed = False
+                    break
+                if value != 0:
+                    form[key] = value
+            if not reconstructed:
+                break
+            forms[best_pivots[pivot_id]] = form
+
+        #  Check the solutions.
+        if reconstructed and _check_linear_forms(rows, forms):
+            return forms, free_columns
+
+        #  Give up if the modulus is large enough but the reconstruction still failed.
+        if modulus > modulus_bound:
+            return None
+
+    return None
+
+
+def solve_equation(matrix, symbol_header="X", budget=None):
+    """Solve linear equations whose coefficients are all rational numbers with multi-modular
+    arithmetic.
+
+    This function doesn't modify |matrix|. If the solutions can't be reconstructed, the
+    fraction-free engine would be used instead.
+
+    :type matrix: _mat.Matrix
+    :type symbol_header: str
+    :type budget: _base_budget.Budget | None
+    :param matrix: The matrix that contains the linear equations.
+    :param symbol_header: The symbol header of created symbols.
+    :param budget: The work budget (None if unlimited).
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions (presents with SolvedEquation class).
+    :raise ValueError: Raise this error if the matrix contains non-rational items.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Convert the matrix.
+    rows = _math_ffe.to_integer_rows(matrix)
+    if rows is None:
+        raise ValueError("The matrix contains non-rational items.")
+
+    #  Solve.
+    solved = solve_linear_forms(rows, matrix.get_column_count() - 1, budget)
+    if solved is None:
+        return _math_ffe.solve_equation(matrix, symbol_header, budget)
+
+    forms, free_columns = solved
+
+    return _math_ffe.linear_forms_to_solved_equation(forms, len(free_columns), symbol_header)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.base.budget as _base_budget
+import bce.math.equation as _math_equ
+import sympy as _sympy
+
+#  Add this for PyCharm auto-hinting.
+import bce.math.matrix as _mat
+
+#  DomainMatrix is only available in newer SymPy.
+try:
+    from sympy.polys.matrices import DomainMatrix as _DomainMatrix
+except ImportError:
+    _DomainMatrix = None
+
+
+def is_available():
+    """Get whether the rational function engine is available in current SymPy.
+
+    :rtype : bool
+    :return: Return True if it is available.
+    """
+
+    return _DomainMatrix is not None
+
+
+def _to_domain_matrix(matrix):
+    """Convert a matrix to a SymPy DomainMatrix over a rational function field.
+
+    :type matrix: _mat.Matrix
+    :param matrix: The matrix.
+    :return: The DomainMatrix, or None if the items are not rational functions of the symbols
+             (e.g. irrational numbers or symbolic exponents exist).
+    """
+
+    #  Get matrix property.
+    row_c = matrix.get_row_count()
+    col_c = matrix.get_column_count()
+
+    #  Build the SymPy matrix.
+    items = []
+    for row_id in range(0, row_c):
+        ofx = matrix.get_row_offset(row_id)
+        items.append([matrix.get_item_by_offset(ofx + col_id) for col_id in range(0, col_c)])
+
+    dm = _DomainMatrix.from_Matrix(_sympy.Matrix(row_c, col_c, lambda i, j: items[i][j]))
+
+    #  Only rational function fields are exact and canonical.
+    domain = dm.domain
+    if not (domain.is_ZZ or domain.is_QQ or domain.is_PolynomialRing or domain.is_FractionField):
+        return None
+
+    #  The generators must be plain symbols (not something like 2^n or sqrt(2)).
+    for gen in getattr(domain, "symbols", ()):
+        if not gen.is_Symbol:
+            return None
+
+    return dm.to_field()
+
+
+def solve_equation(matrix, symbol_header="X", budget=None):
+    """Solve linear equations whose coefficients are rational functions of symbols.
+
+    All arithmetic is done in the rational function field of the symbols (canonical forms, no
+    heuristic simplifying). If the items can't be represented in such field, the generic solver
+    would be used instead. The matrix would be modified only in the latter case.
+
+    :type matrix: _mat.Matrix
+    :type symbol_header: str
+    :type budget: _base_budget.Budget | None
+    :param matrix: The matrix that contains the linear equations.
+    :param symbol_header: The symbol header of created symbols.
+    :param budget: The work budget (None if unlimited). The elimination in the rational
+                   function field is done by SymPy and can't be interrupted, so the budget is
+                   only checked before it and charged after it. The budget is passed to the
+                   generic solver.
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions (presents with SolvedEquation class).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Convert the matrix.
+    dm = _to_domain_matrix(matrix) if is_available() else None
+    if dm is None:
+        return _math_equ.solve_equation(matrix, symbol_header, budget)
+
+    if budget is not None:
+        budget.check()
+
+    #  Transform to reduced row echelon form (the budget can't be consumed inside rref(), so a
+    #  single elimination may run over the limits).
+    unknown_count = matrix.get_column_count() - 1
+    reduced, pivots = dm.rref()
+    pivots = list(pivots)
+    if budget is not None:
+        budget.consume(len(pivots) * matrix.get_row_count() * matrix.get_column_count())
+
+    #  Let the generic solver handle conflicting equations.
+    if len(pivots) != 0 and pivots[-1] == unknown_count:
+        return _math_equ.solve_equation(matrix, symbol_header, budget)
+
+    #  Create symbols of free unknowns.
+    domain = reduced.domain
+    items = reduced.to_list()
+    pivot_set = set(pivots)
+    ans = [None] * unknown_count
+    cur_unknown = 0
+    symbol_table = _math_equ.get_symbol_table(symbol_header)
+    for col_id in range(0, unknown_count):
+        if col_id not in pivot_set:
+            ans[col_id] = symbol_table.get_symbol(cur_unknown)
+            cur_unknown += 1
+
+    #  Express the pivot unknowns with the free unknowns.
+    for row_id in range(0, len(pivots)):
+        row = items[row_id]
+        value = domain.to_sympy(row[unknown_count])
+        for col_id in range(pivots[row_id] + 1, unknown_count):
+            if col_id not in pivot_set and row[col_id] != domain.zero:
+                value -= domain.to_sympy(row[col_id]) * ans[col_id]
+        ans[pivots[row_id]] = value
+
+    return _math_equ.SolvedEquation(ans, cur_unknown)
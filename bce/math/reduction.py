@@ -0,0 +1,460 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.base.budget as _base_budget
+import bce.math.block as _math_block
+import bce.math.fraction_free as _math_ffe
+import fractions as _fractions
+
+#  Add this for PyCharm auto-hinting.
+import bce.math.equation as _math_equ
+import bce.math.matrix as _mat
+
+
+class Elimination:
+    """Class for containing one eliminated unknown.
+
+    The value of the eliminated unknown is |constant| + |ratio| * (the value of the
+    dependent unknown).
+    """
+
+    def __init__(self, column, dependent_column, ratio, constant):
+        """Initialize the class.
+
+        :type column: int
+        :type dependent_column: int | None
+        :type ratio: _fractions.Fraction
+        :type constant: _fractions.Fraction
+        :param column: The column of the eliminated unknown.
+        :param dependent_column: The column of the dependent unknown (None if the eliminated
+                                 unknown is a constant).
+        :param ratio: The ratio.
+        :param constant: The constant.
+        """
+
+        self.__col = column
+        self.__dep = dependent_column
+        self.__ratio = ratio
+        self.__const = constant
+
+    def get_column(self):
+        """Get the column of the eliminated unknown.
+
+        :rtype : int
+        :return: The column.
+        """
+
+        return self.__col
+
+    def get_dependent_column(self):
+        """Get the column of the dependent unknown.
+
+        :rtype : int | None
+        :return: The column (None if the eliminated unknown is a constant).
+        """
+
+        return self.__dep
+
+    def get_ratio(self):
+        """Get the ratio.
+
+        :rtype : _fractions.Fraction
+        :return: The ratio.
+        """
+
+        return self.__ratio
+
+    def get_constant(self):
+        """Get the constant.
+
+        :rtype : _fractions.Fraction
+        :return: The constant.
+        """
+
+        return self.__const
+
+
+def reduce_trivial_rows(rows, unknown_count, budget=None):
+    """Repeatedly remove rows that contain at most two unknowns.
+
+    A row that contains two unknowns fixes the unknown on the left as a ratio of the unknown
+    on the right (plus a constant), a row that contains only one unknown fixes the unknown as
+    a constant. The eliminated unknown is always a pivot unknown of the original linear
+    equations, so the free unknowns of the remaining linear equations are the same as the
+    original ones.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[Elimination])
+    :return: A tuple (The remaining rows, The eliminations in order). Each remaining row is a
+             dictionary that maps the column to the non-zero value (the column |unknown_count|
+             is the constant term).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Convert the rows and build the column index.
+    sparse_rows = []
+    col_index = {}
+    for row_id in range(0, len(rows)):
+        row = {}
+        for col_id in range(0, unknown_count + 1):
+            value = rows[row_id][col_id]
+            if value != 0:
+                row[col_id] = _fractions.Fraction(value)
+                if col_id != unknown_count:
+                    col_index.setdefault(col_id, set()).add(row_id)
+        sparse_rows.append(row)
+
+    #  Initialize.
+    alive = [True] * len(rows)
+    eliminations = []
+    queue = list(range(0, len(rows)))
+
+    while len(queue) != 0:
+        row_id = queue.pop()
+        if not alive[row_id]:
+            continue
+
+        #  Get the unknowns of the row.
+        row = sparse_rows[row_id]
+        constant = row.get(unknown_count, 0)
+        unknowns = sorted([col_id for col_id in row if col_id != unknown_count])
+
+        if len(unknowns) == 0:
+            #  Remove the empty row (conflicting rows are kept for the answer checking).
+            if constant == 0:
+                alive[row_id] = False
+            continue
+
+        if len(unknowns) > 2:
+            continue
+
+        #  Solve the unknown on the left.
+        col_id = unknowns[0]
+        pivot = row[col_id]
+        if len(unknowns) == 2:
+            dep_col = unknowns[1]
+            ratio = -row[dep_col] / pivot
+        else:
+            dep_col = None
+            ratio = _fractions.Fraction(0)
+        elimination = Elimination(col_id, dep_col, ratio, constant / pivot)
+        eliminations.append(elimination)
+
+        #  Remove the row.
+        alive[row_id] = False
+        for tmp_col in unknowns:
+            col_index[tmp_col].discard(row_id)
+
+        #  Substitute the unknown in other rows.
+        other_ids = list(col_index.get(col_id, ()))
+        if budget is not None:
+            budget.consume(len(other_ids) + 1)
+        for other_id in other_ids:
+            other = sparse_rows[other_id]
+            factor = other.pop(col_id)
+            col_index[col_id].discard(other_id)
+
+            #  Update the dependent unknown.
+            if dep_col is not None:
+                new_value = other.get(dep_col, 0) + factor * ratio
+                if new_value == 0:
+                    if dep_col in other:
+                        del other[dep_col]
+                        col_index[dep_col].discard(other_id)
+                else:
+                    if dep_col not in other:
+                        col_index.setdefault(dep_col, set()).add(other_id)
+                    other[dep_col] = new_value
+
+            #  Update the constant term.
+            if elimination.get_constant() != 0:
+                new_value = other.get(unknown_count, 0) - factor * elimination.get_constant()
+                if new_value == 0:
+                    other.pop(unknown_count, None)
+                else:
+                    other[unknown_count] = new_value
+
+            #  The row may be trivial now.
+            queue.append(other_id)
+
+    #  Collect the remaining rows.
+    remaining = [sparse_rows[row_id] for row_id in range(0, len(rows)) if alive[row_id]]
+
+    return remaining, eliminations
+
+
+def _get_primitive_key(vector):
+    """Get the primitive form of an integer vector (divided by the GCD of its items, and its
+    first non-zero item is positive).
+
+    :type vector: list[int]
+    :param vector: The vector.
+    :rtype : (tuple, int) | None
+    :return: A tuple (The primitive form, The first non-zero item of the vector), or None if
+             the vector only contains zero.
+    """
+
+    divisor = 0
+    leading = 0
+    for value in vector:
+        divisor = _math_ffe.gcd(divisor, value)
+        if leading == 0:
+            leading = value
+    if divisor == 0:
+        return None
+
+    if leading < 0:
+        divisor = -divisor
+
+    return tuple([value // divisor for value in vector]), leading
+
+
+def remove_proportional_rows(rows):
+    """Remove rows that are multiples of a previous row (includes the constant term) and rows
+    that only contain zero.
+
+    :type rows: list[list[int]]
+    :param rows: The rows (the last item of each row is the constant term).
+    :rtype : list[list[int]]
+    :return: The remaining rows (in the original order).
+    """
+
+    remaining = []
+    seen = set()
+    for row in rows:
+        primitive = _get_primitive_key(row)
+        if primitive is None or primitive[0] in seen:
+            continue
+        seen.add(primitive[0])
+        remaining.append(row)
+
+    return remaining
+
+
+def collapse_proportional_columns(rows, unknown_count):
+    """Remove unknowns whose columns are multiples of the column of a previous unknown.
+
+    If the column of an unknown is |ratio| times the column of a previous unknown, the two
+    unknowns only appear in the linear equations as (the previous unknown) + |ratio| * (the
+    unknown), so the column of the previous unknown stands for the combination.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :rtype : (list[list[int]], list[int], list[(int, int, _fractions.Fraction)])
+    :return: A tuple (The rows with proportional columns removed, The original column of each
+             remaining column, The tuples (The removed column, The column it is proportional
+             to, The ratio)).
+    """
+
+    kept_columns = []
+    removed = []
+    first_column = {}
+    zero_column = None
+    for col_id in range(0, unknown_count):
+        primitive = _get_primitive_key([row[col_id] for row in rows])
+        if primitive is None:
+            #  Columns that only contain zero.
+            if zero_column is None:
+                zero_column = col_id
+                kept_columns.append(col_id)
+            else:
+                removed.append((col_id, zero_column, _fractions.Fraction(1)))
+            continue
+
+        key, leading = primitive
+        if key in first_column:
+            origin_col, origin_leading = first_column[key]
+            removed.append((col_id, origin_col, _fractions.Fraction(leading, origin_leading)))
+        else:
+            first_column[key] = (col_id, leading)
+            kept_columns.append(col_id)
+
+    if len(removed) == 0:
+        return rows, kept_columns, removed
+
+    sub_rows = [[row[col_id] for col_id in kept_columns] + [row[-1]] for row in rows]
+
+    return sub_rows, kept_columns, removed
+
+
+def _expand_collapsed_linear_forms(sub_forms, sub_free_columns, kept_columns, removed, unknown_count):
+    """Get the solutions of the original linear equations from the solutions of the linear
+    equations whose proportional columns were removed.
+
+    A removed column is never a pivot column of the reduced row echelon form (it is a multiple
+    of an earlier column), and its column in the reduced row echelon form is the same multiple
+    of the column of the earlier unknown. So each removed unknown becomes a free unknown that
+    appears in the linear forms like the earlier unknown (scaled by the ratio).
+
+    :type sub_forms: list[dict]
+    :type sub_free_columns: list[int]
+    :type kept_columns: list[int]
+    :type removed: list[(int, int, _fractions.Fraction)]
+    :type unknown_count: int
+    :param sub_forms: The linear form of each remaining unknown.
+    :param sub_free_columns: The remaining columns of free unknowns.
+    :param kept_columns: The original column of each remaining column.
+    :param removed: The tuples (The removed column, The column it is proportional to, The
+                    ratio).
+    :param unknown_count: The count of unknowns of the original linear equations.
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    """
+
+    #  Renumber the free unknowns.
+    free_columns = sorted([kept_columns[sub_col] for sub_col in sub_free_columns] +
+                          [col_id for col_id, _, _ in removed])
+    free_ids = dict([(free_columns[free_id], free_id) for free_id in range(0, len(free_columns))])
+    id_map = [free_ids[kept_columns[sub_col]] for sub_col in sub_free_columns]
+
+    forms = [None] * unknown_count
+    for sub_col in range(0, len(kept_columns)):
+        forms[kept_columns[sub_col]] = dict([(key if key == -1 else id_map[key], value)
+                                             for key, value in sub_forms[sub_col].items()])
+
+    #  Add the removed unknowns.
+    for col_id, origin_col, ratio in removed:
+        free_id = free_ids[col_id]
+        forms[col_id] = {free_id: _fractions.Fraction(1)}
+        if origin_col in free_ids:
+            #  Pivot unknowns depend on the removed unknown as they depend on the origin.
+            origin_id = free_ids[origin_col]
+            for tmp_col in kept_columns:
+                if tmp_col in free_ids:
+                    continue
+                value = forms[tmp_col].get(origin_id, 0)
+                if value != 0:
+                    forms[tmp_col][free_id] = value * ratio
+        else:
+            #  The origin is a pivot unknown, the removed unknown is subtracted from it.
+            forms[origin_col][free_id] = -ratio
+
+    return forms, free_columns
+
+
+def solve_linear_forms(rows, unknown_count, inner_solver=_math_block.solve_linear_forms, budget=None):
+    """Solve linear equations with proportional rows and columns collapsed and trivial rows
+    reduced first.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :param inner_solver: The solver of the remaining linear equations. It takes the integer
+                         rows, the unknown count and the work budget (keyword argument
+                         |budget|) and returns a tuple (The linear forms, The columns of free
+                         unknowns).
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Collapse.
+    rows = remove_proportional_rows(rows)
+    sub_rows, kept_columns, removed = collapse_proportional_columns(rows, unknown_count)
+    if len(removed) == 0:
+        return _solve_reduced_linear_forms(rows, unknown_count, inner_solver, budget)
+
+    #  Solve and expand.
+    sub_forms, sub_free_columns = _solve_reduced_linear_forms(sub_rows, len(kept_columns), inner_solver, budget)
+
+    return _expand_collapsed_linear_forms(sub_forms, sub_free_columns, kept_columns, removed, unknown_count)
+
+
+def _solve_reduced_linear_forms(rows, unknown_count, inner_solver, budget):
+    """Solve linear equations with trivial rows reduced first.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :param inner_solver: The solver of the remaining linear equations.
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Reduce.
+    remaining, eliminations = reduce_trivial_rows(rows, unknown_count, budget)
+
+    #  Get the remaining columns.
+    eliminated = set([elimination.get_column() for elimination in eliminations])
+    remaining_cols = [col_id for col_id in range(0, unknown_count) if col_id not in eliminated]
+
+    #  Build the integer rows of the remaining linear equations.
+    sub_rows = []
+    for row in remaining:
+        denom_lcm = 1
+        for value in row.values():
+            denom_lcm = denom_lcm // _math_ffe.gcd(denom_lcm, value.denominator) * value.denominator
+        sub_row = [int(row.get(col_id, 0) * denom_lcm) for col_id in remaining_cols]
+        sub_row.append(int(row.get(unknown_count, 0) * denom_lcm))
+        sub_rows.append(sub_row)
+
+    #  Solve the remaining linear equations (the free unknowns are in column order, so their
+    #  IDs are the same as the IDs in the original linear equations).
+    sub_forms, sub_free_columns = inner_solver(sub_rows, len(remaining_cols), budget=budget)
+    forms = [None] * unknown_count
+    for sub_col in range(0, len(remaining_cols)):
+        forms[remaining_cols[sub_col]] = sub_forms[sub_col]
+    free_columns = [remaining_cols[sub_col] for sub_col in sub_free_columns]
+
+    #  Substitute back.
+    for elimination in reversed(eliminations):
+        form = {}
+        if elimination.get_constant() != 0:
+            form[-1] = elimination.get_constant()
+        dep_col = elimination.get_dependent_column()
+        if dep_col is not None:
+            ratio = elimination.get_ratio()
+            for key, value in forms[dep_col].items():
+                new_value = form.get(key, 0) + ratio * value
+                if new_value == 0:
+                    form.pop(key, None)
+                else:
+                    form[key] = new_value
+        forms[elimination.get_column()] = form
+
+    return forms, free_columns
+
+
+def solve_equation(matrix, symbol_header="X", budget=None):
+    """Solve linear equations whose coefficients are all rational numbers with trivial rows
+    reduced first.
+
+    :type matrix: _mat.Matrix
+    :type symbol_header: str
+    :type budget: _base_budget.Budget | None
+    :param matrix: The matrix that contains the linear equations.
+    :param symbol_header: The symbol header of created symbols.
+    :param budget: The work budget (None if unlimited).
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions (presents with SolvedEquation class).
+    :raise ValueError: Raise this error if the matrix contains non-rational items.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Convert the matrix.
+    rows = _math_ffe.to_integer_rows(matrix)
+    if rows is None:
+        raise ValueError("The matrix contains non-rational items.")
+
+    #  Solve.
+    forms, free_columns = solve_linear_forms(rows, matrix.get_column_count() - 1, budget=budget)
+
+    return _math_ffe.linear_forms_to_solved_equation(forms, len(free_columns), symbol_header)
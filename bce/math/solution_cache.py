@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.math.equation as _math_equ
+import collections as _collections
+import fractions as _fractions
+import sympy as _sympy
+import threading as _threading
+
+#  The default capacity of the solution cache.
+DEFAULT_CAPACITY = 1024
+
+
+class CacheKey:
+    """Class for containing the canonical form of homogeneous linear equations."""
+
+    def __init__(self, fingerprint, column_order):
+        """Initialize the class.
+
+        :type column_order: list[int]
+        :param fingerprint: The permutation-invariant fingerprint (hashable).
+        :param column_order: The column (in current matrix) at each canonical position.
+        """
+
+        self.__fp = fingerprint
+        self.__order = column_order
+
+    def get_fingerprint(self):
+        """Get the permutation-invariant fingerprint.
+
+        :return: The fingerprint.
+        """
+
+        return self.__fp
+
+    def get_column_order(self):
+        """Get the column (in current matrix) at each canonical position.
+
+        :rtype : list[int]
+        :return: The columns.
+        """
+
+        return self.__order
+
+
+def make_key(rows, row_labels):
+    """Get the canonical form of homogeneous linear equations.
+
+    Each column is represented by the sorted (row label, value) pairs of its non-zero items,
+    and the columns are sorted. So the fingerprint doesn't depend on the order of the rows and
+    the columns. Columns with the same representation are identical, so exchanging them
+    doesn't change the solutions.
+
+    :type rows: list[list[int]]
+    :type row_labels: list
+    :param rows: The rows (the last item of each row is the constant term).
+    :param row_labels: The label (e.g. the atom symbol) of each row (sortable and hashable).
+    :rtype : CacheKey | None
+    :return: The key, or None if the linear equations are not homogeneous.
+    """
+
+    #  Only homogeneous linear equations are supported.
+    for row in rows:
+        if row[-1] != 0:
+            return None
+
+    #  Get the representation of each column.
+    unknown_count = len(rows[0]) - 1 if len(rows) != 0 else 0
+    signatures = []
+    for col_id in range(0, unknown_count):
+        signature = []
+        for row_id in range(0, len(rows)):
+            value = rows[row_id][col_id]
+            if value != 0:
+                signature.append((row_labels[row_id], value))
+        signature.sort()
+        signatures.append(tuple(signature))
+
+    #  Sort the columns.
+    column_order = sorted(range(0, unknown_count), key=lambda c: signatures[c])
+
+    return CacheKey(tuple([signatures[col_id] for col_id in column_order]), column_order)
+
+
+def linear_forms_to_basis(forms, free_count):
+    """Convert the linear forms of the solutions of homogeneous linear equations to a basis of
+    the nullspace.
+
+    :type forms: list[dict]
+    :type free_count: int
+    :param forms: The linear form of each unknown.
+    :param free_count: The count of free unknowns.
+    :rtype : list[list[_fractions.Fraction]]
+    :return: The basis vectors.
+    """
+
+    return [[_fractions.Fraction(form.get(free_id, 0)) for form in forms] for free_id in range(0, free_count)]
+
+
+def basis_to_linear_forms(basis, unknown_count):
+    """Convert a basis of the nullspace to the linear forms of the solutions.
+
+    The free unknowns are chosen in the same way as the solvers (an unknown is free if it can't
+    be determined by the unknowns on its right), so the linear forms are exactly the same as
+    the solvers' output.
+
+    :type basis: list[list[_fractions.Fraction]]
+    :type unknown_count: int
+    :param basis: The basis vectors.
+    :param unknown_count: The count of unknowns.
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    """
+
+    #  Transform the basis to reduced row echelon form, from the last column to the first.
+    vectors = [list(vector) for vector in basis]
+    pivots = []
+    cur_row = 0
+    for col_id in range(unknown_count - 1, -1, -1):
+        if cur_row == len(vectors):
+            break
+
+        #  Find a vector whose item in current column is non-zero.
+        found_row = None
+        for row_id in range(cur_row, len(vectors)):
+            if vectors[row_id][col_id] != 0:
+                found_row = row_id
+                break
+        if found_row is None:
+            continue
+        vectors[found_row], vectors[cur_row] = vectors[cur_row], vectors[found_row]
+
+        #  Normalize the vector and eliminate other vectors.
+        pivot_row = vectors[cur_row]
+        pivot = pivot_row[col_id]
+        vectors[cur_row] = pivot_row = [value / pivot for value in pivot_row]
+        for row_id in range(0, len(vectors)):
+            if row_id != cur_row and vectors[row_id][col_id] != 0:
+                factor = vectors[row_id][col_id]
+                vectors[row_id] = [a - factor * b for a, b in zip(vectors[row_id], pivot_row)]
+
+        pivots.append(col_id)
+        cur_row += 1
+
+    #  The pivot columns are the free unknowns (in column order).
+    free_columns = sorted(pivots)
+    free_ids = {}
+    for free_id in range(0, len(free_columns)):
+        free_ids[free_columns[free_id]] = free_id
+
+    #  Build the linear forms.
+    forms = [{} for _ in range(0, unknown_count)]
+    for row_id in range(0, len(pivots)):
+        free_id = free_ids[pivots[row_id]]
+        vector = vectors[row_id]
+        for col_id in range(0, unknown_count):
+            if vector[col_id] != 0:
+                forms[col_id][free_id] = vector[col_id]
+
+    return forms, free_columns
+
+
+def solved_equation_to_linear_forms(solved, symbol_header="X"):
+    """Convert a SolvedEquation whose answers are linear in the free unknowns to linear forms.
+
+    :type solved: _math_equ.SolvedEquation
+    :type symbol_header: str
+    :param solved: The solutions.
+    :param symbol_header: The symbol header of created symbols.
+    :rtype : list[dict] | None
+    :return: The linear form of each unknown, or None if there is non-rational coefficient.
+    """
+
+    #  Get the symbol table of free unknowns.
+    symbol_table = _math_equ.get_symbol_table(symbol_header)
+    free_count = solved.get_unknown_count()
+
+    forms = []
+    for answer in solved.get_answer_list():
+        form = {}
+        for term, coeff in _sympy.sympify(answer).as_coefficients_dict().items():
+            if not coeff.is_Rational:
+                return None
+            if term == 1:
+                key = -1
+            else:
+                key = symbol_table.get_unknown_id(term)
+                if key is None or key >= free_count:
+                    return None
+            if coeff != 0:
+                form[key] = _fractions.Fraction(int(coeff.p), int(coeff.q))
+        forms.append(form)
+
+    return forms
+
+
+class SolutionCache:
+    """LRU cache of the solutions of homogeneous linear equations (keyed by canonical form)."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """Initialize the class with specific capacity.
+
+        :type capacity: int
+        :param capacity: The maximum count of cached solutions.
+        """
+
+        self.__cap = capacity
+        self.__data = _collections.OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = _threading.Lock()
+
+    def __len__(self):
+        """Get the count of cached solutions.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return len(self.__data)
+
+    def get_capacity(self):
+        """Get the capacity.
+
+        :rtype : int
+        :return: The capacity.
+        """
+
+        return self.__cap
+
+    def set_capacity(self, capacity):
+        """Set the capacity (least recently used solutions would be evicted).
+
+        :type capacity: int
+        :param capacity: The capacity.
+        """
+
+        with self.__lock:
+            self.__cap = capacity
+            while len(self.__data) > self.__cap:
+                self.__data.popitem(False)
+
+    def get_hit_count(self):
+        """Get the count of cache hits.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__hits
+
+    def get_miss_count(self):
+        """Get the count of cache misses.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__misses
+
+    def clear(self):
+        """Remove all cached solutions and reset the counters."""
+
+        with self.__lock:
+            self.__data.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def get(self, key):
+        """Get the cached solutions and re-permute them to the column order of the key.
+
+        :type key: CacheKey
+        :param key: The key.
+        :rtype : (list[dict], list[int]) | None
+        :return: A tuple (The linear form of each unknown, The columns of free unknowns), or
+                 None if not cached.
+        """
+
+        with self.__lock:
+            canonical_basis = self.__data.get(key.get_fingerprint())
+            if canonical_basis is None:
+                self.__misses += 1
+                return None
+
+            #  Mark as recently used.
+            self.__data.pop(key.get_fingerprint())
+            self.__data[key.get_fingerprint()] = canonical_basis
+            self.__hits += 1
+
+        #  Re-permute the basis.
+        column_order = key.get_column_order()
+        unknown_count = len(column_order)
+        basis = []
+        for canonical_vector in canonical_basis:
+            vector = [None] * unknown_count
+            for position in range(0, unknown_count):
+                vector[column_order[position]] = canonical_vector[position]
+            basis.append(vector)
+
+        return basis_to_linear_forms(basis, unknown_count)
+
+    def put(self, key, forms, free_count):
+        """Cache the solutions.
+
+        :type key: CacheKey
+        :type forms: list[dict]
+        :type free_count: int
+        :param key: The key.
+        :param forms: The linear form of each unknown.
+        :param free_count: The count of free unknowns.
+        """
+
+        if self.__cap <= 0:
+            return
+
+        #  Store the basis in canonical column order.
+        basis = linear_forms_to_basis(forms, free_count)
+        column_order = key.get_column_order()
+        canonical_basis = tuple([tuple([vector[col_id] for col_id in column_order]) for vector in basis])
+
+        with self.__lock:
+            self.__data.pop(key.get_fingerprint(), None)
+            self.__data[key.get_fingerprint()] = canonical_basis
+            while len(self.__data) > self.__cap:
+                self.__data.popitem(False)
+
+
+#  The shared solution cache.
+_default_cache = SolutionCache()
+
+
+def get_default_cache():
+    """Get the shared solution cache.
+
+    :rtype : SolutionCache
+    :return: The cache.
+    """
+
+    return _default_cache
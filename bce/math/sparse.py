@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.base.budget as _base_budget
+import bce.math.equation as _math_equ
+import bce.math.fraction_free as _math_ffe
+import fractions as _fractions
+
+#  Add this for PyCharm auto-hinting.
+import bce.math.matrix as _mat
+
+#  Sparse elimination is preferred for matrices that have at least |SPARSE_MIN_COLUMN_COUNT|
+#  columns and whose density is less than |SPARSE_MAX_DENSITY|.
+SPARSE_MIN_COLUMN_COUNT = 16
+SPARSE_MAX_DENSITY = 0.25
+
+
+class SparseMatrix:
+    """Sparse matrix class (only non-zero items are stored, row by row)."""
+
+    def __init__(self, row_count, column_count):
+        """Initialize a |row_count| * |column_count| matrix whose items are all zero.
+
+        :type row_count: int
+        :type column_count: int
+        """
+
+        self.__rc = row_count
+        self.__cc = column_count
+        self.__rows = [{} for _ in range(0, row_count)]
+
+    def get_row_count(self):
+        """Get the row count of the matrix.
+
+        :rtype : int
+        :return: The row count.
+        """
+
+        return self.__rc
+
+    def get_column_count(self):
+        """Get the column count of the matrix.
+
+        :rtype : int
+        :return: The column count.
+        """
+
+        return self.__cc
+
+    def write_item_by_position(self, row, column, new_value):
+        """Set the value of the item at specific position.
+
+        :type row: int
+        :type column: int
+        :param row: The row index of the item.
+        :param column: The column index of the item.
+        :param new_value: The new value of the item.
+        """
+
+        if new_value == 0:
+            self.__rows[row].pop(column, None)
+        else:
+            self.__rows[row][column] = new_value
+
+    def get_item_by_position(self, row, column, default_value=0):
+        """Get the item at specific position.
+
+        :type row: int
+        :type column: int
+        :param row: The row index of the item.
+        :param column: The column index of the item.
+        :param default_value: The value of zero items.
+        :return: The value of the item.
+        """
+
+        return self.__rows[row].get(column, default_value)
+
+    def get_row_items(self, row):
+        """Get the non-zero items of specific row.
+
+        :type row: int
+        :param row: The row index.
+        :rtype : dict
+        :return: A dictionary that maps the column index to the value of each non-zero item.
+        """
+
+        return self.__rows[row]
+
+    def get_nonzero_count(self):
+        """Get the count of non-zero items.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return sum([len(row) for row in self.__rows])
+
+    def to_dense(self, zero_value=0):
+        """Convert to a dense matrix.
+
+        :param zero_value: The value of zero items.
+        :rtype : _mat.Matrix
+        :return: The dense matrix.
+        """
+
+        mtx = _mat.Matrix(self.__rc, self.__cc, zero_value)
+        for row_id in range(0, self.__rc):
+            for col_id, value in self.__rows[row_id].items():
+                mtx.write_item_by_position(row_id, col_id, value)
+
+        return mtx
+
+
+def from_dense(matrix):
+    """Convert a dense matrix to a sparse matrix.
+
+    :type matrix: _mat.Matrix
+    :param matrix: The dense matrix.
+    :rtype : SparseMatrix
+    :return: The sparse matrix.
+    """
+
+    row_c = matrix.get_row_count()
+    col_c = matrix.get_column_count()
+
+    ret = SparseMatrix(row_c, col_c)
+    for row_id in range(0, row_c):
+        ofx = matrix.get_row_offset(row_id)
+        for col_id in range(0, col_c):
+            value = matrix.get_item_by_offset(ofx + col_id)
+            if value != 0:
+                ret.write_item_by_position(row_id, col_id, value)
+
+    return ret
+
+
+def is_sparse_preferred(matrix):
+    """Get whether a dense matrix is large and sparse enough to be solved by sparse elimination.
+
+    :type matrix: _mat.Matrix
+    :param matrix: The dense matrix.
+    :rtype : bool
+    :return: Return True if sparse elimination is preferred.
+    """
+
+    row_c = matrix.get_row_count()
+    col_c = matrix.get_column_count()
+
+    if col_c < SPARSE_MIN_COLUMN_COUNT or row_c == 0:
+        return False
+
+    #  Count non-zero items.
+    nz_count = 0
+    for row_id in range(0, row_c):
+        ofx = matrix.get_row_offset(row_id)
+        for col_id in range(0, col_c):
+            if matrix.get_item_by_offset(ofx + col_id) != 0:
+                nz_count += 1
+
+    return nz_count < SPARSE_MAX_DENSITY * row_c * col_c
+
+
+def _to_fraction_rows(matrix):
+    """Convert the non-zero items of a sparse matrix to native rational numbers.
+
+    :type matrix: SparseMatrix
+    :param matrix: The sparse matrix.
+    :rtype : list[dict] | None
+    :return: The rows, or None if there is at least one item which is not a rational number.
+    """
+
+    rows = []
+    for row_id in range(0, matrix.get_row_count()):
+        row = {}
+        for col_id, value in matrix.get_row_items(row_id).items():
+            if isinstance(value, int):
+                row[col_id] = _fractions.Fraction(value)
+            elif getattr(value, "is_Rational", False):
+                row[col_id] = _fractions.Fraction(int(value.p), int(value.q))
+            else:
+                return None
+        rows.append(row)
+
+    return rows
+
+
+def markowitz_eliminate(rows, unknown_count, budget=None):
+    """Do sparse Gaussian elimination.
+
+    The pivot columns are chosen from left to right (so the free unknowns are the same as the
+    generic solver). In each pivot column, the pivot row is the candidate row with the
+    smallest Markowitz cost, i.e. the least non-zero items (ties are broken by the smaller
+    item), which minimizes the fill-in and the growth of the items. Only rows that have non-zero
+    item in the pivot column are touched. The pivot count and the maximum bit-length of the
+    pivot rows are added to the elimination statistics (see
+    _math_equ.get_elimination_statistics()).
+
+    :type rows: list[dict]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (column index => non-zero value, the column |unknown_count| is the
+                 constant term). The rows would be modified.
+    :param unknown_count: The count of unknowns.
+    :param budget: The work budget (None if unlimited).
+    :rtype : list[(int, int)]
+    :return: A list of (pivot column, pivot row) in elimination order.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Build the column index (column => active rows that have non-zero item in it).
+    col_index = {}
+    for row_id in range(0, len(rows)):
+        for col_id in rows[row_id]:
+            col_index.setdefault(col_id, set()).add(row_id)
+
+    #  Initialize.
+    pivots = []
+    active_count = len(rows)
+    max_bit_length = 0
+
+    for col_id in range(0, unknown_count):
+        #  Stop if all rows have been used.
+        if active_count == 0:
+            break
+
+        #  Get the candidate rows.
+        candidates = col_index.get(col_id)
+        if not candidates:
+            continue
+
+        #  Choose the row with the smallest Markowitz cost.
+        pivot_row_id = min(candidates, key=lambda r: (len(rows[r]), abs(rows[r][col_id]), r))
+        pivot_row = rows[pivot_row_id]
+        pivot = pivot_row[col_id]
+        for value in pivot_row.values():
+            max_bit_length = max(max_bit_length, abs(value.numerator).bit_length(), value.denominator.bit_length())
+
+        #  Remove the pivot row from the active rows.
+        for tmp_col in pivot_row:
+            col_index[tmp_col].discard(pivot_row_id)
+        active_count -= 1
+
+        #  Eliminate other rows that have non-zero item in the pivot column.
+        if budget is not None:
+            budget.consume(len(candidates) * len(pivot_row))
+        for row_id in list(candidates):
+            row = rows[row_id]
+            factor = row[col_id] / pivot
+            for tmp_col, value in pivot_row.items():
+                new_value = row.get(tmp_col, 0) - factor * value
+                if new_value == 0:
+                    if tmp_col in row:
+                        del row[tmp_col]
+                        col_index[tmp_col].discard(row_id)
+                else:
+                    if tmp_col not in row:
+                        col_index.setdefault(tmp_col, set()).add(row_id)
+                    row[tmp_col] = new_value
+
+        pivots.append((col_id, pivot_row_id))
+
+    #  Save the diagnostic counters.
+    _math_equ.get_elimination_statistics().add_solve(len(pivots), max_bit_length)
+
+    return pivots
+
+
+def _solve_fraction_rows(rows, unknown_count, budget):
+    """Solve linear equations (in sparse rows of native rational numbers).
+
+    :type rows: list[dict]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (column index => non-zero value, the column |unknown_count| is the
+                 constant term). The rows would be modified.
+    :param unknown_count: The count of unknowns.
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Do elimination.
+    pivots = markowitz_eliminate(rows, unknown_count, budget)
+
+    #  Get the columns of free unknowns.
+    pivot_set = set([col_id for col_id, _ in pivots])
+    free_columns = [col_id for col_id in range(0, unknown_count) if col_id not in pivot_set]
+
+    #  Initialize the linear forms of free unknowns.
+    forms = [None] * unknown_count
+    for free_id in range(0, len(free_columns)):
+        forms[free_columns[free_id]] = {free_id: _fractions.Fraction(1)}
+
+    #  Do back substitution (a pivot row only contains columns on the right of its pivot).
+    for pivot_col, row_id in reversed(pivots):
+        row = rows[row_id]
+
+        #  Initialize with the constant term.
+        form = {}
+        if unknown_count in row:
+            form[-1] = row[unknown_count]
+
+        #  Subtract solved unknowns.
+        for col_id, coeff in row.items():
+            if col_id == pivot_col or col_id == unknown_count:
+                continue
+            for key, value in forms[col_id].items():
+                new_value = form.get(key, 0) - coeff * value
+                if new_value == 0:
+                    form.pop(key, None)
+                else:
+                    form[key] = new_value
+
+        #  Divide by the pivot.
+        pivot = row[pivot_col]
+        for key in form:
+            form[key] /= pivot
+
+        forms[pivot_col] = form
+
+    return forms, free_columns
+
+
+def solve_linear_forms(rows, unknown_count, budget=None):
+    """Solve linear equations whose coefficients are all integers with sparse elimination.
+
+    :type rows: list[list[int]]
+    :type unknown_count: int
+    :type budget: _base_budget.Budget | None
+    :param rows: The rows (the last item of each row is the constant term).
+    :param unknown_count: The count of unknowns.
+    :param budget: The work budget (None if unlimited).
+    :rtype : (list[dict], list[int])
+    :return: A tuple (The linear form of each unknown, The columns of free unknowns).
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Convert the rows.
+    sparse_rows = []
+    for row in rows:
+        sparse_rows.append(dict([(col_id, _fractions.Fraction(row[col_id])) for col_id in range(0, unknown_count + 1)
+                                 if row[col_id] != 0]))
+
+    return _solve_fraction_rows(sparse_rows, unknown_count, budget)
+
+
+def solve_equation(matrix, symbol_header="X", budget=None):
+    """Solve linear equations (in a sparse matrix) whose coefficients are all rational numbers.
+
+    :type matrix: SparseMatrix
+    :type symbol_header: str
+    :type budget: _base_budget.Budget | None
+    :param matrix: The sparse matrix that contains the linear equations.
+    :param symbol_header: The symbol header of created symbols.
+    :param budget: The work budget (None if unlimited).
+    :rtype : _math_equ.SolvedEquation
+    :return: The solutions (presents with SolvedEquation class).
+    :raise ValueError: Raise this error if the matrix contains non-rational items.
+    :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+    """
+
+    #  Convert the matrix.
+    rows = _to_fraction_rows(matrix)
+    if rows is None:
+        raise ValueError("The matrix contains non-rational items.")
+
+    #  Solve.
+    forms, free_columns = _solve_fraction_rows(rows, matrix.get_column_count() - 1, budget)
+
+    return _math_ffe.linear_forms_to_solved_equation(forms, len(free_columns), symbol_header)
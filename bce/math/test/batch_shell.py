@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.math.batch as _math_batch
+import bce.utils.test_utils as _tu
+
+
+def _parse_rows(expr):
+    """Parse the rows of a matrix.
+
+    :type expr: str
+    :param expr: The matrix (rows are separated by ';' and items are separated by ',', the last
+                 item of each row is the constant term).
+    :rtype : list[list[int]]
+    :return: The rows.
+    """
+
+    return [[int(item) for item in row.split(",")] for row in expr.split(";")]
+
+
+def _format_form(form):
+    """Format the linear form of an unknown.
+
+    :type form: dict
+    :param form: The linear form.
+    :rtype : str
+    :return: The formatted linear form.
+    """
+
+    if len(form) == 0:
+        return "0"
+
+    terms = []
+    for key in sorted(form):
+        if key == -1:
+            terms.append(str(form[key]))
+        else:
+            terms.append("%s*F%d" % (str(form[key]), key))
+
+    return " + ".join(terms)
+
+
+def run_shell():
+    """Run the shell (all matrices are read first and then solved in one batch).
+
+    :rtype : int
+    :return: The exit code.
+    """
+
+    #  Read the matrices.
+    rows_list = []
+    while True:
+        try:
+            expr = _tu.input_prompt(">> ").replace(" ", "")
+        except EOFError:
+            break
+
+        #  Ignore zero length lines and comment lines.
+        if len(expr) == 0 or expr[0] == "#":
+            continue
+
+        rows_list.append(_parse_rows(expr))
+
+    #  Solve and print the solutions.
+    solved = _math_batch.solve_linear_forms_batch(rows_list, [len(rows[0]) - 1 for rows in rows_list])
+    for forms, free_columns in solved:
+        print("; ".join(["X%d = %s" % (col_id, _format_form(forms[col_id])) for col_id in range(0, len(forms))]))
+
+    #  Print an empty line.
+    print("")
+
+    return 0
@@ -6,6 +6,7 @@
 #
 
 import bce.locale.msg as _msg
+import bce.math.engine as _math_engine
 
 
 class Option:
@@ -26,6 +27,28 @@ class Option:
         #  Set default protected math symbol header.
         self.__math_protected_symbol_hdr = "X"
 
+        #  Enable direct integer nullspace solving by default.
+        self.__fn_int_nullspace = True
+
+        #  Check solved answers probabilistically by default.
+        self.__fn_strict_check = False
+
+        #  Select the solver engine automatically by default.
+        self.__solver_engine = _math_engine.ENGINE_AUTO
+
+        #  Enable the solution cache by default.
+        self.__fn_solution_cache = True
+
+        #  Disable the lattice-reduced basis by default.
+        self.__fn_lattice_basis = False
+
+        #  Enable the molecule cache by default.
+        self.__fn_molecule_cache = True
+
+        #  No solver time / operation limit by default.
+        self.__solver_time_limit = None
+        self.__solver_op_limit = None
+
     def is_user_abbreviation_dictionary_enabled(self):
         """Get whether the user abbreviation dictionary is enabled.
 
@@ -113,3 +136,201 @@ class Option:
         """
 
         return self.__math_protected_symbol_hdr
+
+    def is_integer_nullspace_enabled(self):
+        """Get whether the direct integer nullspace solving is enabled.
+
+        :rtype : bool
+        :return: Return True if it is enabled.
+        """
+
+        return self.__fn_int_nullspace
+
+    def enable_integer_nullspace(self):
+        """Enable direct integer nullspace solving.
+
+        When enabled, chemical equations that only contain numeric atom counts and have only
+        one solution are balanced with their minimal integer coefficients directly (the linear
+        equations are solved by the selected solver engine).
+        """
+
+        self.__fn_int_nullspace = True
+
+    def disable_integer_nullspace(self):
+        """Disable direct integer nullspace solving."""
+
+        self.__fn_int_nullspace = False
+
+    def is_strict_answer_checking_enabled(self):
+        """Get whether the strict (symbolic) answer checking is enabled.
+
+        :rtype : bool
+        :return: Return True if it is enabled.
+        """
+
+        return self.__fn_strict_check
+
+    def enable_strict_answer_checking(self):
+        """Enable strict answer checking.
+
+        When enabled, solved answers are checked by symbolic simplifying instead of random
+        evaluation.
+        """
+
+        self.__fn_strict_check = True
+
+    def disable_strict_answer_checking(self):
+        """Disable strict answer checking."""
+
+        self.__fn_strict_check = False
+
+    def set_solver_engine(self, engine_name):
+        """Set the solver engine.
+
+        The engine is also used by the direct integer nullspace solving. If the engine can't
+        solve to linear forms (e.g. the generic engine), the direct integer nullspace solving is
+        skipped.
+
+        :type engine_name: str
+        :param engine_name: The engine name (one of 'ENGINE_*' in bce.math.engine package or
+                            the name of a registered custom engine).
+        :raise ValueError: Raise this error if the engine is not registered.
+        """
+
+        if not _math_engine.is_engine_name_valid(engine_name):
+            raise ValueError("Unregistered solver engine.")
+
+        self.__solver_engine = engine_name
+
+    def get_solver_engine(self):
+        """Get the solver engine.
+
+        :rtype : str
+        :return: The engine name.
+        """
+
+        return self.__solver_engine
+
+    def is_solution_cache_enabled(self):
+        """Get whether the solution cache is enabled.
+
+        :rtype : bool
+        :return: Return True if it is enabled.
+        """
+
+        return self.__fn_solution_cache
+
+    def enable_solution_cache(self):
+        """Enable the solution cache.
+
+        When enabled, the solutions of numeric chemical equations are cached by the canonical
+        form of their matrices (see bce.math.solution_cache package), so equations that only
+        differ in the order or the spelling of molecules are solved only once.
+        """
+
+        self.__fn_solution_cache = True
+
+    def disable_solution_cache(self):
+        """Disable the solution cache."""
+
+        self.__fn_solution_cache = False
+
+    def is_lattice_reduced_basis_enabled(self):
+        """Get whether the lattice-reduced basis is enabled.
+
+        :rtype : bool
+        :return: Return True if it is enabled.
+        """
+
+        return self.__fn_lattice_basis
+
+    def enable_lattice_reduced_basis(self):
+        """Enable the lattice-reduced basis.
+
+        When enabled, the answers of numeric chemical equations that have more than one free
+        unknown are expressed with an LLL-reduced integer basis of the solutions, so the
+        coefficients of the free unknowns are small integers.
+        """
+
+        self.__fn_lattice_basis = True
+
+    def disable_lattice_reduced_basis(self):
+        """Disable the lattice-reduced basis."""
+
+        self.__fn_lattice_basis = False
+
+    def set_solver_time_limit(self, time_limit):
+        """Set the time limit of balancing a chemical equation.
+
+        The solver checks the limit cooperatively, so balancing is cancelled (with a logic error)
+        soon after the limit is exceeded. The limit is checked at each pivot of all solver
+        engines, except the elimination in the rational function field (done by SymPy), which is
+        only checked before and after it.
+
+        :type time_limit: float | None
+        :param time_limit: The time limit in seconds (None if unlimited).
+        :raise ValueError: Raise this error if the time limit is not positive.
+        """
+
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("The time limit must be positive.")
+
+        self.__solver_time_limit = time_limit
+
+    def get_solver_time_limit(self):
+        """Get the time limit of balancing a chemical equation.
+
+        :rtype : float | None
+        :return: The time limit in seconds (None if unlimited).
+        """
+
+        return self.__solver_time_limit
+
+    def set_solver_operation_limit(self, operation_limit):
+        """Set the operation limit of balancing a chemical equation.
+
+        An operation is a row operation or a simplification of a symbolic expression, so the
+        limit cuts off pathological symbolic inputs deterministically.
+
+        :type operation_limit: int | None
+        :param operation_limit: The maximum count of operations (None if unlimited).
+        :raise ValueError: Raise this error if the operation limit is negative.
+        """
+
+        if operation_limit is not None and operation_limit < 0:
+            raise ValueError("The operation limit can't be negative.")
+
+        self.__solver_op_limit = operation_limit
+
+    def get_solver_operation_limit(self):
+        """Get the operation limit of balancing a chemical equation.
+
+        :rtype : int | None
+        :return: The maximum count of operations (None if unlimited).
+        """
+
+        return self.__solver_op_limit
+
+    def is_molecule_cache_enabled(self):
+        """Get whether the molecule cache is enabled.
+
+        :rtype : bool
+        :return: Return True if it is enabled.
+        """
+
+        return self.__fn_molecule_cache
+
+    def enable_molecule_cache(self):
+        """Enable the molecule cache.
+
+        When enabled, parsed molecules are cached by their formula and the options that affect
+        parsing (see bce.parser.molecule.cache package), so a molecule that appears in many
+        chemical equations is parsed only once.
+        """
+
+        self.__fn_molecule_cache = True
+
+    def disable_molecule_cache(self):
+        """Disable the molecule cache."""
+
+        self.__fn_molecule_cache = False
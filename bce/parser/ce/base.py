@@ -5,7 +5,9 @@
 #  found in the license.txt file.
 #
 
+import bce.base.budget as _base_budget
 import bce.math.constant as _math_cst
+import bce.math.fraction_free as _math_ffe
 import bce.parser.ce.operator as _ce_op
 import bce.parser.molecule.ast.base as _ml_ast_base
 import sympy as _sympy
@@ -243,21 +245,35 @@ class ChemicalEquation:
 
         self.__right_items[idx] = new_item
 
-    def remove_items_with_coefficient_zero(self):
-        """Remove items that have coefficient 0."""
+    def remove_items_with_coefficient_zero(self, budget=None):
+        """Remove items that have coefficient 0.
+
+        :type budget: _base_budget.Budget | None
+        :param budget: The work budget (None if unlimited).
+        :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+        """
 
         #  Process left items.
         for idx in range(len(self.__left_items) - 1, -1, -1):
+            if budget is not None:
+                budget.consume()
             if self.__left_items[idx].get_coefficient().simplify().is_zero:
                 self.__left_items.pop(idx)
 
         #  Process right items.
         for idx in range(len(self.__right_items) - 1, -1, -1):
+            if budget is not None:
+                budget.consume()
             if self.__right_items[idx].get_coefficient().simplify().is_zero:
                 self.__right_items.pop(idx)
 
-    def move_items_with_negative_coefficient_to_another_side(self):
-        """Move items with negative coefficient to another side of the equal sign."""
+    def move_items_with_negative_coefficient_to_another_side(self, budget=None):
+        """Move items with negative coefficient to another side of the equal sign.
+
+        :type budget: _base_budget.Budget | None
+        :param budget: The work budget (None if unlimited).
+        :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+        """
 
         #  Initialize new items container.
         new_left_items = []
@@ -268,6 +284,8 @@ class ChemicalEquation:
         #  Process left items.
         for item in self.__left_items:
             #  Get the coefficient.
+            if budget is not None:
+                budget.consume()
             coeff = item.get_coefficient().simplify()
             if coeff.is_negative:
                 #  Move side.
@@ -280,6 +298,8 @@ class ChemicalEquation:
         #  Process right items.
         for item in self.__right_items:
             #  Get the coefficient.
+            if budget is not None:
+                budget.consume()
             coeff = item.get_coefficient().simplify()
 
             if coeff.is_negative:
@@ -294,8 +314,13 @@ class ChemicalEquation:
         self.__left_items = new_left_items
         self.__right_items = new_right_items
 
-    def coefficients_integerize(self):
-        """Transform coefficients to integers if it could be done."""
+    def coefficients_integerize(self, budget=None):
+        """Transform coefficients to integers if it could be done.
+
+        :type budget: _base_budget.Budget | None
+        :param budget: The work budget (None if unlimited).
+        :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+        """
 
         #  Get the list that contains all items.
         all_items = self.__left_items + self.__right_items
@@ -306,6 +331,8 @@ class ChemicalEquation:
         #  Process left items.
         for item in all_items:
             #  Get the coefficient.
+            if budget is not None:
+                budget.consume()
             coeff = item.get_coefficient().simplify()
 
             #  Get the denominator.
@@ -326,6 +353,8 @@ class ChemicalEquation:
 
         for item in all_items:
             #  Get the coefficient.
+            if budget is not None:
+                budget.consume()
             coeff = item.get_coefficient().simplify()
 
             #  Get the numerator.
@@ -347,6 +376,81 @@ class ChemicalEquation:
             for item in all_items:
                 item.set_coefficient((item.get_coefficient() / numer_gcd).simplify())
 
+    def normalize_coefficients(self, budget=None):
+        """Remove items that have coefficient 0, move items with negative coefficient to another
+        side of the equal sign and transform coefficients to integers if it could be done.
+
+        It has the same effect as calling remove_items_with_coefficient_zero(),
+        move_items_with_negative_coefficient_to_another_side() and coefficients_integerize() in
+        order. If all coefficients are rational numbers, they are normalized in one pass with
+        native rational numbers (SymPy is used only if there are symbols).
+
+        :type budget: _base_budget.Budget | None
+        :param budget: The work budget (None if unlimited).
+        :raise _base_budget.BudgetExceededError: Raise this error if the budget is exceeded.
+        """
+
+        if self.__normalize_rational_coefficients():
+            return
+
+        self.remove_items_with_coefficient_zero(budget)
+        self.move_items_with_negative_coefficient_to_another_side(budget)
+        self.coefficients_integerize(budget)
+
+    def __normalize_rational_coefficients(self):
+        """Normalize the coefficients with native rational numbers.
+
+        :rtype : bool
+        :return: Return False if there is a coefficient that is not a rational number (nothing
+                 is changed in this case).
+        """
+
+        #  Convert the coefficients.
+        left_values = []
+        for item in self.__left_items:
+            value = _math_ffe.to_native_rational(item.get_coefficient())
+            if value is None:
+                return False
+            left_values.append(value)
+
+        right_values = []
+        for item in self.__right_items:
+            value = _math_ffe.to_native_rational(item.get_coefficient())
+            if value is None:
+                return False
+            right_values.append(value)
+
+        #  Remove items with coefficient 0 and move items with negative coefficient.
+        new_left_items = []
+        new_right_items = []
+        for item, value in zip(self.__left_items, left_values):
+            if value > 0:
+                new_left_items.append((item, value))
+            elif value < 0:
+                new_right_items.append((item, -value))
+        for item, value in zip(self.__right_items, right_values):
+            if value > 0:
+                new_right_items.append((item, value))
+            elif value < 0:
+                new_left_items.append((item, -value))
+
+        #  Get the LCM of denominators and the GCD of numerators.
+        denom_lcm = 1
+        numer_gcd = 0
+        for _, value in new_left_items + new_right_items:
+            denom_lcm = denom_lcm * value.denominator // _math_ffe.gcd(denom_lcm, value.denominator)
+            numer_gcd = _math_ffe.gcd(numer_gcd, value.numerator)
+
+        #  Integerize the coefficients.
+        for item, value in new_left_items + new_right_items:
+            item.set_coefficient(_sympy.Integer(value.numerator * (denom_lcm // value.denominator) // numer_gcd))
+
+        #  Save results.
+        self.__left_items = [item for item, _ in new_left_items]
+        self.__right_items = [item for item, _ in new_right_items]
+
+        return True
+
     def flip(self):
         """Flip the left items and the right items."""
 
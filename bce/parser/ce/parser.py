@@ -10,12 +10,18 @@ import bce.math.constant as _math_cst
 import bce.parser.molecule.token as _ml_token
 import bce.parser.molecule.ast.generator as _ml_ast_generator
 import bce.parser.molecule.ast.parser as _ml_ast_parser
+import bce.parser.molecule.cache as _ml_cache
+import bce.parser.molecule.counting as _ml_counting
 import bce.parser.ce.token as _ce_token
 import bce.parser.ce.base as _ce_base
 import bce.parser.ce.operator as _ce_op
 import bce.locale.msg_id as _msg_id
 import bce.option as _opt
 import bce.parser.ce.error as _ce_error
+import sympy as _sympy
+
+#  Add this for PyCharm auto-hinting.
+import bce.parser.molecule.ast.base as _ml_ast_base
 
 #  States of the state machine.
 _STATE_ROUTE_1 = 1
@@ -62,15 +68,72 @@ def _macro_register_form(expression, origin_form, new_form, options):
     return new_form
 
 
-def parse(expression, token_list, options):
+def _parse_molecule(formula, fingerprint, build_ast, options):
+    """Parse a molecule (or get it from the molecule cache).
+
+    :type formula: str
+    :type build_ast: bool
+    :type options: _opt.Option
+    :param formula: The formula of the molecule.
+    :param fingerprint: The option fingerprint of the molecule cache (None if the cache is not
+                        used).
+    :param build_ast: Whether the AST is needed (if not, the atoms are counted directly from
+                      the tokens if possible and the returned AST is None).
+    :param options: The BCE options.
+    :rtype : (object, _ml_ast_base.ASTNodeHydrateGroup | _ml_ast_base.ASTNodeMolecule | None, dict)
+    :return: A tuple (The coefficient, The root node of the AST (without coefficient), The
+             atoms dictionary).
+    :raise _pe.Error: Raise this error if the molecule is invalid.
+    """
+
+    #  Try the molecule cache.
+    if fingerprint is not None:
+        cached = _ml_cache.get_default_cache().get(formula, fingerprint)
+        if cached is not None:
+            return cached
+
+    #  Tokenize the molecule.
+    ml_token_list = _ml_token.tokenize(formula, options)
+
+    #  Try to count the atoms directly (the result is not cached since it has no AST).
+    if not build_ast:
+        counted = _ml_counting.count_atoms_directly(ml_token_list)
+        if counted is not None:
+            _ml_counting.get_counting_statistics().add_path(_ml_counting.PATH_DIRECT)
+            ml_coeff, ml_counts = counted
+            return _sympy.Integer(ml_coeff), None, dict([(symbol, _sympy.Integer(count))
+                                                         for symbol, count in ml_counts.items()])
+
+        _ml_counting.get_counting_statistics().add_path(_ml_counting.PATH_AST)
+
+    #  Generate the AST.
+    ml_ast_root = _ml_ast_generator.generate_ast(formula, ml_token_list, options)
+
+    #  Separate the coefficient from the AST.
+    ml_coeff = ml_ast_root.get_prefix_number()
+    ml_ast_root.set_prefix_number(_math_cst.ONE)
+    ml_atoms_dict = _ml_ast_parser.parse_ast(formula, ml_ast_root, options)
+
+    #  Cache the molecule.
+    if fingerprint is not None:
+        _ml_cache.get_default_cache().put(formula, fingerprint, ml_coeff, ml_ast_root, ml_atoms_dict)
+
+    return ml_coeff, ml_ast_root, ml_atoms_dict
+
+
+def parse(expression, token_list, options, build_ast=True):
     """Parse the tokenized chemical equation.
 
     :type expression: str
     :type token_list: list[_ce_token.Token]
     :type options: _opt.Option
+    :type build_ast: bool
     :param expression: Origin chemical equation.
     :param token_list: The tokenized chemical equation.
     :param options: The BCE options.
+    :param build_ast: Whether to build the AST of each molecule. If not, the ASTs of some
+                      molecules may be None, so the chemical equation can only be used for
+                      counting atoms (e.g. checking whether it is balanced).
     :rtype : _ce_base.ChemicalEquation
     :return: The parsed chemical equation.
     """
@@ -95,6 +158,11 @@ def parse(expression, token_list, options):
     read_molecule_end = None
     equal_sign_position = -1
 
+    #  Get the fingerprint of the molecule cache (None if the cache is not used).
+    ml_fingerprint = None
+    if options.is_molecule_cache_enabled():
+        ml_fingerprint = _ml_cache.make_option_fingerprint(options)
+
     #  Initialize the token cursor.
     cursor = 0
     while True:
@@ -167,16 +235,8 @@ def parse(expression, token_list, options):
                     raise err
 
             try:
-                #  Tokenize the molecule.
-                ml_token_list = _ml_token.tokenize(token.get_symbol(), options)
-
-                #  Generate the AST.
-                ml_ast_root = _ml_ast_generator.generate_ast(token.get_symbol(), ml_token_list, options)
-
-                #  Separate the coefficient from the AST.
-                ml_coeff = ml_ast_root.get_prefix_number()
-                ml_ast_root.set_prefix_number(_math_cst.ONE)
-                ml_atoms_dict = _ml_ast_parser.parse_ast(token.get_symbol(), ml_ast_root, options)
+                #  Parse the molecule.
+                ml_coeff, ml_ast_root, ml_atoms_dict = _parse_molecule(token.get_symbol(), ml_fingerprint, build_ast, options)
 
                 #  Add the molecule to the chemical equation.
                 if side:
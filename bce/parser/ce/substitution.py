@@ -118,14 +118,9 @@ def substitute_ce(ce, subst_map, options):
         except _pe.Error:
             raise SubstituteError("Re-parse error.")
 
-    #  Remove items with coefficient 0.
-    new_ce.remove_items_with_coefficient_zero()
-
-    #  Move items that have negative coefficient to another side.
-    new_ce.move_items_with_negative_coefficient_to_another_side()
-
-    #  Integerize the coefficients.
-    new_ce.coefficients_integerize()
+    #  Remove items with coefficient 0, move items that have negative coefficient to another side
+    #  and integerize the coefficients.
+    new_ce.normalize_coefficients()
 
     #  Check.
     if new_ce.get_left_item_count() == 0 or new_ce.get_right_item_count() == 0:
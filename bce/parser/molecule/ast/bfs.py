@@ -19,32 +19,29 @@ def do_bfs(root_node, reverse_order=True):
     :return: A list that contains the BFS result.
     """
 
-    #  Initialize the BFS queue.
-    queue = [root_node]
+    #  Initialize the result container (it is also used as the BFS queue, nodes before
+    #  |cursor| have been visited).
+    r = [root_node]
     """:type : list[_ast_base._ASTNodeBaseML]"""
 
-    #  Initialize the result container.
-    r = []
-    """:type : list[_ast_base._ASTNodeBaseML]"""
-
-    while len(queue) != 0:
-        #  Pop the first item off from the queue.
-        front_node = queue.pop(0)
-
-        #  Insert the item to the result.
-        if reverse_order:
-            r.insert(0, front_node)
-        else:
-            r.append(front_node)
+    cursor = 0
+    while cursor != len(r):
+        #  Get the front node of the queue.
+        front_node = r[cursor]
+        cursor += 1
 
         #  Add children.
         if front_node.is_hydrate_group() or front_node.is_molecule():
             for child_id in range(0, len(front_node)):
-                queue.append(front_node[child_id])
+                r.append(front_node[child_id])
         elif front_node.is_parenthesis():
             assert isinstance(front_node, _ast_base.ASTNodeParenthesisWrapper)
-            queue.append(front_node.get_inner_node())
+            r.append(front_node.get_inner_node())
         else:
             pass
 
+    #  Iterate from leaves to the root if required.
+    if reverse_order:
+        r.reverse()
+
     return r
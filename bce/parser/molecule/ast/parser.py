@@ -12,10 +12,82 @@ import bce.parser.molecule.error as _ml_error
 import bce.parser.molecule.ast.base as _ast_base
 import bce.locale.msg_id as _msg_id
 import bce.option as _opt
+import fractions as _fractions
+import sympy as _sympy
+
+
+def _to_native(value):
+    """Convert an atom count to a native number if it is a rational number.
+
+    :param value: The atom count.
+    :return: The native integer (or Fraction) if the count is a rational number, otherwise
+             the count itself (a SymPy expression).
+    """
+
+    if isinstance(value, int):
+        return value
+
+    if isinstance(value, _fractions.Fraction):
+        return value.numerator if value.denominator == 1 else value
+
+    if getattr(value, "is_Rational", False):
+        if value.q == 1:
+            return int(value.p)
+        return _fractions.Fraction(int(value.p), int(value.q))
+
+    return value
+
+
+def _to_sympy(value):
+    """Convert an atom count to a SymPy expression.
+
+    :param value: The atom count (a native number or a SymPy expression).
+    :return: The SymPy expression.
+    """
+
+    if isinstance(value, int):
+        return _sympy.Integer(value)
+
+    if isinstance(value, _fractions.Fraction):
+        return _sympy.Rational(value.numerator, value.denominator)
+
+    return value
+
+
+def _multiply(a, b):
+    """Multiply two atom counts (the product is a native number if both are native numbers).
+
+    :param a: The first count.
+    :param b: The second count.
+    :return: The product.
+    """
+
+    if isinstance(a, (int, _fractions.Fraction)) and isinstance(b, (int, _fractions.Fraction)):
+        return a * b
+
+    return _to_sympy(a) * _to_sympy(b)
+
+
+def _add(a, b):
+    """Add two atom counts (the sum is a native number if both are native numbers).
+
+    :param a: The first count.
+    :param b: The second count.
+    :return: The sum.
+    """
+
+    if isinstance(a, (int, _fractions.Fraction)) and isinstance(b, (int, _fractions.Fraction)):
+        return a + b
+
+    return _to_sympy(a) + _to_sympy(b)
 
 
 class MergeUtil:
-    """Merge utility."""
+    """Merge utility.
+
+    The atom counts are kept as native integers (or Fractions) and are promoted to SymPy
+    expressions only if a count contains symbols.
+    """
 
     def __init__(self):
         """Initialize the class."""
@@ -53,8 +125,9 @@ class MergeUtil:
         :param coeff: The coefficient.
         """
 
+        coeff = _to_native(coeff)
         for key in self.__data:
-            self.__data[key] = self.__data[key] * coeff
+            self.__data[key] = _multiply(self.__data[key], coeff)
 
     def add(self, key, value):
         """Add an atom.
@@ -64,8 +137,9 @@ class MergeUtil:
         :param value: The coefficient.
         """
 
+        value = _to_native(value)
         if key in self.__data:
-            self.__data[key] = self.__data[key] + value
+            self.__data[key] = _add(self.__data[key], value)
         else:
             self.__data[key] = value
 
@@ -77,8 +151,9 @@ class MergeUtil:
         :param coeff: The merge coefficient.
         """
 
+        coeff = _to_native(coeff)
         for key in another.__data:
-            self.add(key, another.__data[key] * coeff)
+            self.add(key, _multiply(another.__data[key], coeff))
 
     def simplify(self):
         """Simplify.
@@ -92,14 +167,20 @@ class MergeUtil:
 
         #  Simplify the coefficient of each atom.
         for key in self.__data:
-            #  Do simplifying.
-            val = self.__data[key].simplify()
+            val = self.__data[key]
 
-            #  Save the simplified value.
-            self.__data[key] = val
+            #  Do simplifying (native numbers are always simplified).
+            if isinstance(val, (int, _fractions.Fraction)):
+                is_zero = (val == 0)
+            else:
+                val = val.simplify()
+                is_zero = val.is_zero
+
+                #  Save the simplified value.
+                self.__data[key] = _to_native(val)
 
             #  Put the atom into the eliminated atoms list if its coefficient equals to 0.
-            if val.is_zero:
+            if is_zero:
                 r.append(key)
 
         #  Remove atoms that is in the eliminated atoms list from the atom dictionary.
@@ -112,9 +193,10 @@ class MergeUtil:
         """Get the atom dictionary.
 
         :rtype : dict
-        :return: The data.
+        :return: The data (the atom counts are SymPy expressions).
         """
-        return self.__data
+
+        return dict([(key, _to_sympy(value)) for key, value in self.__data.items()])
 
 
 def _macro_simplify(expression, mu_obj, node, options):
@@ -192,9 +274,11 @@ def parse_ast(expression, root_node, options):
 
             #  Process the electronics.
             if work_node.is_molecule():
-                el_charge = work_node.get_electronic_count().simplify()
-                if not el_charge.is_zero:
-                    build.add("e", el_charge * coeff)
+                el_charge = _to_native(work_node.get_electronic_count())
+                if not isinstance(el_charge, (int, _fractions.Fraction)):
+                    el_charge = el_charge.simplify()
+                if el_charge != 0:
+                    build.add("e", _multiply(el_charge, coeff))
 
             #  Iterate all children.
             for child_id in range(0, len(work_node)):
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.option as _opt
+import collections as _collections
+import threading as _threading
+
+#  Add this for PyCharm auto-hinting.
+import bce.parser.molecule.ast.base as _ml_ast_base
+
+#  The default capacity of the molecule cache.
+DEFAULT_CAPACITY = 4096
+
+
+def make_option_fingerprint(options):
+    """Get the fingerprint of the options that affect parsing a molecule.
+
+    :type options: _opt.Option
+    :param options: The BCE options.
+    :return: A hashable fingerprint, or None if the options can't be fingerprinted (e.g. the
+             user abbreviation dictionary contains unhashable items).
+    """
+
+    user_abbr = None
+    if options.is_user_abbreviation_dictionary_enabled():
+        try:
+            user_abbr = frozenset([(abbr_symbol, frozenset(atoms.items()))
+                                   for abbr_symbol, atoms in options.get_user_abbreviation_dictionary().items()])
+        except (AttributeError, TypeError):
+            return None
+
+    return options.get_protected_math_symbol_header(), user_abbr
+
+
+class MoleculeCache:
+    """LRU cache of parsed molecules (keyed by the formula and the option fingerprint).
+
+    The cached ASTs are shared by all chemical equations (and threads) that contain the same
+    molecule, so they must never be modified (e.g. the decompilers pass the balanced
+    coefficient to decompile_ast() instead of changing the prefix number of the root node).
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """Initialize the class with specific capacity.
+
+        :type capacity: int
+        :param capacity: The maximum count of cached molecules.
+        """
+
+        self.__cap = capacity
+        self.__data = _collections.OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = _threading.Lock()
+
+    def __len__(self):
+        """Get the count of cached molecules.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return len(self.__data)
+
+    def get_capacity(self):
+        """Get the capacity.
+
+        :rtype : int
+        :return: The capacity.
+        """
+
+        return self.__cap
+
+    def set_capacity(self, capacity):
+        """Set the capacity (least recently used molecules would be evicted).
+
+        :type capacity: int
+        :param capacity: The capacity.
+        """
+
+        with self.__lock:
+            self.__cap = capacity
+            while len(self.__data) > self.__cap:
+                self.__data.popitem(False)
+
+    def get_hit_count(self):
+        """Get the count of cache hits.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__hits
+
+    def get_miss_count(self):
+        """Get the count of cache misses.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__misses
+
+    def clear(self):
+        """Remove all cached molecules and reset the counters."""
+
+        with self.__lock:
+            self.__data.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def get(self, formula, fingerprint):
+        """Get a cached molecule.
+
+        :type formula: str
+        :param formula: The formula of the molecule (with its prefix number).
+        :param fingerprint: The option fingerprint (see make_option_fingerprint()).
+        :rtype : (object, _ml_ast_base.ASTNodeHydrateGroup | _ml_ast_base.ASTNodeMolecule, dict) | None
+        :return: A tuple (The prefix number, The root node of the AST (without the prefix
+                 number), The atoms dictionary), or None if not cached.
+        """
+
+        key = (formula, fingerprint)
+        with self.__lock:
+            entry = self.__data.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            #  Mark as recently used.
+            self.__data.pop(key)
+            self.__data[key] = entry
+            self.__hits += 1
+
+        coefficient, ast_root, atoms_dict = entry
+
+        return coefficient, ast_root, dict(atoms_dict)
+
+    def put(self, formula, fingerprint, coefficient, ast_root, atoms_dict):
+        """Cache a molecule.
+
+        :type formula: str
+        :type ast_root: _ml_ast_base.ASTNodeHydrateGroup | _ml_ast_base.ASTNodeMolecule
+        :type atoms_dict: dict
+        :param formula: The formula of the molecule (with its prefix number).
+        :param fingerprint: The option fingerprint (see make_option_fingerprint()).
+        :param coefficient: The prefix number.
+        :param ast_root: The root node of the AST (without the prefix number).
+        :param atoms_dict: The atoms dictionary.
+        """
+
+        if self.__cap <= 0:
+            return
+
+        key = (formula, fingerprint)
+        with self.__lock:
+            self.__data.pop(key, None)
+            self.__data[key] = (coefficient, ast_root, dict(atoms_dict))
+            while len(self.__data) > self.__cap:
+                self.__data.popitem(False)
+
+
+#  The shared molecule cache.
+_default_cache = MoleculeCache()
+
+
+def get_default_cache():
+    """Get the shared molecule cache.
+
+    :rtype : MoleculeCache
+    :return: The cache.
+    """
+
+    return _default_cache
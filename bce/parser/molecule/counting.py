@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+#
+#  Copyright 2014 - 2016 The BCE Authors. All rights reserved.
+#  Use of this source code is governed by a BSD-style license that can be
+#  found in the license.txt file.
+#
+
+import bce.parser.common.error as _pe
+import bce.parser.molecule.token as _ml_token
+import bce.parser.molecule.ast.generator as _ml_ast_generator
+import bce.parser.molecule.ast.parser as _ml_ast_parser
+import bce.option as _opt
+import sympy as _sympy
+import threading as _threading
+
+#  Counting paths.
+PATH_DIRECT = 1
+PATH_AST = 2
+
+
+class CountingStatistics:
+    """Class for collecting the counts of molecules counted by each path (see count_atoms())."""
+
+    def __init__(self):
+        """Initialize the class (all counters are zero)."""
+
+        self.__direct = 0
+        self.__ast = 0
+        self.__lock = _threading.Lock()
+
+    def reset(self):
+        """Reset all counters to zero."""
+
+        with self.__lock:
+            self.__direct = 0
+            self.__ast = 0
+
+    def get_direct_count(self):
+        """Get the count of molecules counted directly from their tokens.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__direct
+
+    def get_ast_count(self):
+        """Get the count of molecules counted by building their ASTs.
+
+        :rtype : int
+        :return: The count.
+        """
+
+        return self.__ast
+
+    def add_path(self, path):
+        """Add a counted molecule.
+
+        :type path: int
+        :param path: The counting path (PATH_DIRECT or PATH_AST).
+        """
+
+        with self.__lock:
+            if path == PATH_DIRECT:
+                self.__direct += 1
+            else:
+                self.__ast += 1
+
+
+#  The statistics of counting paths.
+_statistics = CountingStatistics()
+
+
+def get_counting_statistics():
+    """Get the shared statistics of counting paths.
+
+    :rtype : CountingStatistics
+    :return: The statistics.
+    """
+
+    return _statistics
+
+
+def _merge(target, source, coeff):
+    """Merge an atoms dictionary into another one.
+
+    :type target: dict[str, int]
+    :type source: dict[str, int]
+    :type coeff: int
+    :param target: The dictionary to merge into.
+    :param source: The merged dictionary.
+    :param coeff: The multiplier of the merged dictionary.
+    """
+
+    for symbol, count in source.items():
+        target[symbol] = target.get(symbol, 0) + count * coeff
+
+
+def count_atoms_directly(token_list):
+    """Count the atoms of a tokenized molecule without building its AST.
+
+    Only molecules that consist of atoms, integers, parentheses and hydrate dots are counted.
+    Other molecules (e.g. with math expressions, abbreviations, status descriptors or
+    electronics) and malformed molecules are left to the AST path, which also reports the
+    errors.
+
+    :type token_list: list[_ml_token.Token]
+    :param token_list: The token list.
+    :rtype : (int, dict[str, int]) | None
+    :return: A tuple (The prefix number, The atoms dictionary (without the prefix number)) in
+             the same order as the AST path, or None if the molecule can't be counted directly.
+    """
+
+    #  Initialize the hydrate group, the molecule and its prefix number of current level.
+    group = {}
+    molecule = {}
+    prefix = 1
+
+    #  Initialize the stack of outer levels.
+    stack = []
+
+    #  Initialize the atom or parenthesis that waits for its suffix number.
+    pending = None
+
+    for token in token_list:
+        token_type = token.get_type()
+
+        if token_type == _ml_token.TOKEN_TYPE_OPERAND:
+            if token.get_subtype() != _ml_token.TOKEN_SUBTYPE_INTEGER:
+                return None
+
+            #  Zero or useless operands are reported by the AST path.
+            value = int(token.get_symbol())
+            if value < 2:
+                return None
+
+            if pending is not None:
+                #  Suffix number.
+                _merge(molecule, pending, value)
+                pending = None
+            elif len(molecule) == 0:
+                #  Prefix number.
+                prefix = value
+            else:
+                return None
+
+            continue
+
+        #  Merge the atom or parenthesis that has no suffix number.
+        if pending is not None:
+            _merge(molecule, pending, 1)
+            pending = None
+
+        if token_type == _ml_token.TOKEN_TYPE_SYMBOL:
+            pending = {token.get_symbol(): 1}
+        elif token_type == _ml_token.TOKEN_TYPE_HYDRATE_DOT:
+            if len(molecule) == 0:
+                return None
+
+            #  Begin a new molecule in current hydrate group.
+            _merge(group, molecule, prefix)
+            molecule = {}
+            prefix = 1
+        elif token.is_left_parenthesis():
+            #  Go to inner level.
+            stack.append((group, molecule, prefix))
+            group = {}
+            molecule = {}
+            prefix = 1
+        elif token.is_right_parenthesis():
+            if len(molecule) == 0 or len(stack) == 0:
+                return None
+
+            #  Go back to outer level, the inner hydrate group waits for its suffix number.
+            _merge(group, molecule, prefix)
+            pending = group
+            group, molecule, prefix = stack.pop()
+        elif token_type == _ml_token.TOKEN_TYPE_END:
+            if len(molecule) == 0 or len(stack) != 0:
+                return None
+
+            #  The prefix number of a hydrate group is applied to each molecule.
+            if len(group) != 0:
+                _merge(group, molecule, prefix)
+                return 1, group
+
+            return prefix, molecule
+        else:
+            return None
+
+    return None
+
+
+def count_atoms(expression, token_list, options):
+    """Count the atoms of a tokenized molecule (directly if possible, otherwise by building its
+    AST).
+
+    :type expression: str
+    :type token_list: list[_ml_token.Token]
+    :type options: _opt.Option
+    :param expression: The origin expression.
+    :param token_list: The token list.
+    :param options: The BCE options.
+    :rtype : (dict, int)
+    :return: A tuple (The atoms dictionary (same as parse_ast()), The counting path).
+    :raise _pe.Error: Raise this error if the molecule is invalid.
+    """
+
+    counted = count_atoms_directly(token_list)
+    if counted is None:
+        #  Generate the AST and parse it.
+        ast_root = _ml_ast_generator.generate_ast(expression, token_list, options)
+        atoms_dict = _ml_ast_parser.parse_ast(expression, ast_root, options)
+        path = PATH_AST
+    else:
+        prefix, counts = counted
+        atoms_dict = dict([(symbol, _sympy.Integer(count * prefix)) for symbol, count in counts.items()])
+        path = PATH_DIRECT
+
+    _statistics.add_path(path)
+
+    return atoms_dict, path
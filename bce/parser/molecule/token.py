@@ -11,6 +11,7 @@ import bce.parser.molecule.error as _ml_error
 import bce.parser.mexp.evaluate as _mexp_ev
 import bce.locale.msg_id as _msg_id
 import bce.option as _opt
+import re as _re
 import sympy as _sympy
 
 #  Token types.
@@ -44,6 +45,30 @@ TOKEN_SUBTYPE_EL_END = 2
 TOKEN_SUBTYPE_EL_FLAG_POSITIVE = 3
 TOKEN_SUBTYPE_EL_FLAG_NEGATIVE = 4
 
+#  The scanner of molecule tokens (any other single character is matched by the last
+#  alternative, so the matched tokens always cover the whole expression).
+_TOKEN_REGEX = _re.compile(r"[0-9]+|[A-Z][a-z]*|\((?:g|l|s|aq)\)|\[[^\]]*\]|e[+\-]|.", _re.DOTALL)
+
+#  The type and sub-type of tokens that have fixed symbols.
+_FIXED_TOKENS = {
+    ".": (TOKEN_TYPE_HYDRATE_DOT, None),
+    "(g)": (TOKEN_TYPE_STATUS, TOKEN_SUBTYPE_GAS),
+    "(l)": (TOKEN_TYPE_STATUS, TOKEN_SUBTYPE_LIQUID),
+    "(s)": (TOKEN_TYPE_STATUS, TOKEN_SUBTYPE_SOLID),
+    "(aq)": (TOKEN_TYPE_STATUS, TOKEN_SUBTYPE_AQUEOUS),
+    "(": (TOKEN_TYPE_PARENTHESIS, TOKEN_SUBTYPE_PARENTHESIS_LEFT),
+    ")": (TOKEN_TYPE_PARENTHESIS, TOKEN_SUBTYPE_PARENTHESIS_RIGHT),
+    "<": (TOKEN_TYPE_ELECTRONIC, TOKEN_SUBTYPE_EL_BEGIN),
+    ">": (TOKEN_TYPE_ELECTRONIC, TOKEN_SUBTYPE_EL_END),
+    "e+": (TOKEN_TYPE_ELECTRONIC, TOKEN_SUBTYPE_EL_FLAG_POSITIVE),
+    "e-": (TOKEN_TYPE_ELECTRONIC, TOKEN_SUBTYPE_EL_FLAG_NEGATIVE)
+}
+
+#  The type and sub-type of other tokens (keyed by their leading character).
+_LEADING_TOKENS = {"[": (TOKEN_TYPE_ABBREVIATION, None)}
+_LEADING_TOKENS.update([(ch, (TOKEN_TYPE_OPERAND, TOKEN_SUBTYPE_INTEGER)) for ch in "0123456789"])
+_LEADING_TOKENS.update([(ch, (TOKEN_TYPE_SYMBOL, None)) for ch in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"])
+
 
 class Token(_base_token.BaseToken):
     """Token class for molecule."""
@@ -564,231 +589,104 @@ def create_negative_electronic_flag_token(idx=-1, pos=-1):
     return Token("e-", TOKEN_TYPE_ELECTRONIC, TOKEN_SUBTYPE_EL_FLAG_NEGATIVE, idx, pos)
 
 
-def tokenize(expression, options):
-    """Tokenize a molecule expression.
+def _find_mexp_end(expression, cur_pos, options):
+    """Find the end of a math expression (enclosed by '{' and '}').
 
     :type expression: str
+    :type cur_pos: int
     :type options: _opt.Option
     :param expression: The expression.
+    :param cur_pos: The position of the beginning '{'.
     :param options: The BCE options.
-    :rtype : list of Token
-    :return: The tokenized molecule.
-    :raise _pe.Error: When we meet a parser error.
+    :rtype : int
+    :return: The position after the end '}'.
+    :raise _pe.Error: Raise this error if the end '}' can't be found.
     """
 
-    #  Initialize.
-    r = []
-    cur_pos = 0
-    end_pos = len(expression)
-
-    while cur_pos < end_pos:
-        cur_ch = expression[cur_pos]
+    #  Simulate a parenthesis stack to find the end '}'.
+    p_mexp = 0
 
-        #  Read a integer token if current character is a digit.
-        if cur_ch.isdigit():
-            #  Search for the next non-digit character.
-            search_pos = cur_pos + 1
-            search_end = end_pos
+    for search_pos in range(cur_pos + 1, len(expression)):
+        search_ch = expression[search_pos]
 
-            while search_pos < end_pos:
-                search_ch = expression[search_pos]
+        if search_ch == "(" or search_ch == "[" or search_ch == "{":
+            #  If current character is a left parenthesis, push it onto the stack.
+            p_mexp += 1
+        elif search_ch == ")" or search_ch == "]" or search_ch == "}":
+            #  When we meet a right parenthesis and there's no left parenthesis in the stack.
+            #  The parenthesis we met should be the end '}'.
+            if p_mexp == 0:
+                #  Raise an error if the parenthesis isn't '}'.
+                if search_ch != "}":
+                    err = _pe.Error(_ml_error.PE_ML_PARENTHESIS_MISMATCH,
+                                    _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_DESCRIPTION,
+                                    options)
 
-                if not search_ch.isdigit():
-                    search_end = search_pos
-                    break
+                    err.push_traceback_ex(expression,
+                                          search_pos,
+                                          search_pos,
+                                          _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_INCORRECT,
+                                          {"$1": "}"})
 
-                #  Go to next searching position.
-                search_pos += 1
+                    raise err
 
-            #  Create an integer token.
-            r.append(create_integer_operand_token(expression[cur_pos:search_end], len(r), cur_pos))
+                return search_pos + 1
 
-            #  Go to next position.
-            cur_pos = search_end
+            #  Pop the parenthesis off from the stack.
+            p_mexp -= 1
 
-            continue
+    #  Raise an error if we can't find the end '}'.
+    err = _pe.Error(_ml_error.PE_ML_PARENTHESIS_MISMATCH,
+                    _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_DESCRIPTION,
+                    options)
 
-        #  Read an atom symbol if current character is a upper-case alphabet.
-        if cur_ch.isupper():
-            #  Search for next non-lower-case character.
-            search_pos = cur_pos + 1
-            search_end = end_pos
+    err.push_traceback_ex(expression,
+                          cur_pos,
+                          cur_pos,
+                          _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_MISSING_RIGHT)
 
-            while search_pos < end_pos:
-                if not expression[search_pos].islower():
-                    search_end = search_pos
-                    break
-
-                #  Go to next searching position.
-                search_pos += 1
-
-            #  Create a symbol token.
-            r.append(create_symbol_token(expression[cur_pos:search_end], len(r), cur_pos))
-
-            #  Go to next position.
-            cur_pos = search_end
-
-            continue
-
-        #  Read a hydrate-dot token if current character is a dot.
-        if cur_ch == ".":
-            #  Create a dot token.
-            r.append(create_hydrate_dot_token(len(r), cur_pos))
-
-            #  Go to next position.
-            cur_pos += 1
-
-            continue
+    raise err
 
-        if expression.startswith("(g)", cur_pos):
-            #  Create a status descriptor token.
-            r.append(create_gas_status_token(len(r), cur_pos))
 
-            #  Go to next position.
-            cur_pos += 3
-
-            continue
-
-        if expression.startswith("(l)", cur_pos):
-            #  Create a status descriptor token.
-            r.append(create_liquid_status_token(len(r), cur_pos))
-
-            #  Go to next position.
-            cur_pos += 3
-
-            continue
-
-        if expression.startswith("(s)", cur_pos):
-            #  Create a status descriptor token.
-            r.append(create_solid_status_token(len(r), cur_pos))
-
-            #  Go to next position.
-            cur_pos += 3
-
-            continue
-
-        if expression.startswith("(aq)", cur_pos):
-            #  Create a status descriptor token.
-            r.append(create_aqueous_status_token(len(r), cur_pos))
-
-            #  Go to next position.
-            cur_pos += 4
-
-            continue
-
-        #  Read a normal left parenthesis if current character is '('.
-        if cur_ch == "(":
-            #  Create a left parenthesis token.
-            r.append(create_left_parenthesis_token(len(r), cur_pos))
-
-            #  Go to next position.
-            cur_pos += 1
-
-            continue
-
-        #  Read a normal right parenthesis if current character is ')'.
-        if cur_ch == ")":
-            #  Create a right parenthesis token.
-            r.append(create_right_parenthesis_token(len(r), cur_pos))
+def tokenize(expression, options):
+    """Tokenize a molecule expression.
 
-            #  Go to next position.
-            cur_pos += 1
+    :type expression: str
+    :type options: _opt.Option
+    :param expression: The expression.
+    :param options: The BCE options.
+    :rtype : list of Token
+    :return: The tokenized molecule.
+    :raise _pe.Error: When we meet a parser error.
+    """
 
-            continue
+    #  Initialize.
+    r = []
+    cur_pos = 0
 
-        #  Read a abbreviation if current character is '['.
-        if cur_ch == "[":
-            #  Find the ']'.
-            search_end = -1
-            search_pos = cur_pos + 1
+    while True:
+        for symbol in _TOKEN_REGEX.findall(expression, cur_pos):
+            #  Get the type of the token.
+            token_info = _FIXED_TOKENS.get(symbol)
+            if token_info is None:
+                token_info = _LEADING_TOKENS.get(symbol[0])
 
-            while search_pos < end_pos:
-                if expression[search_pos] == "]":
-                    search_end = search_pos + 1
+                #  Stop at math expressions, unclosed abbreviations and unrecognized characters.
+                if token_info is None or symbol == "[":
                     break
 
-                #  Go to next searching position.
-                search_pos += 1
-
-            #  Raise an error if we can't find the ']'.
-            if search_end == -1:
-                err = _pe.Error(_ml_error.PE_ML_PARENTHESIS_MISMATCH,
-                                _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_DESCRIPTION,
-                                options)
-
-                err.push_traceback_ex(expression,
-                                      cur_pos,
-                                      cur_pos,
-                                      _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_MISSING_RIGHT)
-
-                raise err
-
-            #  Create an abbreviation token.
-            r.append(create_abbreviation_token(expression[cur_pos:search_end], len(r), cur_pos))
+            #  Create the token.
+            r.append(Token(symbol, token_info[0], token_info[1], len(r), cur_pos))
 
             #  Go to next position.
-            cur_pos = search_end
-
-            continue
-
-        #  Read a math expression if current character is '{'.
-        if cur_ch == "{":
-            #  Simulate a parenthesis stack to find the end '}'.
-            p_mexp = 0
-
-            #  Searching the end '}'.
-            search_end = -1
-            search_pos = cur_pos + 1
-
-            while search_pos < end_pos:
-                search_ch = expression[search_pos]
-
-                if search_ch == "(" or search_ch == "[" or search_ch == "{":
-                    #  If current character is a left parenthesis, push it onto the stack.
-                    p_mexp += 1
-                elif search_ch == ")" or search_ch == "]" or search_ch == "}":
-                    #  When we meet a right parenthesis and there's no left parenthesis in the stack.
-                    #  The parenthesis we met should be the end '}'.
-                    if p_mexp == 0:
-                        #  Raise an error if the parenthesis isn't '}'.
-                        if search_ch != "}":
-                            err = _pe.Error(_ml_error.PE_ML_PARENTHESIS_MISMATCH,
-                                            _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_DESCRIPTION,
-                                            options)
-
-                            err.push_traceback_ex(expression,
-                                                  search_pos,
-                                                  search_pos,
-                                                  _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_INCORRECT,
-                                                  {"$1": "}"})
-
-                            raise err
-
-                        #  Set the end position.
-                        search_end = search_pos + 1
-
-                        break
-
-                    #  Pop the parenthesis off from the stack.
-                    p_mexp -= 1
-                else:
-                    pass
-
-                #  Go to next searching position.
-                search_pos += 1
-
-            #  Raise an error if we can't find the end '}'.
-            if search_end == -1:
-                err = _pe.Error(_ml_error.PE_ML_PARENTHESIS_MISMATCH,
-                                _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_DESCRIPTION,
-                                options)
-
-                err.push_traceback_ex(expression,
-                                      cur_pos,
-                                      cur_pos,
-                                      _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_MISSING_RIGHT)
+            cur_pos += len(symbol)
+        else:
+            #  All characters were tokenized.
+            break
 
-                raise err
+        if symbol == "{":
+            #  Find the end '}' of the math expression.
+            search_end = _find_mexp_end(expression, cur_pos, options)
 
             #  Raise an error if the math expression has no content.
             if cur_pos + 2 == search_end:
@@ -820,46 +718,23 @@ def tokenize(expression, options):
             #  Create a math expression token.
             r.append(create_mexp_operand_token(mexp_expr, ev_value, len(r), cur_pos))
 
-            #  Go to next position.
+            #  Resume scanning after the end '}'.
             cur_pos = search_end
 
             continue
 
-        if cur_ch == "<":
-            #  Create an electronic begin parenthesis token.
-            r.append(create_electronic_begin_token(len(r), cur_pos))
-
-            #  Go to next position.
-            cur_pos += 1
-
-            continue
-
-        if cur_ch == ">":
-            #  Create an electronic begin parenthesis token.
-            r.append(create_electronic_end_token(len(r), cur_pos))
-
-            #  Go to next position.
-            cur_pos += 1
-
-            continue
-
-        if expression.startswith("e+", cur_pos):
-            #  Create a positive electronic flag token.
-            r.append(create_positive_electronic_flag_token(len(r), cur_pos))
-
-            #  Go to next position.
-            cur_pos += 2
-
-            continue
-
-        if expression.startswith("e-", cur_pos):
-            #  Create a negative electronic flag token.
-            r.append(create_negative_electronic_flag_token(len(r), cur_pos))
+        if symbol == "[":
+            #  Raise an error if we can't find the ']'.
+            err = _pe.Error(_ml_error.PE_ML_PARENTHESIS_MISMATCH,
+                            _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_DESCRIPTION,
+                            options)
 
-            #  Go to next position.
-            cur_pos += 2
+            err.push_traceback_ex(expression,
+                                  cur_pos,
+                                  cur_pos,
+                                  _msg_id.MSG_PE_ML_PARENTHESIS_MISMATCH_MISSING_RIGHT)
 
-            continue
+            raise err
 
         #  Raise an error if current character can't be tokenized.
         err = _pe.Error(_ml_error.PE_ML_UNRECOGNIZED_TOKEN,
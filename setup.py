@@ -39,6 +39,11 @@ _setuptools.setup(
     install_requires=[
         "sympy>=0.7.3"
     ],
+    extras_require={
+        "batch": [
+            "numpy"
+        ]
+    },
 
     #  Entry points.
     entry_points={